@@ -1,55 +1,81 @@
-import requests
-import csv
 import os
 import datetime
 import time
 import calendar
 import logging
 import re
-import feedparser
-import ssl
-import html
 import shutil
 import argparse
+import threading
+import itertools
+import contextlib
+import math
+import json
+from concurrent.futures import ThreadPoolExecutor
+from html.entities import html5 as HTML5_ENTITIES
+from html.parser import HTMLParser
 from pathlib import Path
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup  # Added for better HTML cleaning
-
-# Teams notifications (optional)
-try:
-    from teams_notifications import notify_new_articles
-    TEAMS_AVAILABLE = True
-except ImportError:
-    TEAMS_AVAILABLE = False
-    notify_new_articles = None
-
-# Try to create unverified HTTPS context for feedparser (needed for some feeds)
-try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(Path(__file__).parent / "ai_news_collector.log"),
-        logging.StreamHandler()
-    ]
+# requests, feedparser, BeautifulSoup, the process pool and the daemon are imported
+# where they are first used, so offline commands and importing this module stay fast
+from article_store import ArticleStore
+from feed_cache import FeedCache, hash_body
+from feed_schedule import FeedSchedule, parse_timestamp, utc_now
+from fix_html_entities import EntityFixStats, fix_articles
+from history_store import ArticleHistory, normalize_url
+from keyword_matcher import KeywordMatcher
+from near_duplicates import NearDuplicateIndex
+from run_metrics import RunMetrics, RunProfiler
+from web_exports import (
+    AGGREGATES_NAME, SEARCH_INDEX_NAME, rebuild_aggregates, rebuild_search_index, rebuild_web_exports,
+    update_aggregates, update_archive, update_search_index, write_aggregates, write_if_changed, write_search_index
 )
+
+# Teams notifications (optional), loaded by load_teams_notifications on the first run that has new articles
+TEAMS_AVAILABLE = None
+notify_new_articles = None
+
 logger = logging.getLogger("AI_News_Collector")
 
+def load_teams_notifications():
+    """Import the optional Teams notifier once and return whether it is available."""
+    global TEAMS_AVAILABLE, notify_new_articles
+    if TEAMS_AVAILABLE is None:
+        try:
+            from teams_notifications import notify_new_articles
+            TEAMS_AVAILABLE = True
+        except ImportError:
+            TEAMS_AVAILABLE = False
+            notify_new_articles = None
+    return TEAMS_AVAILABLE
+
 # Configuration
 BASE_DIR = Path(__file__).parent
 # Keep just one primary CSV file
 CSV_OUTPUT_PATH = BASE_DIR / "docs" / "data" / "ai_news.csv"  # Primary file for the web app
-HISTORY_FILE = BASE_DIR / "article_history.txt"
+HISTORY_DB_PATH = BASE_DIR / "ai_news.db"  # SQLite article store, history of processed URLs and near-duplicate index
+HISTORY_FILE = BASE_DIR / "article_history.txt"  # Legacy text history, migrated once into the database
+HISTORY_RETENTION_DAYS = 365
+NEAR_DUPLICATE_WINDOW_DAYS = 90  # New articles are checked for near-duplicates among this many days of articles
+FEED_CACHE_PATH = BASE_DIR / "feed_cache.json"  # ETag / Last-Modified validators per feed
+FEED_SCHEDULE_PATH = BASE_DIR / "feed_schedule.json"  # Per-feed health and publishing cadence
+METRICS_PATH = BASE_DIR / "run_metrics.json"  # Timings and counters of the latest run
+PROFILE_TOP_FUNCTIONS = 30
+DAEMON_INTERVAL_MINUTES = 60  # Minutes between --daemon collection cycles
+HEALTH_PORT = 8765  # Local port of the --daemon health and metrics endpoint
+MAX_FEED_CACHE_ENTRIES = 100
 MAX_ARTICLES_PER_SOURCE = 5
+MAX_CONCURRENT_FEEDS = 6  # Global cap on feeds downloaded at the same time
+PER_HOST_DELAY_SECONDS = 2  # Politeness delay between requests to the same host
+# Processes that parse feed bodies; 1 parses in-process. The pool is opt-in: with
+# the streamed feeds it is slower than parsing here, each worker gets a copy of
+# the seen-URL set, and under --daemon it would fork a process running threads.
+PARSE_WORKERS = 1
+PARSE_CHUNKS_PER_WORKER = 4
 MAX_FEED_ITEMS_TO_SCAN = 30
 REQUEST_TIMEOUT_SECONDS = 20
+REQUEST_RETRIES = 2  # Extra attempts on connection errors, timeouts and 5xx responses
+REQUEST_BACKOFF_FACTOR = 1  # Seconds; doubled on every further retry
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; AI-News-Daily/1.0; +https://github.com/StevieSimsII/AiNewsDaily)",
     "Accept": "application/rss+xml, application/xml, text/xml, application/atom+xml, */*"
@@ -85,6 +111,26 @@ RSS_FEEDS = [
     "https://www.forrester.com/press-newsroom/feed/"           # Forrester Press Room
 ]
 
+# Large full-content feeds read with the streaming parser, which stops after the entries
+# that get scanned; the other feeds, and any feed the streaming parser rejects, use feedparser
+STREAMED_FEEDS = {
+    "https://www.technologyreview.com/feed/",
+    "https://techcrunch.com/category/artificial-intelligence/feed/",
+    "http://news.mit.edu/rss/topic/artificial-intelligence2",
+    "https://venturebeat.com/category/ai/feed/",
+}
+
+# Conditional GET cache shared by all feed fetches; loaded at the start of each run
+FEED_CACHE = FeedCache(FEED_CACHE_PATH, max_entries=MAX_FEED_CACHE_ENTRIES)
+# Decides which feeds are due each run; failing and quiet feeds are polled less often
+FEED_SCHEDULE = FeedSchedule(FEED_SCHEDULE_PATH)
+# Set by --record-fixtures to capture every downloaded feed body for offline replay
+FEED_RECORDER = None
+# Timings and counters of the current run; collect_news starts a fresh one
+RUN_METRICS = RunMetrics()
+# Set by --profile to profile the run, including the feed worker threads
+RUN_PROFILER = None
+
 # Keywords to filter articles
 AI_KEYWORDS = [
     "artificial intelligence", "machine learning", "deep learning", 
@@ -120,17 +166,132 @@ AI_CATEGORIES = {
     "ai applications": ["ai in healthcare", "ai in finance", "ai in retail", "ai in manufacturing", "ai in education"]
 }
 
-def is_ai_related(title, description):
-    """Check if an article is related to AI based on its title and description."""
+# All keywords compiled once, so relevance and category checks share a single scan
+KEYWORD_MATCHER = KeywordMatcher(AI_KEYWORDS, AI_CATEGORIES)
+RESEARCH_DESCRIPTION_WINDOW = 150  # Research firm articles need AI keywords this early
+
+def is_ai_related(title, description, keywords=None):
+    """Check if an article is related to AI based on its title and description.
+
+    keywords is the article's KEYWORD_MATCHER.scan result when the caller already
+    has one (the feed scan does, for the category). On its own, the relevance check
+    is a plain substring search, which stops at the first AI keyword.
+    """
+    if keywords is not None:
+        return keywords.is_ai_related()
     text = (title + " " + description).lower()
-    return any(keyword.lower() in text for keyword in AI_KEYWORDS)
+    return any(keyword in text for keyword in KEYWORD_MATCHER.ai_keywords)
+
+# Character references that html.parser and BeautifulSoup decode identically
+ENTITY_PATTERN = re.compile(r"&(#[0-9]+;|#[xX][0-9a-fA-F]+;|[a-zA-Z][a-zA-Z0-9]*;)?")
+
+class MalformedHTMLError(Exception):
+    """Raised when markup needs BeautifulSoup's tree building to be cleaned faithfully."""
+
+class HTMLTextExtractor(HTMLParser):
+    """Streaming tag stripper that joins text nodes the same way BeautifulSoup's get_text does."""
+
+    SKIPPED_TAGS = {"script", "style"}
+    # BeautifulSoup's HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS
+    VOID_TAGS = {"area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+                 "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+                 "spacer", "track", "wbr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.buffer = []
+        self.skip_depth = 0
+        # Void tags opened as <br>; BeautifulSoup ignores one later </br> for each
+        self.closed_void_tags = []
+
+    def flush_text(self):
+        """End the current text node, keeping it if anything is left after stripping."""
+        if self.buffer:
+            text = "".join(self.buffer).strip()
+            self.buffer = []
+            if text:
+                self.parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        if tag == "template":
+            # BeautifulSoup's handling of template contents depends on the whole tree
+            raise MalformedHTMLError(tag)
+        if tag in self.SKIPPED_TAGS:
+            self.skip_depth += 1
+        if tag in self.VOID_TAGS:
+            self.closed_void_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.flush_text()
+
+    def handle_endtag(self, tag):
+        if tag in self.closed_void_tags:
+            # A redundant end tag, so the text on either side stays one text node
+            self.closed_void_tags.remove(tag)
+            return
+        self.flush_text()
+        if tag in self.SKIPPED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.buffer.append(data)
+
+    def handle_comment(self, data):
+        self.flush_text()
+
+    def handle_decl(self, decl):
+        self.flush_text()
+
+    def handle_pi(self, data):
+        self.flush_text()
+
+    def unknown_decl(self, data):
+        self.flush_text()
+        if data.startswith("CDATA["):
+            # CDATA sections are their own text node
+            self.buffer.append(data[len("CDATA["):])
+            self.flush_text()
+
+def has_only_known_entities(html_text):
+    """Check that every '&' starts a complete, known character reference."""
+    for match in ENTITY_PATTERN.finditer(html_text):
+        reference = match.group(1)
+        if reference is None or (reference[0] != "#" and reference not in HTML5_ENTITIES):
+            return False
+    return True
+
+def strip_html_tags(html_text):
+    """Strip tags with the streaming extractor, raising MalformedHTMLError for input it cannot match."""
+    if "&" in html_text and not has_only_known_entities(html_text):
+        raise MalformedHTMLError("ambiguous character reference")
+    extractor = HTMLTextExtractor()
+    extractor.feed(html_text)
+    if extractor.rawdata:
+        # An unterminated tag, comment or declaration was left over
+        raise MalformedHTMLError("incomplete markup")
+    extractor.close()
+    extractor.flush_text()
+    return " ".join(extractor.parts)
 
 def clean_html(html_text):
-    """Remove HTML tags from text using BeautifulSoup for better results."""
+    """Remove HTML tags from text, only building a BeautifulSoup tree for malformed markup."""
     if not html_text:
         return ""
+    # Plain text has no tags to strip and no entities to decode
+    if "<" not in html_text and "&" not in html_text:
+        return html_text.strip()
+    try:
+        return strip_html_tags(html_text)
+    except MalformedHTMLError:
+        pass
+    except Exception as e:
+        logger.warning(f"Streaming HTML cleaning failed, using BeautifulSoup: {str(e)}")
     try:
         # Use BeautifulSoup for more robust HTML cleaning
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html_text, "html.parser")
         return soup.get_text(separator=" ", strip=True)
     except Exception as e:
@@ -141,15 +302,10 @@ def clean_html(html_text):
 
 def determine_ai_category(text):
     """Determine the most specific AI category for the article."""
-    text = text.lower()
-    
-    # Check each category
-    for category, keywords in AI_CATEGORIES.items():
-        if any(keyword in text for keyword in keywords):
-            return category
+    matched_keywords = {keyword for _, keyword in KEYWORD_MATCHER.find_all(text.lower())}
     
-    # Default to general AI if no specific category is found
-    return "artificial intelligence"
+    # Defaults to general AI if no specific category is found
+    return KEYWORD_MATCHER.category_for(matched_keywords)
 
 def extract_research_insights(text, source):
     """Extract key insights from research firm content."""
@@ -199,185 +355,597 @@ def format_struct_time_timestamp(struct_time_value):
         tz=datetime.timezone.utc
     ).isoformat().replace("+00:00", "Z")
 
-def parse_feed(rss_url):
-    """Fetch and parse RSS/Atom feed content with a browser-like user agent."""
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Return the shared pooled HTTP session, creating it on first use.
+
+    The session keeps connections alive per host and retries connection errors,
+    timeouts and 5xx responses with exponential backoff.
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util import make_headers
+            from urllib3.util.retry import Retry
+            retry = Retry(
+                total=REQUEST_RETRIES,
+                connect=REQUEST_RETRIES,
+                read=REQUEST_RETRIES,
+                status=REQUEST_RETRIES,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                backoff_factor=REQUEST_BACKOFF_FACTOR,
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=len(group_feeds_by_host(RSS_FEEDS)),
+                pool_maxsize=MAX_CONCURRENT_FEEDS,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.headers.update(REQUEST_HEADERS)
+            # gzip/deflate always, plus br when the brotli package is installed
+            session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+def enable_feed_replay(fixtures_dir):
+    """Serve all feed requests from recorded fixtures instead of the network."""
+    from feed_fixtures import ReplayAdapter
+    adapter = ReplayAdapter(fixtures_dir)
+    session = get_http_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    logger.info(f"Replaying {len(adapter.index)} recorded feeds from {fixtures_dir}")
+
+def download_feed(rss_url):
+    """Download the raw body of an RSS/Atom feed with a browser-like user agent.
+
+    Returns None when the feed is unchanged since the last run, either because the
+    server answered 304 Not Modified or because the body hash matches the cache.
+    The validators of a new body are held until finish_parsed_feed has processed it.
+    Request errors are raised to the caller.
+    """
+    import requests
+    session = get_http_session()
+    # When recording, always download full bodies so every feed gets a fixture
+    headers = {} if FEED_RECORDER is not None else FEED_CACHE.conditional_headers(rss_url)
+    started = time.perf_counter()
     try:
-        response = requests.get(
+        response = session.get(rss_url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+    except requests.exceptions.SSLError as ssl_error:
+        # A few publishers serve incomplete certificate chains; retry once without verification
+        logger.warning(f"SSL verification failed for {rss_url}, retrying without verification: {str(ssl_error)}")
+        response = session.get(rss_url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS, verify=False)
+    RUN_METRICS.record_feed(
+        rss_url,
+        status=response.status_code,
+        # bytes as received, before gzip/br decoding; decoded_bytes is the body feedparser sees
+        bytes=response.raw.tell(),
+        decoded_bytes=len(response.content),
+        fetch_seconds=time.perf_counter() - started
+    )
+    if response.status_code == 304:
+        FEED_CACHE.update(rss_url)
+        logger.debug(f"Feed not modified since last run: {rss_url}")
+        return None
+    response.raise_for_status()
+    if FEED_RECORDER is not None:
+        FEED_RECORDER.record(rss_url, response)
+
+    body_hash = hash_body(response.content)
+    if FEED_CACHE.is_unchanged(rss_url, body_hash):
+        FEED_CACHE.update(
             rss_url,
-            headers=REQUEST_HEADERS,
-            timeout=REQUEST_TIMEOUT_SECONDS
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
         )
-        response.raise_for_status()
-        return feedparser.parse(response.content)
-    except Exception as request_error:
-        logger.warning(f"Request-based feed fetch failed for {rss_url}: {str(request_error)}")
-        return feedparser.parse(rss_url)
+        logger.debug(f"Feed content unchanged since last run: {rss_url}")
+        return None
+    FEED_CACHE.hold(
+        rss_url,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        body_hash=body_hash
+    )
+    return response.content
 
-def fetch_articles_from_rss(rss_url, max_articles=10):
-    """Fetch articles from an RSS feed."""
-    articles = []
+def download_failed(rss_url, request_error):
+    """Log and record a failed feed download."""
+    logger.warning(f"Request-based feed fetch failed for {rss_url}: {str(request_error)}")
+    RUN_METRICS.record_feed(rss_url, error=type(request_error).__name__)
+    FEED_SCHEDULE.record_failure(rss_url, type(request_error).__name__)
 
-    try:
-        # Parse the RSS feed
-        feed = parse_feed(rss_url)
+class SeenUrls:
+    """Checks normalized URLs against the history and the article store with indexed lookups.
+
+    Nothing is loaded up front; only the parse pool needs every URL, as a picklable snapshot.
+    """
+
+    def __init__(self, history, store):
+        self.history = history
+        self.store = store
+
+    def __contains__(self, url):
+        return url in self.history or self.store.has_url_key(url)
 
-        # Check if the feed was successfully parsed
-        if not feed or hasattr(feed, 'bozo_exception') and feed.bozo_exception:
-            logger.warning(f"Feed parsing warning for {rss_url}: {feed.bozo_exception if hasattr(feed, 'bozo_exception') else 'Unknown error'}")
+    def snapshot(self):
+        """Every seen URL (normalized) as a frozenset for the parse pool's workers."""
+        urls = self.history.urls()
+        urls.update(normalize_url(url) for url in self.store.urls())
+        return frozenset(urls)
 
-        # Check if we have entries
-        if not hasattr(feed, 'entries') or len(feed.entries) == 0:
-            logger.warning(f"No entries found in feed: {rss_url}")
-            return articles
+# Normalized URLs of articles already collected (a SeenUrls in-process, a frozenset in the pool's workers)
+SEEN_URLS = frozenset()
 
-        # Identify if this is a research firm feed
-        domain = get_domain(rss_url)
-        is_research_firm = any(firm in domain for firm in ["gartner", "forrester"])
+def set_seen_urls(seen_urls):
+    """Set the seen-URL index the entry scan checks (also the parse pool's initializer)."""
+    global SEEN_URLS
+    SEEN_URLS = seen_urls if seen_urls is not None else frozenset()
+
+def is_seen_entry(entry, seen_urls):
+    """Whether an entry's link or guid is an article that was already collected."""
+    for key in ('link', 'id'):
+        value = entry.get(key)
+        if value and normalize_url(value) in seen_urls:
+            return True
+    return False
+
+def extract_feed_articles(rss_url, entries, max_articles=10, seen_urls=frozenset()):
+    """Turn parsed feed entries into plain article dicts.
+
+    entries may be a lazy iterator, which is only consumed as far as the scan goes.
+    Entries whose link or guid is in seen_urls are skipped before any cleaning, so
+    max_articles only counts new articles.
+    Returns (articles, stats) where stats holds the scan counters and timings.
+    """
+    articles = []
+
+    # Identify if this is a research firm feed
+    domain = get_domain(rss_url)
+    is_research_firm = any(firm in domain for firm in ["gartner", "forrester"])
+    
+    scanned = 0
+    seen = 0
+    capped = False  # Stopped at max_articles, possibly before more new articles
+    clean_html_seconds = 0.0
+    keyword_seconds = 0.0
+    
+    # Process each entry in the feed
+    for entry in itertools.islice(entries, max(MAX_FEED_ITEMS_TO_SCAN, max_articles * 3)):
+        scanned += 1
+        # Already collected: nothing to clean, classify or count
+        if seen_urls and is_seen_entry(entry, seen_urls):
+            seen += 1
+            continue
         
-        logger.info(f"Processing {len(feed.entries)} entries from {domain}")
+        # Extract basic information
+        title = entry.get('title', '')
+        link = entry.get('link', '')
         
-        # Process each entry in the feed
-        for entry in feed.entries[:max(MAX_FEED_ITEMS_TO_SCAN, max_articles * 3)]:
-            # Extract basic information
-            title = entry.get('title', '')
-            link = entry.get('link', '')
-            
-            # Get description (summary) from various possible fields
-            description = ''
-            if 'summary' in entry:
-                description = clean_html(entry.summary)
-            elif 'description' in entry:
-                description = clean_html(entry.description)
-            elif 'content' in entry and entry.content:
-                # Some feeds use 'content' instead of summary/description
-                content_value = entry.content[0].value if isinstance(entry.content, list) else entry.content
-                description = clean_html(content_value)
-            
-            # Get published date
-            pub_date = datetime.datetime.now().strftime("%Y-%m-%d")  # Default to today
-            published_at = ""
-            if 'published_parsed' in entry and entry.published_parsed:
-                pub_date = format_struct_time_date(entry.published_parsed)
-                published_at = format_struct_time_timestamp(entry.published_parsed)
-            elif 'updated_parsed' in entry and entry.updated_parsed:
-                pub_date = format_struct_time_date(entry.updated_parsed)
-                published_at = format_struct_time_timestamp(entry.updated_parsed)
-            
-            # For research firms, we want to be more selective about AI content
-            if is_research_firm:
-                # Use a higher threshold for research firms - must have AI keywords in title or early in description
-                if not any(keyword.lower() in title.lower() for keyword in AI_KEYWORDS):
-                    # If not in title, check if early in description (first 150 chars)
-                    short_desc = description[:150].lower() if description else ""
-                    if not any(keyword.lower() in short_desc for keyword in AI_KEYWORDS):
-                        continue
-            else:
-                # For regular sources, use the standard AI relevance check
-                if not is_ai_related(title, description):
-                    continue
-            
-            # Add the article to our list
-            source = domain
-            
-            articles.append({
-                'title': title,
-                'description': description,
-                'link': link,
-                'date': pub_date,
-                'published_at': published_at,
-                'source': source
-            })
-            
-            if len(articles) >= max_articles:
-                break
+        # Get description (summary) from various possible fields
+        started = time.perf_counter()
+        description = ''
+        if 'summary' in entry:
+            description = clean_html(entry.summary)
+        elif 'description' in entry:
+            description = clean_html(entry.description)
+        elif 'content' in entry and entry.content:
+            # Some feeds use 'content' instead of summary/description
+            content_value = entry.content[0].value if isinstance(entry.content, list) else entry.content
+            description = clean_html(content_value)
+        clean_html_seconds += time.perf_counter() - started
+        
+        # Get published date
+        pub_date = datetime.datetime.now().strftime("%Y-%m-%d")  # Default to today
+        published_at = ""
+        if 'published_parsed' in entry and entry.published_parsed:
+            pub_date = format_struct_time_date(entry.published_parsed)
+            published_at = format_struct_time_timestamp(entry.published_parsed)
+        elif 'updated_parsed' in entry and entry.updated_parsed:
+            pub_date = format_struct_time_date(entry.updated_parsed)
+            published_at = format_struct_time_timestamp(entry.updated_parsed)
+        
+        # One keyword scan answers the relevance checks and the category
+        started = time.perf_counter()
+        keywords = KEYWORD_MATCHER.scan(title, description)
+        
+        # For research firms, we want to be more selective about AI content
+        if is_research_firm:
+            # Use a higher threshold for research firms - must have AI keywords in title or early in description
+            relevant = (keywords.has_ai_keyword_in_title()
+                        or keywords.has_ai_keyword_in_description(RESEARCH_DESCRIPTION_WINDOW))
+        else:
+            # For regular sources, use the standard AI relevance check
+            relevant = is_ai_related(title, description, keywords)
+        keyword_seconds += time.perf_counter() - started
+        if not relevant:
+            continue
         
-        logger.info(f"Found {len(articles)} AI-related articles from {domain}")
+        # Add the article to our list
+        source = domain
+        
+        articles.append({
+            'title': title,
+            'description': description,
+            'link': link,
+            'date': pub_date,
+            'published_at': published_at,
+            'source': source,
+            'category': keywords.category()
+        })
+        
+        if len(articles) >= max_articles:
+            capped = True
+            break
     
+    stats = {
+        # A streamed feed is only read up to the last scanned entry
+        'entries': len(entries) if hasattr(entries, '__len__') else scanned,
+        'scanned': scanned,
+        'seen': seen,
+        'accepted': len(articles),
+        'capped': capped,
+        'clean_html_seconds': clean_html_seconds,
+        'keyword_seconds': keyword_seconds
+    }
+    return articles, stats
+
+def parse_feed_body(job):
+    """Parse one downloaded feed body into plain article dicts.
+
+    job is (rss_url, body, max_articles, stream). Streamed feeds are read entry by
+    entry and parsing stops once the scan is done; if the streaming reader cannot
+    handle the body, feedparser parses it instead. This runs in the parse worker
+    processes, so it only returns picklable values and leaves logging and metrics
+    to finish_parsed_feed in the main process.
+    """
+    import feedparser
+    from feed_stream import FeedStreamError, iter_feed_entries
+    rss_url, body, max_articles, stream = job
+    result = {'articles': [], 'bozo': None, 'error': None, 'stream_error': None, 'reader': 'feedparser'}
+    try:
+        started = time.perf_counter()
+        if stream:
+            try:
+                articles, stats = extract_feed_articles(rss_url, iter_feed_entries(body), max_articles, SEEN_URLS)
+                result['reader'] = 'stream'
+            except FeedStreamError as e:
+                # Odd formats and broken XML are left to feedparser's lenient parsing
+                result['stream_error'] = str(e)
+        if result['reader'] == 'feedparser':
+            feed = feedparser.parse(body)
+            if feed.get('bozo_exception'):
+                result['bozo'] = str(feed.bozo_exception)
+            articles, stats = extract_feed_articles(rss_url, feed.entries, max_articles, SEEN_URLS)
+        result.update(stats, articles=articles)
+        result['parse_seconds'] = (time.perf_counter() - started
+                                   - stats['clean_html_seconds'] - stats['keyword_seconds'])
     except Exception as e:
-        logger.error(f"Error fetching articles from {rss_url}: {str(e)}")
-    
-    return articles
+        result['error'] = str(e)
+    return result
 
-def get_processed_article_ids():
-    """Get a list of article IDs that have already been processed."""
-    if not os.path.exists(HISTORY_FILE):
-        return set()
-    
-    with open(HISTORY_FILE, "r") as f:
-        return set(line.strip() for line in f)
+def finish_parsed_feed(rss_url, result):
+    """Log and record the outcome of parse_feed_body and return the feed's articles.
+
+    The feed's validators are only saved to the feed cache when the body parsed and
+    every new article in the scan was taken. Otherwise the next run gets the full
+    body again instead of a 304 or a matching hash.
+    """
+    if result['error'] is not None:
+        logger.error(f"Error fetching articles from {rss_url}: {result['error']}")
+        FEED_SCHEDULE.record_failure(rss_url, "parse error")
+        FEED_CACHE.discard(rss_url)
+        return []
+    RUN_METRICS.record_feed(rss_url, parse_seconds=result['parse_seconds'], reader=result['reader'])
+    if result['stream_error']:
+        logger.info(f"Streaming reader could not read {rss_url}, parsed it with feedparser: {result['stream_error']}")
+
+    # Check if the feed was successfully parsed
+    if result['bozo']:
+        logger.warning(f"Feed parsing warning for {rss_url}: {result['bozo']}")
+
+    # Check if we have entries
+    if not result['entries']:
+        logger.warning(f"No entries found in feed: {rss_url}")
+        # An empty feed backs off like a failing one
+        FEED_SCHEDULE.record_failure(rss_url, "no entries")
+        FEED_CACHE.discard(rss_url)
+        return []
+
+    RUN_METRICS.record_feed(
+        rss_url,
+        entries=result['entries'],
+        scanned=result['scanned'],
+        seen=result['seen'],
+        accepted=result['accepted'],
+        clean_html_seconds=result['clean_html_seconds'],
+        keyword_seconds=result['keyword_seconds']
+    )
+    RUN_METRICS.count("seen_entries", result['seen'])
+    if result['capped']:
+        # The entries past the cap are picked up from the same body next run
+        FEED_CACHE.discard(rss_url)
+    else:
+        FEED_CACHE.confirm(rss_url)
+    # Per-feed detail; parse_downloaded_feeds logs the totals for the run
+    logger.debug(f"{get_domain(rss_url)}: {result['entries']} entries, {len(result['articles'])} new AI-related "
+                 f"articles, {result['seen']} entries already collected")
+    return result['articles']
+
+def parse_feed(rss_url):
+    """Fetch and parse one RSS/Atom feed with feedparser.
+
+    Returns None when the feed is unchanged since the last run. A failed download
+    is logged and returned as an empty feed with bozo_exception set. collect_news
+    downloads and parses in separate stages; this keeps the single-feed API.
+    """
+    import feedparser
+    try:
+        body = download_feed(rss_url)
+    except Exception as request_error:
+        download_failed(rss_url, request_error)
+        return feedparser.FeedParserDict(entries=[], bozo=1, bozo_exception=request_error)
+    if body is None:
+        return None
+    feed = feedparser.parse(body)
+    # The caller gets the whole parsed feed, so the body counts as processed
+    FEED_CACHE.confirm(rss_url)
+    return feed
 
-def save_article_id(article_id):
-    """Save an article ID to the history file."""
-    with open(HISTORY_FILE, "a") as f:
-        f.write(f"{article_id}\n")
+def fetch_articles_from_rss(rss_url, max_articles=10):
+    """Fetch articles from an RSS feed.
 
-def parse_date(date_str):
-    """Convert various date formats to datetime objects for sorting."""
-    parsed_date = None
+    The single-feed form of collect_news' download, parse and finish stages.
+    """
     try:
-        # Try to parse ISO format (YYYY-MM-DD)
-        parsed_date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-    except ValueError:
+        body = download_feed(rss_url)
+    except Exception as request_error:
+        download_failed(rss_url, request_error)
+        return []
+    if body is None:
+        # Nothing changed since the last run, so there is nothing new to process
+        return []
+    return finish_parsed_feed(rss_url, parse_feed_body((rss_url, body, max_articles, rss_url in STREAMED_FEEDS)))
+
+def parse_feed_bodies(jobs, workers=PARSE_WORKERS, seen_urls=None):
+    """Parse (rss_url, body, max_articles, stream) jobs, returning parse_feed_body results in job order.
+
+    With more than one worker the jobs are spread over a process pool in chunks, so
+    feedparser and the HTML cleaning run on several cores; otherwise they run here.
+    seen_urls (normalized URLs, or a SeenUrls) is checked in place here. The pool's
+    workers get a frozenset snapshot of it, once each, not with every job.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        set_seen_urls(seen_urls)
         try:
-            # Try to parse MM/DD/YYYY format
-            parsed_date = datetime.datetime.strptime(date_str, "%m/%d/%Y")
-        except ValueError:
+            return [parse_feed_body(job) for job in jobs]
+        finally:
+            # Don't keep the stores referenced between runs
+            set_seen_urls(None)
+    snapshot = seen_urls.snapshot() if isinstance(seen_urls, SeenUrls) else frozenset(seen_urls or ())
+    workers = min(workers, len(jobs))
+    # A few chunks per worker balances uneven feeds without paying for a round trip per feed
+    chunksize = max(1, math.ceil(len(jobs) / (workers * PARSE_CHUNKS_PER_WORKER)))
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_seen_urls, initargs=(snapshot,)) as executor:
+        return list(executor.map(parse_feed_body, jobs, chunksize=chunksize))
+
+def group_feeds_by_host(feed_urls):
+    """Group feed URLs by domain, keeping their original order within each domain."""
+    feeds_by_host = {}
+    for feed_url in feed_urls:
+        feeds_by_host.setdefault(get_domain(feed_url), []).append(feed_url)
+    return feeds_by_host
+
+def fetch_host_feeds(feed_urls, delay_seconds=PER_HOST_DELAY_SECONDS):
+    """Download the feeds of a single host one after another, pausing between requests."""
+    results = {}
+    with RUN_PROFILER.profile() if RUN_PROFILER else contextlib.nullcontext():
+        for index, feed_url in enumerate(feed_urls):
+            if index:
+                # Respect the server by waiting between requests to the same host
+                time.sleep(delay_seconds)
+            logger.debug(f"Fetching articles from: {get_domain(feed_url)}")
+            started = time.perf_counter()
             try:
-                # Try one more common format
-                parsed_date = datetime.datetime.strptime(date_str, "%d-%m-%Y")
-            except ValueError:
-                # If all parsing fails, return a very old date to sort at the bottom
-                logger.warning(f"Could not parse date format: {date_str}")
-                parsed_date = datetime.datetime(1900, 1, 1)
-
-    return parsed_date.replace(tzinfo=datetime.timezone.utc)
-
-def parse_sort_timestamp(article):
-    """Prefer full publish timestamps when available, otherwise fall back to article date."""
-    published_at = article.get('published_at', '')
-    if published_at:
+                body = download_feed(feed_url)
+            except Exception as request_error:
+                download_failed(feed_url, request_error)
+                body = request_error
+            results[feed_url] = (body, time.perf_counter() - started)
+    return results
+
+def download_all_feeds(feed_urls, max_workers=MAX_CONCURRENT_FEEDS, delay_seconds=PER_HOST_DELAY_SECONDS):
+    """Download all feeds concurrently and return {feed_url: body}.
+
+    The body is None for unchanged feeds and the exception for failed ones. Different
+    hosts are fetched in parallel (at most max_workers at a time), while feeds
+    sharing a host are fetched in sequence with a politeness delay in between.
+    """
+    started = time.perf_counter()
+    feeds_by_host = group_feeds_by_host(feed_urls)
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            host: executor.submit(fetch_host_feeds, host_feeds, delay_seconds)
+            for host, host_feeds in feeds_by_host.items()
+        }
+        for host, future in futures.items():
+            try:
+                results.update(future.result())
+            except Exception as e:
+                logger.error(f"Error fetching feeds for {host}: {str(e)}")
+
+    elapsed = time.perf_counter() - started
+    # The serial loop fetched every feed in turn and slept after each one
+    serial_estimate = sum(duration for _, duration in results.values()) + delay_seconds * len(feed_urls)
+    logger.info(
+        f"Fetched {len(results)} feeds from {len(feeds_by_host)} hosts in {elapsed:.1f}s "
+        f"(serial estimate {serial_estimate:.1f}s, saved {serial_estimate - elapsed:.1f}s)"
+    )
+
+    return {feed_url: body for feed_url, (body, _) in results.items()}
+
+def parse_downloaded_feeds(feed_urls, bodies, max_articles=MAX_ARTICLES_PER_SOURCE, parse_workers=PARSE_WORKERS,
+                           seen_urls=None):
+    """Parse downloaded feed bodies and return (feed_url, articles) pairs in feed order.
+
+    Entries whose link or guid is in seen_urls are skipped during the scan.
+    """
+    jobs = []
+    failed = 0
+    for feed_url in feed_urls:
+        body = bodies.get(feed_url)
+        if isinstance(body, Exception):
+            # Already logged by download_failed
+            failed += 1
+        elif body is not None:
+            jobs.append((feed_url, body, max_articles, feed_url in STREAMED_FEEDS))
+
+    parsed = dict(zip((job[0] for job in jobs), parse_feed_bodies(jobs, parse_workers, seen_urls)))
+    feed_results = [
+        (feed_url, finish_parsed_feed(feed_url, parsed[feed_url]) if feed_url in parsed else [])
+        for feed_url in feed_urls
+    ]
+    # One line for the run instead of one per feed
+    entries = sum(result.get('entries', 0) for result in parsed.values())
+    seen = sum(result.get('seen', 0) for result in parsed.values())
+    accepted = sum(len(articles) for _, articles in feed_results)
+    logger.info(
+        f"Parsed {len(jobs)} feeds: {entries} entries, {accepted} new AI-related articles, "
+        f"{seen} entries already collected ({len(feed_urls) - len(jobs) - failed} feeds unchanged, {failed} failed)"
+    )
+    return feed_results
+
+def open_article_history():
+    """Open the processed-article history store, migrating the legacy text file on first use."""
+    history = ArticleHistory(HISTORY_DB_PATH, retention_days=HISTORY_RETENTION_DAYS)
+    history.migrate_from_text(HISTORY_FILE)
+    return history
+
+def open_article_store():
+    """Open the canonical article store, loading the CSV into it on first use or after an outside edit.
+
+    Returns (store, reloaded). reloaded means the CSV may have changed anywhere, so
+    the web exports need a full rebuild rather than an incremental update.
+    """
+    store = ArticleStore(HISTORY_DB_PATH)
+    reloaded = store.sync_from_csv(CSV_OUTPUT_PATH)
+    return store, reloaded
+
+class CollectorState:
+    """The article store, history and near-duplicate index, kept open across --daemon cycles.
+
+    csv_reloaded stays set until a run has rebuilt the web exports after the store
+    was reloaded from an edited CSV.
+    """
+
+    def __init__(self):
+        self.store, self.csv_reloaded = open_article_store()
+        self.history = open_article_history()
+        self.near_duplicates = open_near_duplicate_index()
+
+    def close(self):
+        self.history.close()
+        self.near_duplicates.close()
+        self.store.close()
+
+def open_near_duplicate_index():
+    """Open the near-duplicate index, indexing the recent articles in the CSV the first time."""
+    index = NearDuplicateIndex(HISTORY_DB_PATH)
+    if len(index) == 0 and os.path.exists(CSV_OUTPUT_PATH):
+        index.build_from_csv(CSV_OUTPUT_PATH, since=near_duplicate_cutoff())
+    return index
+
+def near_duplicate_cutoff():
+    """Oldest article date kept in the near-duplicate index."""
+    return (datetime.date.today() - datetime.timedelta(days=NEAR_DUPLICATE_WINDOW_DAYS)).isoformat()
+
+def copy_csv_to_secondary_paths():
+    """Copy the primary CSV to each of SECONDARY_CSV_PATHS."""
+    for secondary_path in SECONDARY_CSV_PATHS:
         try:
-            parsed_timestamp = datetime.datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-            if parsed_timestamp.tzinfo is None:
-                return parsed_timestamp.replace(tzinfo=datetime.timezone.utc)
-            return parsed_timestamp.astimezone(datetime.timezone.utc)
-        except ValueError:
-            logger.warning(f"Could not parse published_at timestamp: {published_at}")
-
-    return parse_date(article.get('date', ''))
-
-def read_existing_articles():
-    """Read all articles from the existing CSV file."""
-    existing_articles = []
-    existing_urls = set()
-    
+            # Create parent directories if needed
+            os.makedirs(os.path.dirname(secondary_path), exist_ok=True)
+            # Copy the file
+            shutil.copy2(CSV_OUTPUT_PATH, secondary_path)
+            logger.info(f"Copied CSV to secondary location: {secondary_path}")
+        except Exception as e:
+            logger.error(f"Error copying CSV to {secondary_path}: {str(e)}")
+
+def recategorize_articles():
+    """Re-run the category rules over every stored article and refresh the exports that changed.
+
+    Works offline from the article store: no feeds are fetched and the network
+    stack is never imported. When the store was reloaded from an edited CSV, every
+    web export is rebuilt, whether or not any category changed. Returns the number
+    of articles whose category changed.
+    """
+    store, reloaded = open_article_store()
     try:
-        with open(CSV_OUTPUT_PATH, mode='r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if row['url'] not in existing_urls:  # Avoid duplicates
-                    existing_articles.append(row)
-                    existing_urls.add(row['url'])
-        logger.info(f"Read {len(existing_articles)} articles from {CSV_OUTPUT_PATH}")
-    except Exception as e:
-        logger.warning(f"Error reading CSV file at {CSV_OUTPUT_PATH}: {str(e)}")
-    
-    return existing_articles, existing_urls
+        changed = []
+        for row in store.iter_rows():
+            article = dict(zip(store.fields, row))
+            category = KEYWORD_MATCHER.scan(article['title'], article['description']).category()
+            if category != article['category']:
+                article['category'] = category
+                changed.append(article)
+        data_dir = Path(CSV_OUTPUT_PATH).parent
+        changed_dates = set()
+        if changed:
+            # The upsert keeps each article's position, so the CSV only changes in the category column
+            _, changed_dates = store.upsert_many(changed)
+            store.export_csv(CSV_OUTPUT_PATH)
+            copy_csv_to_secondary_paths()
+
+        if reloaded:
+            # The edit that triggered the reload may touch any month
+            logger.info("Article store was reloaded from the CSV, rebuilding every web export")
+            rebuild_web_exports(CSV_OUTPUT_PATH, data_dir)
+        elif changed:
+            update_archive(store, CSV_OUTPUT_PATH, data_dir, changed_dates=changed_dates)
+            # Category counts and search tokens change in place, so these are recounted rather than appended to
+            write_aggregates(data_dir / AGGREGATES_NAME, rebuild_aggregates(CSV_OUTPUT_PATH))
+            write_search_index(data_dir / SEARCH_INDEX_NAME, rebuild_search_index(CSV_OUTPUT_PATH))
 
-try:
-    from zoneinfo import ZoneInfo  # Python 3.9+
-except ImportError:
-    from pytz import timezone as ZoneInfo  # Fallback for older Python
+        if changed:
+            logger.info(f"Recategorized {len(changed)} of {len(store)} articles across {len(changed_dates)} dates")
+        else:
+            logger.info(f"All {len(store)} articles already have the current categories")
+        return len(changed)
+    finally:
+        store.close()
 
-def collect_news(teams_required: bool = False):
+def collect_news(teams_required: bool = False, max_workers: int = MAX_CONCURRENT_FEEDS,
+                 per_host_delay: float = PER_HOST_DELAY_SECONDS, metrics_path=METRICS_PATH,
+                 full_poll: bool = False, parse_workers: int = PARSE_WORKERS, state=None):
     """Collect news articles and save them to a CSV file.
 
     Args:
         teams_required: If True, fail if Teams notification cannot be sent
+        max_workers: Maximum number of feeds fetched concurrently
+        per_host_delay: Seconds to wait between requests to the same host
+        metrics_path: Where to write this run's metrics (.json, or .prom for Prometheus); None to skip
+        full_poll: Poll every feed, ignoring the adaptive feed schedule
+        parse_workers: Number of processes parsing the downloaded feeds; 1 parses in-process
+        state: A CollectorState to reuse and leave open (--daemon); by default the stores are opened and closed here
+
+    Returns the run's RunMetrics.
     """
+    global RUN_METRICS
+    RUN_METRICS = RunMetrics()
     logger.info(f"Starting news collection, writing to: {CSV_OUTPUT_PATH}")
     # Store the current date as the last updated timestamp in US Central Time
     try:
+        from zoneinfo import ZoneInfo  # Python 3.9+
         central = ZoneInfo("America/Chicago")
     except Exception:
         import pytz
@@ -394,27 +962,60 @@ def collect_news(teams_required: bool = False):
     # Save the last update info to a JSON file for the web app to use
     update_info_path = os.path.join(os.path.dirname(CSV_OUTPUT_PATH), "last_update.json")
     try:
-        with open(update_info_path, 'w') as f:
-            import json
-            json.dump(last_update, f)
+        write_if_changed(update_info_path, json.dumps(last_update).encode("utf-8"))
         logger.info(f"Saved last update timestamp (Central Time): {current_date}")
     except Exception as e:
         logger.error(f"Error saving update timestamp: {str(e)}")
     
-    # Get previously processed article IDs
-    processed_ids = get_processed_article_ids()
+    # Load the conditional GET validators from the previous run
+    if not FEED_CACHE.loaded:
+        FEED_CACHE.load()
+    if not FEED_SCHEDULE.loaded:
+        FEED_SCHEDULE.load()
     
-    # Read existing articles from CSV
-    existing_articles, existing_urls = read_existing_articles()
-    logger.info(f"Found {len(existing_articles)} existing articles in CSV")
+    # Open the article store and the history of previously processed article IDs
+    owns_state = state is None
+    if owns_state:
+        state = CollectorState()
+    else:
+        # Still warm from the last cycle; only reload if the CSV was edited in between
+        if state.store.sync_from_csv(CSV_OUTPUT_PATH):
+            state.csv_reloaded = True
+    store, history, near_duplicates = state.store, state.history, state.near_duplicates
+    existing_count = len(store)
+    logger.info(f"Found {existing_count} existing articles in the article store")
     
-    # Collect all new articles
+    # Collect all new articles; existing_urls holds this run's, the store has the earlier ones
     new_articles = []
+    existing_urls = set()
+    
+    RUN_METRICS.count("existing_articles", existing_count)
+    
+    # Only poll the feeds that are due, download them concurrently, then parse and process them in feed order
+    poll_time = utc_now()
+    due_feeds, skipped_feeds = FEED_SCHEDULE.due_feeds(RSS_FEEDS, poll_time, full_poll=full_poll)
+    logger.info(f"Polling {len(due_feeds)} of {len(RSS_FEEDS)} feeds ({len(skipped_feeds)} not due)")
+    RUN_METRICS.count("polled_feeds", len(due_feeds))
+    RUN_METRICS.count("skipped_feeds", len(skipped_feeds))
+    with RUN_METRICS.stage("fetch"):
+        bodies = download_all_feeds(due_feeds, max_workers=max_workers, delay_seconds=per_host_delay)
+    with RUN_METRICS.stage("parse"):
+        # Articles already in the CSV or the history are skipped in the scan, before any cleaning
+        seen_urls = SeenUrls(history, store)
+        feed_results = parse_downloaded_feeds(due_feeds, bodies, MAX_ARTICLES_PER_SOURCE, parse_workers, seen_urls)
+    
+    # Decode HTML entities in titles and descriptions once, before anything compares or stores them
+    entity_stats = EntityFixStats()
+    for _, articles in feed_results:
+        fix_articles(articles, entity_stats)
+    if entity_stats.fixed_count:
+        logger.info(f"HTML entities: {entity_stats.summary()}")
+    RUN_METRICS.count("entity_fields_fixed", entity_stats.fixed_count)
     
-    # Process each RSS feed
-    for feed_url in RSS_FEEDS:
+    dedup_started = time.perf_counter()
+    for feed_url, articles in feed_results:
         source_domain = get_domain(feed_url)
-        logger.info(f"Fetching articles from: {source_domain}")
+        new_article_times = []
         
         try:
             # Determine specific source type
@@ -425,29 +1026,39 @@ def collect_news(teams_required: bool = False):
             else:
                 source_type = "News Source"
             
-            articles = fetch_articles_from_rss(feed_url, MAX_ARTICLES_PER_SOURCE)
-            
             for article in articles:
                 # Use the article URL as a unique ID
                 article_id = article['link']
                 
-                # Skip if we've already processed this article or it's already in the CSV
-                if article_id in processed_ids or article_id in existing_urls:
+                # The scan skipped earlier runs' articles; this catches the same article in two feeds this run
+                if article_id in existing_urls or article_id in store or article_id in history:
+                    RUN_METRICS.count("duplicate_articles")
+                    continue
+                
+                title = article['title']
+                description = article['description']
+                
+                # Skip stories already collected under another URL, e.g. republished with a new title
+                fingerprint = near_duplicates.fingerprint(title, description)
+                duplicate = near_duplicates.find_duplicate(title, description, fingerprint)
+                if duplicate:
+                    logger.info(f"Skipping near-duplicate of {duplicate[0]} ({duplicate[1]:.2f} similar): {article_id}")
+                    RUN_METRICS.count("near_duplicate_articles")
+                    # Only skipped for this run, not recorded in the history: a false
+                    # positive is collected once the threshold or the detector changes
+                    existing_urls.add(article_id)
                     continue
                 
                 # Extract AI/ML category from keywords found in the article
-                text = (article['title'] + " " + article['description']).lower()
-                category = determine_ai_category(text)
+                category = article.get('category')
+                if not category:
+                    category = determine_ai_category(article['title'] + " " + article['description'])
                   
                 # For research content, extract insights
                 insights = ""
                 if "Research" in source_type:
                     insights = extract_research_insights(article['description'], source_domain)
                 
-                # Decode HTML entities in title and description
-                title = html.unescape(article['title'])
-                description = html.unescape(article['description'])
-                
                 # Ensure consistent date format (YYYY-MM-DD)
                 pub_date = article['date']
                 
@@ -464,61 +1075,42 @@ def collect_news(teams_required: bool = False):
                     'insights': insights
                 })
                 
-                # Save the article ID to avoid duplicates in future runs
-                save_article_id(article_id)
+                # Remember the article ID to avoid duplicates in future runs
+                history.add(article_id)
+                near_duplicates.add(article_id, title, description, pub_date, fingerprint)
                 
                 # Add to existing urls to prevent duplicate URLs within the same run
                 existing_urls.add(article_id)
-            
-            # Respect the server by waiting between requests
-            time.sleep(2)
+                new_article_times.append(parse_timestamp(article.get('published_at')) or poll_time)
             
         except Exception as e:
             logger.error(f"Error processing feed {feed_url}: {str(e)}")
+        FEED_SCHEDULE.record_poll(feed_url, new_article_times, poll_time)
+    RUN_METRICS.add_stage_time("dedup", time.perf_counter() - dedup_started)
+    RUN_METRICS.count("new_articles", len(new_articles))
+    near_duplicate_count = RUN_METRICS.counter("near_duplicate_articles")
+    if near_duplicate_count:
+        logger.info(f"Skipped {near_duplicate_count} near-duplicates of stories already collected")
     
     if new_articles:
         logger.info(f"Found {len(new_articles)} new articles to add")
         
-        # Combine existing and new articles
-        all_articles = existing_articles + new_articles
+        # Upsert the new articles in one batch, then export the store newest first as the primary CSV
+        with RUN_METRICS.stage("store"):
+            inserted, changed_dates = store.upsert_many(new_articles)
+        with RUN_METRICS.stage("csv_write"):
+            total_articles = store.export_csv(CSV_OUTPUT_PATH)
         
-        # Sort all articles by date in descending order (newest first)
-        all_articles.sort(key=parse_sort_timestamp, reverse=True)
-        
-        # Create directories if they don't exist
-        os.makedirs(os.path.dirname(CSV_OUTPUT_PATH), exist_ok=True)
-        
-        # Write to the primary CSV file
-        temp_file = CSV_OUTPUT_PATH.with_suffix('.temp.csv')
-        with open(temp_file, mode='w', newline='', encoding='utf-8') as file:
-            fieldnames = ['date', 'published_at', 'title', 'description', 'source', 'url', 'category', 'source_type', 'insights']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for article in all_articles:
-                writer.writerow(article)
-        
-        # Replace the old file with the new one
-        if os.path.exists(CSV_OUTPUT_PATH):
-            os.remove(CSV_OUTPUT_PATH)
-        os.rename(temp_file, CSV_OUTPUT_PATH)
-        
-        logger.info(f"Updated primary CSV with {len(all_articles)} total articles")
+        logger.info(f"Stored {inserted} new articles, updated primary CSV with {total_articles} total articles")
         
         # Copy to secondary locations if needed
-        for secondary_path in SECONDARY_CSV_PATHS:
-            try:
-                # Create parent directories if needed
-                os.makedirs(os.path.dirname(secondary_path), exist_ok=True)
-                # Copy the file
-                shutil.copy2(CSV_OUTPUT_PATH, secondary_path)
-                logger.info(f"Copied CSV to secondary location: {secondary_path}")
-            except Exception as e:
-                logger.error(f"Error copying CSV to {secondary_path}: {str(e)}")
+        with RUN_METRICS.stage("csv_copy"):
+            copy_csv_to_secondary_paths()
         
         logger.info("CSV update completed successfully")
 
         # Send Teams notification for new articles
-        if TEAMS_AVAILABLE and notify_new_articles:
+        if load_teams_notifications() and notify_new_articles:
             try:
                 notify_new_articles(new_articles, required=teams_required)
             except Exception as e:
@@ -529,8 +1121,62 @@ def collect_news(teams_required: bool = False):
             logger.warning("Teams notifications not available but --teams-required was set")
     else:
         logger.info("No new articles found to add")
+        changed_dates = set()
+    
+    # Refresh the changed month partitions, the recent file, the chart aggregates and the search index for the web app
+    data_dir = os.path.dirname(CSV_OUTPUT_PATH)
+    try:
+        with RUN_METRICS.stage("web_exports"):
+            if state.csv_reloaded:
+                # An outside edit can change any month without changing the counts, so rewrite everything
+                logger.info("Article store was reloaded from an edited CSV, rebuilding all web app data exports")
+                rebuild_web_exports(CSV_OUTPUT_PATH, data_dir, today=current_date)
+                state.csv_reloaded = False
+            else:
+                manifest = update_archive(store, CSV_OUTPUT_PATH, data_dir, today=current_date,
+                                          changed_dates=changed_dates)
+                update_aggregates(new_articles, CSV_OUTPUT_PATH, data_dir, expected_total=manifest['total'])
+                update_search_index(new_articles, CSV_OUTPUT_PATH, data_dir, expected_total=manifest['total'])
+    except Exception as e:
+        logger.error(f"Error writing web app data exports: {str(e)}")
+    
+    # Save this run's article IDs in one batch and drop entries past the retention period
+    with RUN_METRICS.stage("history"):
+        history.flush()
+        history.compact()
+        near_duplicates.flush()
+        near_duplicates.prune(near_duplicate_cutoff())
+        if owns_state:
+            state.close()
+        else:
+            # Fold the WAL into ai_news.db so the file on disk is complete between cycles
+            store.checkpoint()
+    
+    # Persist the feed validators only after the run's output has been written
+    FEED_CACHE.prune(RSS_FEEDS)
+    FEED_CACHE.save()
+    FEED_SCHEDULE.prune(RSS_FEEDS)
+    FEED_SCHEDULE.save()
+    
+    if FEED_RECORDER is not None:
+        FEED_RECORDER.save()
+    
+    RUN_METRICS.finish()
+    if metrics_path:
+        try:
+            RUN_METRICS.write(metrics_path)
+            totals = RUN_METRICS.to_dict()["totals"]
+            logger.info(
+                f"Run metrics written to {metrics_path}: {totals['bytes']} bytes from {totals['feeds']} feeds, "
+                f"{totals['accepted']}/{totals['scanned']} entries accepted"
+            )
+        except Exception as e:
+            logger.error(f"Error writing run metrics: {str(e)}")
+    return RUN_METRICS
 
 if __name__ == "__main__":
+    from logging_setup import setup_logging
+
     parser = argparse.ArgumentParser(
         description="Collect AI news articles from RSS feeds"
     )
@@ -539,10 +1185,118 @@ if __name__ == "__main__":
         action="store_true",
         help="Fail if Teams notification cannot be sent"
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=MAX_CONCURRENT_FEEDS,
+        help=f"Maximum number of feeds fetched concurrently (default: {MAX_CONCURRENT_FEEDS})"
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record-fixtures",
+        metavar="DIR",
+        help="Save every downloaded feed body to DIR for offline replay"
+    )
+    fixtures.add_argument(
+        "--replay-fixtures",
+        metavar="DIR",
+        help="Serve feeds from fixtures recorded in DIR instead of the network"
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help=f"Processes used to parse downloaded feeds; 1 parses in-process (default: {PARSE_WORKERS})"
+    )
+    parser.add_argument(
+        "--full-poll",
+        action="store_true",
+        help="Poll every feed this run, including feeds the adaptive schedule would skip"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=str(METRICS_PATH),
+        help="Where to write the run's timings and counters; a .prom file uses the Prometheus textfile format"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"Profile the run with cProfile and print the top {PROFILE_TOP_FUNCTIONS} functions"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and collect every --interval-minutes, with the stores and HTTP pools kept warm"
+    )
+    parser.add_argument(
+        "--interval-minutes",
+        type=float,
+        default=DAEMON_INTERVAL_MINUTES,
+        help=f"Minutes between collection cycles in --daemon mode (default: {DAEMON_INTERVAL_MINUTES})"
+    )
+    parser.add_argument(
+        "--health-port",
+        type=int,
+        default=HEALTH_PORT,
+        help=f"Local port for the --daemon health and metrics endpoint; 0 disables it (default: {HEALTH_PORT})"
+    )
+    parser.add_argument(
+        "--recategorize",
+        action="store_true",
+        help="Re-run the category rules over the stored articles and refresh the exports, without fetching feeds"
+    )
     args = parser.parse_args()
+    setup_logging("ai_news_collector")
+
+    if args.recategorize:
+        try:
+            recategorize_articles()
+        except Exception as e:
+            logger.error(f"Recategorization failed: {str(e)}")
+            exit(1)
+        exit(0)
+
+    per_host_delay = PER_HOST_DELAY_SECONDS
+    full_poll = args.full_poll
+    if args.record_fixtures:
+        from feed_fixtures import FeedRecorder
+        FEED_RECORDER = FeedRecorder(args.record_fixtures)
+        # A fixture set should contain every feed
+        full_poll = True
+    if args.replay_fixtures:
+        enable_feed_replay(args.replay_fixtures)
+        # No remote server to be polite to, and replays should be repeatable
+        per_host_delay = 0
+        full_poll = True
+
+    if args.profile:
+        RUN_PROFILER = RunProfiler()
 
     try:
-        collect_news(teams_required=args.teams_required)
+        with RUN_PROFILER.profile() if RUN_PROFILER else contextlib.nullcontext():
+            if args.daemon:
+                from collector_daemon import run_daemon
+                state = CollectorState()
+                polls = itertools.count()
+
+                def run_cycle():
+                    # --full-poll only applies to the first cycle; later ones follow the feed schedule
+                    return collect_news(teams_required=args.teams_required, max_workers=args.max_workers,
+                                        per_host_delay=per_host_delay, metrics_path=args.metrics_file,
+                                        full_poll=full_poll and next(polls) == 0,
+                                        parse_workers=args.parse_workers, state=state)
+
+                try:
+                    run_daemon(run_cycle, interval_seconds=args.interval_minutes * 60, health_port=args.health_port)
+                finally:
+                    state.close()
+            else:
+                collect_news(teams_required=args.teams_required, max_workers=args.max_workers,
+                             per_host_delay=per_host_delay, metrics_path=args.metrics_file, full_poll=full_poll,
+                             parse_workers=args.parse_workers)
     except Exception as e:
         logger.error(f"Unhandled exception in the main process: {str(e)}")
         exit(1)
+    finally:
+        if RUN_PROFILER:
+            RUN_PROFILER.print_stats(PROFILE_TOP_FUNCTIONS)
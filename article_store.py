@@ -0,0 +1,287 @@
+"""
+Canonical article store for the AI News Collector.
+
+Every collected article lives in an SQLite table (ai_news.db, WAL mode), which
+is the source of truth. ai_news.csv and the web app's data files are exports of
+it. New articles are upserted in one batch per run. Dedup checks, the
+newest-first ordering and date range queries all use indexes, so nothing has
+to parse and sort the whole CSV.
+
+The store remembers the SHA-256 of the CSV it last exported. If the CSV is
+changed by something else (fix_html_entities.py, sync_csv_files.py, a manual
+edit), the next run reloads the store from the CSV. Those tools keep working
+on the CSV as before.
+"""
+
+import csv
+import datetime
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from history_store import normalize_url
+
+logger = logging.getLogger("AI_News_Collector")
+
+# Column order of the exported CSV - must match CSV_FIELDNAMES in sync_csv_files.py
+ARTICLE_FIELDS = ['date', 'published_at', 'title', 'description', 'source', 'url', 'category', 'source_type', 'insights']
+EXPORT_DIGEST_KEY = "exported_csv_sha256"
+DIGEST_CHUNK_SIZE = 1024 * 1024
+# URLs per IN (...) lookup; older SQLite builds allow at most 999 bound parameters
+LOOKUP_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str):
+    """Parse an article date like the collector does; unparseable dates sort as 1900-01-01."""
+    for date_format in ("%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y"):
+        try:
+            return datetime.datetime.strptime(date_str, date_format).replace(tzinfo=datetime.timezone.utc)
+        except ValueError:
+            continue
+    return datetime.datetime(1900, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def sort_key(published_at, date_str):
+    """Fixed-width UTC timestamp text that orders articles by published_at, falling back to the date column."""
+    parsed = None
+    if published_at:
+        try:
+            parsed = datetime.datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        except ValueError:
+            parsed = None
+    if parsed is None:
+        parsed = parse_date(date_str or "")
+    return parsed.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def file_digest(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DIGEST_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ArticleStore:
+    """SQLite table of every article, with batched upserts and an ordered CSV export."""
+
+    fields = ARTICLE_FIELDS
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        # Readers (the web exports) never block the writer; the WAL is folded back in on close
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                date TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                source TEXT NOT NULL,
+                category TEXT NOT NULL,
+                source_type TEXT NOT NULL,
+                insights TEXT NOT NULL,
+                sort_key TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                url_key TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_order ON articles (sort_key DESC, seq);
+            CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date);
+            CREATE INDEX IF NOT EXISTS idx_articles_category ON articles (category);
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source);
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(articles)")}
+        if "url_key" not in columns:
+            self._add_url_keys()
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_articles_url_key ON articles (url_key)")
+
+    def _add_url_keys(self):
+        # Stores created before the normalized URL column was added
+        with self.connection:
+            self.connection.execute("ALTER TABLE articles ADD COLUMN url_key TEXT NOT NULL DEFAULT ''")
+            urls = [row[0] for row in self.connection.execute("SELECT url FROM articles")]
+            self.connection.executemany("UPDATE articles SET url_key = ? WHERE url = ?",
+                                        [(normalize_url(url), url) for url in urls])
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def __contains__(self, url):
+        with self._lock:
+            row = self.connection.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone()
+        return row is not None
+
+    def has_url_key(self, url_key):
+        """Check for an article whose normalized URL (history_store.normalize_url) is url_key."""
+        with self._lock:
+            row = self.connection.execute("SELECT 1 FROM articles WHERE url_key = ? LIMIT 1", (url_key,)).fetchone()
+        return row is not None
+
+    def urls(self):
+        """Every stored article URL, as a set for bulk membership checks."""
+        with self._lock:
+            return {row[0] for row in self.connection.execute("SELECT url FROM articles")}
+
+    def _meta(self, key):
+        row = self.connection.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def upsert_many(self, articles):
+        """Insert or update article dicts (CSV columns) in one transaction.
+
+        New articles are numbered after every stored one, so articles with the same
+        sort key keep their insertion order in the export. Returns (number of new
+        articles, set of article dates whose rows changed), including the old dates of
+        updated articles.
+        """
+        rows = []
+        for article in articles:
+            values = [article.get(field) or "" for field in ARTICLE_FIELDS]
+            rows.append(values + [sort_key(article.get("published_at"), article.get("date")),
+                                  normalize_url(article.get("url"))])
+        if not rows:
+            return 0, set()
+        url_position = ARTICLE_FIELDS.index("url")
+        date_position = ARTICLE_FIELDS.index("date")
+        placeholders = ", ".join("?" * len(ARTICLE_FIELDS))
+        updates = ", ".join(f"{field} = excluded.{field}" for field in ARTICLE_FIELDS + ["sort_key", "url_key"]
+                            if field != "url")
+        with self._lock:
+            with self.connection:
+                urls = [row[url_position] for row in rows]
+                existing = {}
+                for start in range(0, len(urls), LOOKUP_BATCH_SIZE):
+                    batch = urls[start:start + LOOKUP_BATCH_SIZE]
+                    existing.update(self.connection.execute(
+                        f"SELECT url, date FROM articles WHERE url IN ({','.join('?' * len(batch))})", batch
+                    ).fetchall())
+                next_seq = self.connection.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM articles").fetchone()[0]
+                self.connection.executemany(
+                    f"INSERT INTO articles ({', '.join(ARTICLE_FIELDS)}, sort_key, url_key, seq) "
+                    f"VALUES ({placeholders}, ?, ?, ?) "
+                    f"ON CONFLICT(url) DO UPDATE SET {updates}",
+                    [row + [next_seq + index] for index, row in enumerate(rows)]
+                )
+        dates = {row[date_position] for row in rows} | set(existing.values())
+        return len({row[url_position] for row in rows} - set(existing)), dates
+
+    def iter_rows(self, date_from=None, date_to=None, category=None, source=None):
+        """Yield articles newest first as lists in ARTICLE_FIELDS order.
+
+        date_from and date_to select date >= date_from and date < date_to, compared as
+        text like the CSV's date column. category and source select exact matches.
+        """
+        conditions, parameters = [], []
+        for clause, value in (("date >= ?", date_from), ("date < ?", date_to),
+                              ("category = ?", category), ("source = ?", source)):
+            if value is not None:
+                conditions.append(clause)
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        query = f"SELECT {', '.join(ARTICLE_FIELDS)} FROM articles {where}ORDER BY sort_key DESC, seq"
+        # A separate cursor, so other calls can use the connection while a caller iterates
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.execute(query, parameters)
+        while True:
+            with self._lock:
+                batch = cursor.fetchmany(1000)
+            if not batch:
+                break
+            for row in batch:
+                yield list(row)
+
+    def load_csv(self, csv_path):
+        """Replace the stored articles with a CSV's rows, keeping its order and its first row per URL."""
+        count = 0
+        seen_urls = set()
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            rows = []
+            for row in csv.DictReader(f):
+                url = row.get("url")
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                count += 1
+                values = [row.get(field) or "" for field in ARTICLE_FIELDS]
+                rows.append(values + [sort_key(row.get("published_at"), row.get("date")), normalize_url(url), count])
+        placeholders = ", ".join("?" * (len(ARTICLE_FIELDS) + 3))
+        with self._lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM articles")
+                self.connection.executemany(
+                    f"INSERT INTO articles ({', '.join(ARTICLE_FIELDS)}, sort_key, url_key, seq) VALUES ({placeholders})",
+                    rows
+                )
+                self._set_meta(EXPORT_DIGEST_KEY, file_digest(csv_path))
+        logger.info(f"Loaded {count} articles from {csv_path} into article store {self.path}")
+        return count
+
+    def sync_from_csv(self, csv_path):
+        """Reload the store from csv_path if the file is not the one it last exported.
+
+        Returns True if the store was reloaded. A missing CSV is written from the store.
+        """
+        if not os.path.exists(csv_path):
+            if len(self):
+                logger.warning(f"{csv_path} is missing, exporting it from article store {self.path}")
+                self.export_csv(csv_path)
+            return False
+        with self._lock:
+            exported_digest = self._meta(EXPORT_DIGEST_KEY)
+        if exported_digest == file_digest(csv_path):
+            return False
+        if exported_digest:
+            logger.warning(f"{csv_path} was changed outside the collector, reloading article store from it")
+        self.load_csv(csv_path)
+        return True
+
+    def export_csv(self, csv_path):
+        """Write every article newest first to csv_path atomically and return the article count."""
+        csv_path = Path(csv_path)
+        os.makedirs(csv_path.parent, exist_ok=True)
+        temp_path = csv_path.with_suffix(".temp.csv")
+        count = 0
+        with open(temp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(ARTICLE_FIELDS)
+            for row in self.iter_rows():
+                writer.writerow(row)
+                count += 1
+        digest = file_digest(temp_path)
+        os.replace(temp_path, csv_path)
+        with self._lock:
+            with self.connection:
+                self._set_meta(EXPORT_DIGEST_KEY, digest)
+        return count
+
+    def checkpoint(self):
+        """Fold the write-ahead log back into the database file."""
+        with self._lock:
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Checkpoint the write-ahead log and close the database."""
+        self.checkpoint()
+        with self._lock:
+            self.connection.close()
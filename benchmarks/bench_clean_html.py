@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Parity check and throughput benchmark for clean_html.
+
+Compares the tiered clean_html (plain-text fast path, streaming tag stripper,
+BeautifulSoup fallback) against the original BeautifulSoup-only cleaner on every
+summary, description and content field, then reports entries per second for both.
+
+Fields come from the feed bodies in --feeds (by default the checked-in
+tests/fixtures/feeds, or a directory written by --record-fixtures), read with
+both feedparser and the streaming reader, since feedparser rewrites some markup
+before the collector sees it. With --csv they are synthesized from the article
+CSV instead. tests/test_clean_html.py runs the same parity check under pytest.
+
+Usage:
+    python benchmarks/bench_clean_html.py [--feeds DIR | --csv PATH] [--repeat N]
+"""
+
+import argparse
+import csv
+import html
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import feedparser  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+from ai_news_collector import clean_html  # noqa: E402
+from feed_stream import FeedStreamError, iter_feed_entries  # noqa: E402
+
+FIXTURE_FEEDS_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "feeds"
+
+
+def legacy_clean_html(html_text):
+    """The original BeautifulSoup-only cleaner, kept as the reference output."""
+    if not html_text:
+        return ""
+    soup = BeautifulSoup(html_text, "html.parser")
+    return soup.get_text(separator=" ", strip=True)
+
+
+def entry_fields(entries):
+    fields = []
+    for entry in entries:
+        for key in ("summary", "description"):
+            if entry.get(key):
+                fields.append(entry[key])
+        for content in entry.get("content", []):
+            fields.append(content.get("value", ""))
+    return fields
+
+
+def fields_from_feeds(feed_dir):
+    """Collect every summary, description and content value from archived feed bodies.
+
+    Each body is read by feedparser and by the streaming reader, which passes the
+    markup through unchanged, as the collector does for STREAMED_FEEDS.
+    """
+    fields = []
+    for path in sorted(Path(feed_dir).rglob("*")):
+        if not path.is_file() or path.suffix == ".json":
+            continue
+        body = path.read_bytes()
+        fields.extend(entry_fields(feedparser.parse(body).entries))
+        try:
+            fields.extend(entry_fields(iter_feed_entries(body)))
+        except FeedStreamError:
+            pass
+    return fields
+
+
+def fields_from_csv(csv_path):
+    """Synthesize feed-style fields from already cleaned CSV descriptions."""
+    fields = []
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            text = row["description"]
+            escaped = html.escape(text, quote=False)
+            fields.append(text)
+            fields.append(f"<p>{escaped}</p>")
+            fields.append(
+                f'<p>{escaped}</p><p>The post <a href="{row["url"]}" rel="nofollow">'
+                f'{html.escape(row["title"])}</a> appeared first on {row["source"]}.</p>'
+            )
+            fields.append(
+                f'<figure><img src="{row["url"]}.jpg" alt="" /></figure>\n'
+                f'<p>{escaped.replace(". ", ".&#160;", 1)}</p>\n<!-- more -->'
+            )
+    return fields
+
+
+def time_cleaner(cleaner, fields, repeat):
+    """Return (best seconds per pass, outputs) for a cleaner."""
+    best = None
+    outputs = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = [cleaner(field) for field in fields]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check clean_html parity and measure its throughput")
+    parser.add_argument("--feeds", default=str(FIXTURE_FEEDS_DIR), help="Directory of archived RSS/Atom feed bodies")
+    parser.add_argument("--csv", help="Synthesize the fields from this article CSV instead")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per cleaner (best is kept)")
+    args = parser.parse_args()
+
+    if args.csv:
+        fields = fields_from_csv(args.csv)
+        print(f"Corpus: {len(fields)} synthesized fields from {args.csv}")
+    else:
+        fields = fields_from_feeds(args.feeds)
+        print(f"Corpus: {len(fields)} fields from archived feeds in {args.feeds}")
+    if not fields:
+        print("No fields to clean")
+        return 1
+
+    legacy_time, expected = time_cleaner(legacy_clean_html, fields, args.repeat)
+    tiered_time, actual = time_cleaner(clean_html, fields, args.repeat)
+
+    mismatches = [(field, want, got) for field, want, got in zip(fields, expected, actual) if want != got]
+    for field, want, got in mismatches[:10]:
+        print(f"MISMATCH for {field[:80]!r}:\n  BeautifulSoup: {want[:80]!r}\n  tiered:        {got[:80]!r}")
+
+    print(f"Parity: {len(fields) - len(mismatches)}/{len(fields)} fields identical")
+    print(f"BeautifulSoup: {len(fields) / legacy_time:,.0f} entries/s")
+    print(f"Tiered:        {len(fields) / tiered_time:,.0f} entries/s ({legacy_time / tiered_time:.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
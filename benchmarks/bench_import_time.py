@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Import-time benchmark for ai_news_collector, with a budget.
+
+Imports the collector in fresh interpreters under `python -X importtime` and
+reports the median cumulative import time of the module, plus the slowest
+modules it pulls in. It also checks that the network and parsing stack
+(requests, feedparser, BeautifulSoup, the process pool, the daemon's HTTP
+server) is left unimported until the fetch stage needs it.
+
+Bytecode caching is switched on for the child interpreters and one warm-up
+import is discarded, so the timings reflect normal runs rather than recompiling
+the sources. Exits with status 1 when the median is over --budget-ms or a
+deferred module was imported.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs N] [--budget-ms MS] [--top N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+MODULE = "ai_news_collector"
+# Modules that only the fetch stage, the parse pool or --daemon should import
+DEFERRED_MODULES = ["requests", "urllib3", "feedparser", "bs4", "feed_stream", "feed_fixtures",
+                    "concurrent.futures.process", "collector_daemon", "http.server", "cProfile"]
+
+
+def run_importtime():
+    """Import the module once in a fresh interpreter; return {module: (self µs, cumulative µs)} for its subtree."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # The header line
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    # Children are printed before their parent, so the collector's subtree is the
+    # run of deeper entries just above its own line (site's imports are outside it)
+    index = next(index for index, entry in enumerate(entries) if entry[1] == MODULE)
+    depth = entries[index][0]
+    timings = {MODULE: entries[index][2:]}
+    for child_depth, name, self_us, cumulative_us in reversed(entries[:index]):
+        if child_depth <= depth:
+            break
+        timings.setdefault(name, (self_us, cumulative_us))
+    return timings
+
+
+def imported_deferred_modules():
+    """Names from DEFERRED_MODULES that are in sys.modules right after importing the collector."""
+    code = (f"import sys, {MODULE}; "
+            f"print(' '.join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    return completed.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long importing the collector takes")
+    parser.add_argument("--runs", type=int, default=7, help="Timed imports (after one warm-up)")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Maximum median import time in milliseconds")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imported modules to list")
+    args = parser.parse_args()
+
+    run_importtime()  # Warm-up: writes the bytecode caches
+    runs = [run_importtime() for _ in range(args.runs)]
+    totals = [timings[MODULE][1] / 1000 for timings in runs]
+    median_ms = statistics.median(totals)
+    print(f"{MODULE}: median {median_ms:.1f} ms over {args.runs} imports "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}), budget {args.budget_ms:g} ms")
+
+    # The slowest modules by self time, median over the runs
+    names = set().union(*runs) - {MODULE}
+    self_ms = {name: statistics.median(timings[name][0] / 1000 for timings in runs if name in timings)
+               for name in names}
+    print("Slowest modules by self time:")
+    for name, milliseconds in sorted(self_ms.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {milliseconds:7.2f} ms  {name}")
+    print(f"  {statistics.median(timings[MODULE][0] / 1000 for timings in runs):7.2f} ms  {MODULE} (module body)")
+
+    deferred = imported_deferred_modules()
+    print(f"Deferred modules imported: {', '.join(deferred) if deferred else 'none'}")
+    within_budget = median_ms <= args.budget_ms
+    if not within_budget:
+        print(f"Over budget by {median_ms - args.budget_ms:.1f} ms")
+    return 0 if within_budget and not deferred else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
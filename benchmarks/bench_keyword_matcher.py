@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Benchmark the compiled keyword matcher against the original linear keyword scans.
+
+Runs both implementations over every article in the primary ai_news.csv, once as
+a regular news source (is_ai_related + category) and once as a research firm
+(title / first 150 characters + category), checks that the classifications are
+identical and reports the timings.
+
+Both paths answer relevance and the category from a single scan per article,
+as the collector's feed scan does. On the archive, where nearly every article is
+AI-related and the linear checks stop at an early keyword, the timings are
+within noise of each other; the compiled matcher gains on text without AI
+keywords, which the linear checks scan to the end for every keyword.
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py [--csv PATH] [--repeat N]
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_news_collector import AI_CATEGORIES, AI_KEYWORDS, CSV_OUTPUT_PATH, KEYWORD_MATCHER, is_ai_related  # noqa: E402
+
+
+# Original implementations, kept verbatim as the reference
+def legacy_is_ai_related(title, description):
+    text = (title + " " + description).lower()
+    return any(keyword.lower() in text for keyword in AI_KEYWORDS)
+
+
+def legacy_determine_ai_category(text):
+    text = text.lower()
+    for category, keywords in AI_CATEGORIES.items():
+        if any(keyword in text for keyword in keywords):
+            return category
+    return "artificial intelligence"
+
+
+def legacy_news(title, description):
+    if not legacy_is_ai_related(title, description):
+        return None
+    return legacy_determine_ai_category((title + " " + description).lower())
+
+
+def legacy_research(title, description):
+    if not any(keyword.lower() in title.lower() for keyword in AI_KEYWORDS):
+        short_desc = description[:150].lower() if description else ""
+        if not any(keyword.lower() in short_desc for keyword in AI_KEYWORDS):
+            return None
+    return legacy_determine_ai_category((title + " " + description).lower())
+
+
+def matcher_news(title, description):
+    keywords = KEYWORD_MATCHER.scan(title, description)
+    return keywords.category() if is_ai_related(title, description, keywords) else None
+
+
+def matcher_research(title, description):
+    keywords = KEYWORD_MATCHER.scan(title, description)
+    if not (keywords.has_ai_keyword_in_title() or keywords.has_ai_keyword_in_description(150)):
+        return None
+    return keywords.category()
+
+
+def time_classifier(classifier, articles, repeat):
+    """Return (best seconds per pass, classifications) for a classifier."""
+    best = None
+    results = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [classifier(title, description) for title, description in articles]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword matching over the article corpus")
+    parser.add_argument("--csv", default=str(CSV_OUTPUT_PATH), help="CSV corpus to classify")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes per implementation (best is kept)")
+    args = parser.parse_args()
+
+    with open(args.csv, "r", newline="", encoding="utf-8") as f:
+        articles = [(row["title"], row["description"]) for row in csv.DictReader(f)]
+    print(f"Corpus: {len(articles)} articles from {args.csv}")
+
+    all_identical = True
+    for path, legacy, matcher in [("news", legacy_news, matcher_news),
+                                  ("research", legacy_research, matcher_research)]:
+        legacy_time, legacy_results = time_classifier(legacy, articles, args.repeat)
+        matcher_time, matcher_results = time_classifier(matcher, articles, args.repeat)
+        identical = legacy_results == matcher_results
+        all_identical = all_identical and identical
+        print(
+            f"{path:>8}: linear {legacy_time * 1000:.1f} ms, compiled {matcher_time * 1000:.1f} ms, "
+            f"speedup {legacy_time / matcher_time:.2f}x, identical output: {identical}"
+        )
+
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+"""
+Stage-by-stage benchmark of the collect_news pipeline, run entirely offline.
+
+For each corpus size (1k, 10k and 100k articles by default) it writes synthetic
+RSS fixtures spread over the configured feeds, plus an existing archive CSV of
+the same size. It then times each pipeline stage on its own:
+
+    fetch           replayed HTTP requests through the pooled session
+    parse           feedparser over every feed body
+    clean_html      description cleaning for every entry
+    keywords        AI keyword filtering
+    categorize      category assignment for the accepted entries
+    parse_serial    the collector's parse stage (feedparser, cleaning, keywords) in-process
+    parse_pool      the same stage over a process pool (--parse-workers), checked against parse_serial
+    parse_stream    the same stage with the streaming reader for every feed, checked against parse_serial
+    dedup           article store, history store and near-duplicate lookups
+    store           upserting the accepted articles into the SQLite article store and exporting the CSV
+    write           month partitions, aggregates and search index
+    write_store     the same exports, rewriting only the months the new articles touch (from the store)
+    copy            copying the CSV to the secondary location
+    collect_news    a full replayed run against the archive (end to end)
+
+Pass --fixtures to replay recorded feeds (from ai_news_collector.py
+--record-fixtures) instead of synthetic ones. Results are written as JSON with
+--output, and --compare prints per-stage ratios against an earlier results file.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 1000,10000,100000] [--fixtures DIR]
+                                        [--parse-workers N] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import csv
+import datetime
+import email.utils
+import html
+import json
+import logging
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import feedparser  # noqa: E402
+
+import ai_news_collector as collector  # noqa: E402
+from feed_cache import FeedCache  # noqa: E402
+from feed_schedule import FeedSchedule  # noqa: E402
+from feed_fixtures import load_fixture_index, save_fixture_index, write_fixture  # noqa: E402
+from article_store import ARTICLE_FIELDS, ArticleStore, sort_key  # noqa: E402
+from history_store import ArticleHistory  # noqa: E402
+from near_duplicates import NearDuplicateIndex  # noqa: E402
+from web_exports import update_aggregates, update_archive, update_search_index, write_archive  # noqa: E402
+
+START = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+AI_PHRASES = ["large language models", "machine learning", "generative AI", "neural network", "AI agents",
+              "computer vision", "OpenAI", "robotics", "deep learning", "AI chips"]
+OTHER_PHRASES = ["smartphones", "electric cars", "streaming deals", "space launches", "gaming consoles"]
+# Filler vocabulary so synthetic stories are not near-duplicates of each other
+FILLER_WORDS = [f"term{number}" for number in range(5000)]
+
+
+def synthetic_item(feed_index, index, timestamp, rng):
+    """One RSS item with HTML in its description; roughly 70% mention an AI topic."""
+    topic = rng.choice(AI_PHRASES) if rng.random() < 0.7 else rng.choice(OTHER_PHRASES)
+    title = f"Story {index}: what {topic} means for {' '.join(rng.sample(FILLER_WORDS, 3))}"
+    description = (f"<p>Analysts weigh in on {topic} &amp; {' '.join(rng.sample(FILLER_WORDS, 30))}.</p>"
+                   f"<p>The post appeared first on example.com.</p>")
+    return (
+        f"<item><title>{html.escape(title)}</title>"
+        f"<link>https://bench.example.com/{feed_index}/{index}</link>"
+        f"<description>{html.escape(description)}</description>"
+        f"<pubDate>{email.utils.format_datetime(timestamp)}</pubDate></item>"
+    )
+
+
+def write_synthetic_fixtures(fixtures_dir, size, rng):
+    """Spread `size` items over the configured feeds and save them as replay fixtures."""
+    feeds = collector.RSS_FEEDS
+    items = {url: [] for url in feeds}
+    for index in range(size):
+        feed_index = index % len(feeds)
+        timestamp = START + datetime.timedelta(minutes=rng.randrange(size * 30))
+        items[feeds[feed_index]].append(synthetic_item(feed_index, index, timestamp, rng))
+
+    index_map = {}
+    for position, url in enumerate(feeds):
+        body = ("<?xml version='1.0' encoding='utf-8'?><rss version='2.0'><channel>"
+                f"<title>Feed {position}</title>" + "".join(items[url]) + "</channel></rss>").encode("utf-8")
+        write_fixture(fixtures_dir, index_map, url, body, headers={
+            "Content-Type": "application/rss+xml; charset=utf-8",
+            "ETag": f'"bench-{position}-{size}"',
+        })
+    save_fixture_index(fixtures_dir, index_map)
+
+
+def write_archive_csv(path, size, rng):
+    """Write an existing newest-first archive of `size` synthetic articles."""
+    rows = []
+    for index in range(size):
+        timestamp = START + datetime.timedelta(minutes=rng.randrange(size * 30))
+        rows.append({
+            'date': timestamp.strftime("%Y-%m-%d"),
+            'published_at': timestamp.isoformat().replace("+00:00", "Z"),
+            'title': f"Archived story {index} about {rng.choice(AI_PHRASES)}",
+            'description': f"Archived description {index} covering {rng.choice(AI_PHRASES)}.",
+            'source': rng.choice(["techcrunch.com", "wired.com", "theverge.com", "venturebeat.com"]),
+            'url': f"https://archive.example.com/{index}",
+            'category': rng.choice(list(collector.AI_CATEGORIES)),
+            'source_type': "News Source",
+            'insights': "",
+        })
+    rows.sort(key=lambda row: sort_key(row['published_at'], row['date']), reverse=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=ARTICLE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def use_workspace(workspace):
+    """Point the collector's output paths, history, feed cache and schedule at a scratch directory."""
+    collector.CSV_OUTPUT_PATH = workspace / "docs" / "data" / "ai_news.csv"
+    collector.SECONDARY_CSV_PATHS = [workspace / "web_app" / "data" / "ai_news.csv"]
+    collector.HISTORY_DB_PATH = workspace / "ai_news.db"
+    collector.HISTORY_FILE = workspace / "article_history.txt"
+    collector.FEED_CACHE = FeedCache(workspace / "feed_cache.json")
+    collector.FEED_SCHEDULE = FeedSchedule(workspace / "feed_schedule.json")
+    collector.TEAMS_AVAILABLE = False
+
+
+class StageTimer:
+    """Collects (stage, seconds, items) measurements for one corpus size."""
+
+    def __init__(self, size):
+        self.size = size
+        self.results = []
+
+    def measure(self, stage, func, items=None):
+        started = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - started
+        count = items(value) if callable(items) else items
+        self.results.append({
+            "size": self.size,
+            "stage": stage,
+            "seconds": round(elapsed, 6),
+            "items": count,
+            "items_per_second": round(count / elapsed, 1) if count and elapsed else None,
+        })
+        print(f"{self.size:>8} {stage:<13} {elapsed * 1000:10.1f} ms  {count if count is not None else '':>8}")
+        return value
+
+
+def run_stages(size, fixtures_dir, workspace, rng, parse_workers=collector.PARSE_WORKERS):
+    """Time every pipeline stage over the fixtures, then a full replayed collect_news run."""
+    timer = StageTimer(size)
+    use_workspace(workspace)
+    archive_path = collector.CSV_OUTPUT_PATH
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    write_archive_csv(archive_path, size, rng)
+    pristine_archive = workspace / "archive.csv"
+    shutil.copy(archive_path, pristine_archive)
+    collector.enable_feed_replay(fixtures_dir)
+    session = collector.get_http_session()
+    feed_urls = list(load_fixture_index(fixtures_dir))
+
+    bodies = timer.measure(
+        "fetch", lambda: [session.get(url, timeout=collector.REQUEST_TIMEOUT_SECONDS).content for url in feed_urls],
+        len(feed_urls))
+    feeds = timer.measure("parse", lambda: [feedparser.parse(body) for body in bodies],
+                          lambda parsed: sum(len(feed.entries) for feed in parsed))
+    entries = [entry for feed in feeds for entry in feed.entries]
+
+    descriptions = timer.measure(
+        "clean_html", lambda: [collector.clean_html(entry.get("summary", "")) for entry in entries], len(entries))
+    scanned = timer.measure(
+        "keywords",
+        lambda: [(entry, description, keywords) for entry, description in zip(entries, descriptions)
+                 for keywords in [collector.KEYWORD_MATCHER.scan(entry.get("title", ""), description)]
+                 if keywords.is_ai_related()],
+        len(entries))
+    accepted = timer.measure(
+        "categorize",
+        lambda: [{
+            'date': collector.format_struct_time_date(entry.published_parsed),
+            'published_at': collector.format_struct_time_timestamp(entry.published_parsed),
+            'title': entry.get("title", ""),
+            'description': description,
+            'source': "bench.example.com",
+            'url': entry.get("link", ""),
+            'category': keywords.category(),
+            'source_type': "News Source",
+            'insights': "",
+        } for entry, description, keywords in scanned],
+        len(scanned))
+
+    jobs = [(url, body, collector.MAX_ARTICLES_PER_SOURCE, False) for url, body in zip(feed_urls, bodies)]
+    serial = timer.measure("parse_serial", lambda: collector.parse_feed_bodies(jobs, workers=1), len(jobs))
+    pooled = timer.measure("parse_pool", lambda: collector.parse_feed_bodies(jobs, workers=parse_workers), len(jobs))
+    if [result['articles'] for result in pooled] != [result['articles'] for result in serial]:
+        raise RuntimeError("Process pool parsing returned different articles than in-process parsing")
+    stream_jobs = [(url, body, max_articles, True) for url, body, max_articles, _ in jobs]
+    streamed = timer.measure("parse_stream", lambda: collector.parse_feed_bodies(stream_jobs, workers=1), len(jobs))
+    if [result['articles'] for result in streamed] != [result['articles'] for result in serial]:
+        raise RuntimeError("The streaming reader returned different articles than feedparser")
+
+    # Half of the accepted articles were seen in an earlier run
+    history = ArticleHistory(workspace / "dedup.db")
+    for article in accepted[::2]:
+        history.add(article['url'])
+    history.flush()
+    # The store starts from the archive, as after the previous run
+    store = ArticleStore(workspace / "store.db")
+    store.load_csv(pristine_archive)
+    near_duplicates = NearDuplicateIndex(workspace / "dedup.db")
+
+    def dedup():
+        unique = []
+        for article in accepted:
+            if article['url'] in store or article['url'] in history:
+                continue
+            fingerprint = near_duplicates.fingerprint(article['title'], article['description'])
+            if near_duplicates.find_duplicate(article['title'], article['description'], fingerprint):
+                continue
+            near_duplicates.add(article['url'], article['title'], article['description'], article['date'], fingerprint)
+            unique.append(article)
+        near_duplicates.flush()
+        return unique
+
+    new_articles = timer.measure("dedup", dedup, len(accepted))
+    near_duplicates.close()
+    history.close()
+
+    store_csv = workspace / "store" / "ai_news.csv"
+
+    def store_articles():
+        _, changed_dates = store.upsert_many(new_articles)
+        store.export_csv(archive_path)
+        return changed_dates
+
+    changed_dates = timer.measure("store", store_articles, size + len(new_articles))
+
+    def write_exports():
+        manifest = write_archive(archive_path, archive_path.parent)
+        update_aggregates(new_articles, archive_path, archive_path.parent, expected_total=manifest['total'])
+        update_search_index(new_articles, archive_path, archive_path.parent, expected_total=manifest['total'])
+        return manifest['total']
+
+    timer.measure("write", write_exports, lambda total: total)
+    # Exports as in the previous run, so only the months of the new articles need rewriting
+    store_csv.parent.mkdir(parents=True, exist_ok=True)
+    write_archive(pristine_archive, store_csv.parent)
+    shutil.copy(archive_path, store_csv)
+    timer.measure("write_store",
+                  lambda: update_archive(store, store_csv, store_csv.parent, changed_dates=changed_dates)['total'],
+                  lambda total: total)
+    store.close()
+
+    def copy_secondary():
+        for secondary_path in collector.SECONDARY_CSV_PATHS:
+            secondary_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(archive_path, secondary_path)
+
+    timer.measure("copy", copy_secondary, len(collector.SECONDARY_CSV_PATHS))
+
+    # End to end against a fresh copy of the archive (exports already exist, as in production)
+    shutil.copy(pristine_archive, archive_path)
+    timer.measure("collect_news",
+                  lambda: collector.collect_news(per_host_delay=0, metrics_path=workspace / "run_metrics.json",
+                                                parse_workers=parse_workers),
+                  len(feed_urls))
+    return timer.results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path, results):
+    """Print each stage's time relative to an earlier results file."""
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    before = {(row["size"], row["stage"]): row["seconds"] for row in previous["results"]}
+    print(f"\nCompared with {previous_path} ({previous.get('git_commit') or 'unknown commit'}):")
+    for row in results:
+        old = before.get((row["size"], row["stage"]))
+        if old:
+            print(f"{row['size']:>8} {row['stage']:<13} {old * 1000:10.1f} ms -> {row['seconds'] * 1000:10.1f} ms"
+                  f"  ({row['seconds'] / old:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each collect_news stage offline")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated corpus sizes")
+    parser.add_argument("--fixtures", help="Replay feeds recorded with --record-fixtures instead of synthetic ones")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--parse-workers", type=int, default=max(2, collector.PARSE_WORKERS),
+                        help="Processes for the parse_pool stage and the collect_news run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Keep the collector's per-feed log lines out of the timings and the output
+    logging.getLogger("AI_News_Collector").setLevel(logging.WARNING)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    rng = random.Random(args.seed)
+    results = []
+    print(f"{'size':>8} {'stage':<13} {'time':>13}  {'items':>8}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            workspace = Path(temp_dir)
+            fixtures_dir = Path(args.fixtures) if args.fixtures else workspace / "fixtures"
+            if not args.fixtures:
+                fixtures_dir.mkdir()
+                write_synthetic_fixtures(fixtures_dir, size, rng)
+            results.extend(run_stages(size, fixtures_dir, workspace, rng, args.parse_workers))
+
+    report = {
+        "benchmark": "pipeline",
+        "created_at": datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "fixtures": args.fixtures or "synthetic",
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {len(results)} measurements to {args.output}")
+    if args.compare:
+        compare(args.compare, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
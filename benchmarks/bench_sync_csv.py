@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""
+Benchmark sync_csv_files.synchronize_csv_files against the original implementation.
+
+Builds the three synchronized CSVs from a synthetic newest-first corpus (100k
+rows by default): a stale root ai_news.csv holding an older subset, and full
+docs and web_app copies. Both implementations synchronize a fresh copy of the
+files, reporting wall time and peak Python memory. The streaming merge must
+match a full sort of the same rows byte for byte, and both implementations
+must keep the same set of URLs.
+
+The original wrote a fieldnames list without published_at, which makes
+csv.DictWriter reject every current row, so the legacy version here writes the
+full header. Everything else is as it was: read all files into one list, sort it
+with strptime per row, and write the list three times.
+
+Usage:
+    python benchmarks/bench_sync_csv.py [--rows N]
+"""
+
+import argparse
+import csv
+import datetime
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sync_csv_files  # noqa: E402
+from sync_csv_files import CSV_FIELDNAMES, sort_key  # noqa: E402
+
+START = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def synthetic_article(index, timestamp, rng):
+    """Build one article row, leaving published_at empty for some rows like older data."""
+    published_at = timestamp.isoformat().replace("+00:00", "Z") if rng.random() > 0.1 else ""
+    return {
+        'date': timestamp.strftime("%Y-%m-%d"),
+        'published_at': published_at,
+        'title': f"Synthetic AI headline number {index}",
+        'description': f"Description for article {index} about large language models, agents and chips. " * 2,
+        'source': rng.choice(["techcrunch.com", "wired.com", "theverge.com", "venturebeat.com"]),
+        'url': f"https://example.com/articles/{index}",
+        'category': rng.choice(["artificial intelligence", "language models", "ai business"]),
+        'source_type': "News Source",
+        'insights': "",
+    }
+
+
+def legacy_parse_date(date_str):
+    try:
+        if "/" in date_str:  # MM/DD/YYYY
+            return datetime.datetime.strptime(date_str, "%m/%d/%Y")
+        else:  # YYYY-MM-DD
+            return datetime.datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        return datetime.datetime(1900, 1, 1)
+
+
+def legacy_synchronize(csv_paths):
+    """The original synchronize_csv_files: read all, sort all, write three times."""
+    all_articles = []
+    url_set = set()
+    for csv_path in csv_paths:
+        with open(csv_path, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                if row['url'] in url_set:
+                    continue
+                url_set.add(row['url'])
+                all_articles.append(row)
+    all_articles.sort(key=lambda x: legacy_parse_date(x['date']), reverse=True)
+    for csv_path in csv_paths:
+        temp_path = csv_path.with_suffix('.temp.csv')
+        with open(temp_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDNAMES)
+            writer.writeheader()
+            for article in all_articles:
+                writer.writerow(article)
+        temp_path.replace(csv_path)
+
+
+def streaming_synchronize(csv_paths):
+    sync_csv_files.CSV_PATHS = csv_paths
+    sync_csv_files.synchronize_csv_files()
+
+
+def build_files(source_dir, rows, rng):
+    """Write the stale root file and the two full copies, all newest-first."""
+    articles = [
+        synthetic_article(index, START + datetime.timedelta(minutes=rng.randrange(rows * 30)), rng)
+        for index in range(rows)
+    ]
+    articles.sort(key=lambda article: sort_key(article['published_at'], article['date']), reverse=True)
+    stale = articles[len(articles) * 2 // 5:]
+    paths = [source_dir / "ai_news.csv", source_dir / "docs.csv", source_dir / "web_app.csv"]
+    for path, contents in zip(paths, [stale, articles, articles]):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(contents)
+    return paths
+
+
+def measure(label, synchronize, source_paths, work_dir):
+    """Time a run on fresh copies of the files, then repeat it under tracemalloc for peak memory."""
+    def fresh_copies():
+        work_dir.mkdir(exist_ok=True)
+        paths = [work_dir / path.name for path in source_paths]
+        for source, path in zip(source_paths, paths):
+            shutil.copyfile(source, path)
+        return paths
+
+    paths = fresh_copies()
+    started = time.perf_counter()
+    synchronize(paths)
+    elapsed = time.perf_counter() - started
+    with open(paths[0], newline="", encoding="utf-8") as f:
+        urls = {row['url'] for row in csv.DictReader(f)}
+
+    memory_paths = fresh_copies()
+    tracemalloc.start()
+    synchronize(memory_paths)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:>9}: {elapsed:.2f}s, peak memory {peak / 1024 / 1024:.1f} MiB, {len(urls)} rows")
+    return elapsed, urls
+
+
+def full_sort_reference(source_paths, path):
+    """Every row sorted with the collector's key (stable, first file wins duplicates), written once."""
+    rows = []
+    for source in source_paths:
+        with open(source, newline="", encoding="utf-8") as f:
+            rows.extend(csv.DictReader(f))
+    rows.sort(key=lambda row: sort_key(row['published_at'], row['date']), reverse=True)
+    seen = set()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        for row in rows:
+            if row['url'] not in seen:
+                seen.add(row['url'])
+                writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming CSV synchronization")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows in the full synthetic CSV")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Keep the per-file log lines out of the timings
+    sync_csv_files.logger.setLevel("WARNING")
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        source_dir = temp_dir / "source"
+        source_dir.mkdir()
+        source_paths = build_files(source_dir, args.rows, rng)
+        print(f"Corpus: {args.rows} rows, root file holds {args.rows - args.rows * 2 // 5} of them")
+
+        legacy_time, legacy_urls = measure("legacy", legacy_synchronize, source_paths, temp_dir / "legacy")
+        streaming_time, streaming_urls = measure("streaming", streaming_synchronize, source_paths,
+                                                 temp_dir / "streaming")
+        reference_path = temp_dir / "reference.csv"
+        full_sort_reference(source_paths, reference_path)
+        identical = reference_path.read_bytes() == (temp_dir / "streaming" / "ai_news.csv").read_bytes()
+        copies_match = all((temp_dir / "streaming" / path.name).read_bytes() == reference_path.read_bytes()
+                           for path in source_paths)
+        same_urls = legacy_urls == streaming_urls
+        print(f"Speedup: {legacy_time / streaming_time:.2f}x, matches full sort: {identical}, "
+              f"all copies identical: {copies_match}, same URLs as legacy: {same_urls}")
+        return 0 if identical and copies_match and same_urls else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
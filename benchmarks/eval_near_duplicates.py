@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Precision and recall of near-duplicate detection against a hand-labeled sample.
+
+near_duplicate_labels.csv lists article pairs from the archive, each judged by
+hand as the same story (1) or not (0). For each threshold this runs the full
+MinHash/LSH clustering over the CSV, treats two articles in the same cluster as
+predicted duplicates, and scores the prediction on the labeled pairs. It also
+reports how many archive articles each threshold would collapse.
+
+Usage:
+    python benchmarks/eval_near_duplicates.py [--csv PATH] [--labels PATH] [--thresholds 0.3,0.4,0.5]
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from near_duplicates import DEFAULT_THRESHOLD, find_duplicate_clusters  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score near-duplicate detection on hand-labeled pairs")
+    parser.add_argument("--csv", default=str(BASE_DIR / "docs" / "data" / "ai_news.csv"), help="Article CSV")
+    parser.add_argument("--labels", default=str(Path(__file__).resolve().parent / "near_duplicate_labels.csv"),
+                        help="Hand-labeled pairs (url_a, url_b, duplicate, note)")
+    parser.add_argument("--thresholds", default="0.3,0.35,0.4,0.45,0.5,0.6", help="Comma-separated thresholds")
+    args = parser.parse_args()
+
+    with open(args.csv, "r", newline="", encoding="utf-8") as f:
+        articles = list(csv.DictReader(f))
+    positions = {article["url"]: position for position, article in enumerate(articles)}
+    with open(args.labels, "r", newline="", encoding="utf-8") as f:
+        labels = [row for row in csv.DictReader(f) if row["url_a"] in positions and row["url_b"] in positions]
+    positives = sum(row["duplicate"] == "1" for row in labels)
+    print(f"Corpus: {len(articles)} articles; {len(labels)} labeled pairs ({positives} duplicates)")
+    print(f"{'threshold':>9} {'precision':>9} {'recall':>7} {'tp':>4} {'fp':>4} {'fn':>4} {'collapsed':>9} {'time':>7}")
+
+    for threshold in [float(value) for value in args.thresholds.split(",")]:
+        started = time.perf_counter()
+        clusters, _ = find_duplicate_clusters(articles, threshold)
+        elapsed = time.perf_counter() - started
+        cluster_of = {position: number for number, members in enumerate(clusters) for position in members}
+
+        true_positives = false_positives = false_negatives = 0
+        missed = []
+        for row in labels:
+            first, second = positions[row["url_a"]], positions[row["url_b"]]
+            predicted = first in cluster_of and cluster_of.get(first) == cluster_of.get(second)
+            actual = row["duplicate"] == "1"
+            true_positives += predicted and actual
+            false_positives += predicted and not actual
+            false_negatives += actual and not predicted
+            if actual and not predicted:
+                missed.append(row["note"])
+
+        precision = true_positives / (true_positives + false_positives) if true_positives + false_positives else 1.0
+        recall = true_positives / positives if positives else 1.0
+        collapsed = sum(len(members) - 1 for members in clusters)
+        marker = " (default)" if threshold == DEFAULT_THRESHOLD else ""
+        print(f"{threshold:>9.2f} {precision:>9.2f} {recall:>7.2f} {true_positives:>4} {false_positives:>4} "
+              f"{false_negatives:>4} {collapsed:>9} {elapsed:>6.2f}s{marker}")
+        if threshold == DEFAULT_THRESHOLD and missed:
+            reasons = {note: missed.count(note) for note in missed}
+            print("          missed: " + "; ".join(f"{count} x {note}" for note, count in reasons.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
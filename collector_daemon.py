@@ -0,0 +1,213 @@
+"""
+Long-running daemon mode for the AI News Collector (ai_news_collector.py --daemon).
+
+The process stays up and runs a collection cycle every interval. The imports,
+the article store, the article history, the near-duplicate index and the pooled
+HTTP session stay open between cycles, so more frequent polling does not pay
+for a cold start each time. The adaptive feed schedule
+still decides which feeds each cycle actually polls.
+
+A small HTTP server on localhost reports on the daemon:
+
+    /healthz        JSON status; 200 while healthy, 503 after a failed cycle or
+                    when no cycle has succeeded for DAEMON_STALE_CYCLES intervals
+    /metrics        Prometheus text: the last cycle's run metrics plus daemon gauges
+    /metrics.json   The same as JSON
+
+SIGTERM and SIGINT stop the daemon after the running cycle.
+"""
+
+import datetime
+import json
+import logging
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("AI_News_Collector")
+
+# The interval and port defaults are DAEMON_INTERVAL_MINUTES and HEALTH_PORT in
+# ai_news_collector.py, so its command line does not import this module
+HEALTH_HOST = "127.0.0.1"  # Local only; put a proxy in front to expose it
+DAEMON_STALE_CYCLES = 2  # Unhealthy after this many intervals without a successful cycle
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+class DaemonStatus:
+    """Thread-safe record of the daemon's cycles, read by the health server."""
+
+    def __init__(self, interval_seconds):
+        self.interval_seconds = interval_seconds
+        self.started_at = time.time()
+        self.cycles = 0
+        self.failures = 0
+        self.running = False
+        self.last_success_at = None
+        self.last_error = None
+        self.next_cycle_at = None
+        self.last_metrics = None
+        self._lock = threading.Lock()
+
+    def cycle_started(self):
+        with self._lock:
+            self.running = True
+
+    def cycle_finished(self, metrics=None, error=None, next_cycle_at=None):
+        with self._lock:
+            self.running = False
+            self.cycles += 1
+            self.next_cycle_at = next_cycle_at
+            if error is None:
+                self.last_success_at = time.time()
+                self.last_error = None
+                self.last_metrics = metrics
+            else:
+                self.failures += 1
+                self.last_error = error
+
+    def health(self):
+        """Return (healthy, status dict)."""
+        now = time.time()
+        with self._lock:
+            if self.last_error is not None:
+                state = "failing"
+            elif self.last_success_at is None:
+                # The first cycle is still running
+                state = "starting" if now - self.started_at < self.interval_seconds * DAEMON_STALE_CYCLES else "stale"
+            elif now - self.last_success_at > self.interval_seconds * DAEMON_STALE_CYCLES:
+                state = "stale"
+            else:
+                state = "ok"
+            status = {
+                "status": state,
+                "running": self.running,
+                "cycles": self.cycles,
+                "failures": self.failures,
+                "uptime_seconds": round(now - self.started_at, 1),
+                "interval_seconds": self.interval_seconds,
+                "last_success_at": _timestamp(self.last_success_at),
+                "next_cycle_at": _timestamp(self.next_cycle_at),
+                "last_error": self.last_error,
+            }
+        return state in ("ok", "starting"), status
+
+    def to_prometheus(self):
+        healthy, status = self.health()
+        with self._lock:
+            metrics = self.last_metrics
+            last_success = self.last_success_at or 0
+        lines = [
+            "# HELP ai_news_daemon_up Whether the daemon is healthy (see /healthz).",
+            "# TYPE ai_news_daemon_up gauge",
+            f"ai_news_daemon_up {int(healthy)}",
+            "# HELP ai_news_daemon_cycles_total Collection cycles run since the daemon started.",
+            "# TYPE ai_news_daemon_cycles_total counter",
+            f"ai_news_daemon_cycles_total {status['cycles']}",
+            "# HELP ai_news_daemon_failures_total Collection cycles that raised an error.",
+            "# TYPE ai_news_daemon_failures_total counter",
+            f"ai_news_daemon_failures_total {status['failures']}",
+            "# HELP ai_news_daemon_last_success_timestamp_seconds When the last cycle succeeded.",
+            "# TYPE ai_news_daemon_last_success_timestamp_seconds gauge",
+            f"ai_news_daemon_last_success_timestamp_seconds {round(last_success, 3)}",
+            "# HELP ai_news_daemon_uptime_seconds Seconds since the daemon started.",
+            "# TYPE ai_news_daemon_uptime_seconds gauge",
+            f"ai_news_daemon_uptime_seconds {status['uptime_seconds']}",
+        ]
+        text = "\n".join(lines) + "\n"
+        return text + metrics.to_prometheus() if metrics is not None else text
+
+    def to_dict(self):
+        _, status = self.health()
+        with self._lock:
+            metrics = self.last_metrics
+        status["last_run"] = metrics.to_dict() if metrics is not None else None
+        return status
+
+
+class HealthRequestHandler(BaseHTTPRequestHandler):
+    """Serves /healthz, /metrics and /metrics.json from the server's DaemonStatus."""
+
+    def do_GET(self):
+        status = self.server.status
+        path = self.path.split("?", 1)[0]
+        if path == "/healthz":
+            healthy, body = status.health()
+            self._send(200 if healthy else 503, "application/json; charset=utf-8", json.dumps(body, indent=2) + "\n")
+        elif path == "/metrics":
+            self._send(200, "text/plain; version=0.0.4; charset=utf-8", status.to_prometheus())
+        elif path == "/metrics.json":
+            self._send(200, "application/json; charset=utf-8", json.dumps(status.to_dict(), indent=2) + "\n")
+        else:
+            self._send(404, "text/plain; charset=utf-8", "Not found\n")
+
+    def _send(self, code, content_type, text):
+        data = text.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the collector log
+        logger.debug(f"Health server: {format % args}")
+
+
+def start_health_server(status, host, port):
+    """Serve the daemon status on a background thread and return the server."""
+    server = ThreadingHTTPServer((host, port), HealthRequestHandler)
+    server.daemon_threads = True
+    server.status = status
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    logger.info(f"Health endpoint listening on http://{host}:{server.server_address[1]}/healthz")
+    return server
+
+
+def run_daemon(run_cycle, interval_seconds, health_port, health_host=HEALTH_HOST, stop_event=None, max_cycles=None):
+    """Call run_cycle() every interval_seconds until stopped, serving health and metrics meanwhile.
+
+    run_cycle returns the cycle's RunMetrics. A cycle that raises is logged and
+    reported as failing, and the daemon carries on with the next one. Intervals are
+    measured from the start of each cycle. health_port 0 disables the server.
+    """
+    stop_event = stop_event or threading.Event()
+    status = DaemonStatus(interval_seconds)
+    server = start_health_server(status, health_host, health_port) if health_port else None
+
+    def request_stop(signum, frame):
+        logger.info(f"Received signal {signum}, stopping after the current cycle")
+        stop_event.set()
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+    logger.info(f"Daemon started, collecting every {interval_seconds / 60:g} minutes")
+    try:
+        while not stop_event.is_set():
+            started = time.time()
+            status.cycle_started()
+            metrics, error = None, None
+            try:
+                metrics = run_cycle()
+            except Exception as e:
+                error = f"{type(e).__name__}: {str(e)}"
+                logger.error(f"Collection cycle failed: {error}")
+            next_cycle_at = started + interval_seconds
+            status.cycle_finished(metrics, error, next_cycle_at)
+            if max_cycles is not None and status.cycles >= max_cycles:
+                break
+            logger.info(f"Next collection cycle at {_timestamp(next_cycle_at)}")
+            stop_event.wait(max(0.0, next_cycle_at - time.time()))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        logger.info(f"Daemon stopped after {status.cycles} cycles")
+    return status
@@ -13,5 +13,5 @@ if ($LASTEXITCODE -eq 0) {
     Write-Host "Files have been copied from web_app to docs directory." -ForegroundColor Green
     Write-Host "You can now commit and push changes to GitHub." -ForegroundColor Green
 } else {
-    Write-Host "Deployment failed. Check the deploy_to_github.log file for details." -ForegroundColor Red
+    Write-Host "Deployment failed. Check the logs/deploy_to_github.log file for details." -ForegroundColor Red
 }
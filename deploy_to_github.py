@@ -4,39 +4,29 @@ Deploy to GitHub Pages Script
 This script copies the contents of the web_app directory to the docs directory
 for deployment to GitHub Pages. It handles special files and ensures proper
 configuration for GitHub Pages to use index.html instead of README.md.
+
+Files are compared by content hash and only changed files are copied, so an
+unchanged web app leaves docs untouched. deploy_manifest.json remembers which
+docs files the last deploy wrote, so files removed from web_app are removed
+from docs as well. Use --dry-run to see what would change.
 """
 
+import argparse
+import hashlib
+import json
 import os
 import shutil
 import logging
 from pathlib import Path
 import sys
-import time
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("deploy_to_github.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from logging_setup import setup_logging
 
 logger = logging.getLogger("deploy_to_github")
 
-def create_nojekyll_file(docs_dir):
-    """Create a .nojekyll file to prevent GitHub Pages from using Jekyll processing."""
-    nojekyll_path = docs_dir / ".nojekyll"
-    with open(nojekyll_path, "w") as f:
-        f.write("")
-    logger.info(f"Created .nojekyll file at {nojekyll_path}")
-
-def create_config_yml(docs_dir):
-    """Create a _config.yml file to configure GitHub Pages."""
-    config_yml_path = docs_dir / "_config.yml"
-    
-    config_content = """# GitHub Pages configuration
+MANIFEST_NAME = "deploy_manifest.json"  # Kept next to this script, not published with docs
+SKIPPED_ITEMS = [".git", "README.md", "README.markdown", "readme.md"]
+
+CONFIG_YML_CONTENT = """# GitHub Pages configuration
 name: AI News Daily
 title: AI News Daily | Latest AI News and Research
 description: Daily updates on AI and Machine Learning news, research, and insights.
@@ -61,98 +51,181 @@ readme_index:
   enabled: false
   remove_originals: false
 """
-    
-    with open(config_yml_path, "w") as f:
-        f.write(config_content)
-    
-    logger.info(f"Created/updated _config.yml at {config_yml_path}")
-
-def safe_remove_dir(path):
-    """Safely remove a directory with retries for Windows permission issues."""
-    max_retries = 3
-    retry_delay = 1
-    
-    for attempt in range(max_retries):
-        try:
-            if os.path.exists(path):
-                shutil.rmtree(path)
-            return True
-        except PermissionError as e:
-            logger.warning(f"Permission error removing {path}: {e}. Retrying in {retry_delay} seconds...")
-            time.sleep(retry_delay)
-            retry_delay *= 2
-    
-    logger.error(f"Failed to remove directory {path} after {max_retries} attempts")
-    return False
-
-def copy_web_app_to_docs():
-    """Copy all files from web_app directory to docs directory."""
-    # Get the base directory of the script
-    base_dir = Path(__file__).resolve().parent
+
+README_TXT_CONTENT = ("This directory contains files for GitHub Pages deployment. "
+                      "Please see the index.html file for the actual content.")
+
+# GitHub Pages configuration files written into docs on every deploy
+GENERATED_FILES = {
+    # Prevents GitHub Pages from using Jekyll processing
+    ".nojekyll": "",
+    "_config.yml": CONFIG_YML_CONTENT,
+    # A minimal README.txt avoids conflicts with GitHub Pages
+    "README.txt": README_TXT_CONTENT,
+}
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path):
+    """Load the docs files written by the previous deploy, or an empty map."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest_path, files):
+    temp_path = manifest_path.with_name(manifest_path.name + ".temp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"files": dict(sorted(files.items()))}, f, indent=2)
+        f.write("\n")
+    os.replace(temp_path, manifest_path)
+
+def plan_deploy(base_dir):
+    """Map each docs file (relative POSIX path) to its source path or generated content.
+
+    Later sources win, as when the files were copied one after another: web_app/data
+    overrides the root ai_news.csv. Also returns the docs directories that mirror a
+    web_app directory, where files without a source are removed.
+    """
     web_app_dir = base_dir / "web_app"
-    docs_dir = base_dir / "docs"
-    
-    # Create the docs directory if it doesn't exist
-    os.makedirs(docs_dir, exist_ok=True)
-    
-    # Create the data directory in docs
-    data_dir = docs_dir / "data"
-    os.makedirs(data_dir, exist_ok=True)
-    
-    # Copy the main CSV file if it exists in the project root
+    files = {}
+    mirrored_dirs = []
+
+    # The main CSV file in the project root, if it exists
     main_csv = base_dir / "ai_news.csv"
     if os.path.exists(main_csv):
-        shutil.copy2(main_csv, data_dir / "ai_news.csv")
-        logger.info(f"Copied {main_csv} to {data_dir / 'ai_news.csv'}")
-    
-    # Copy all files from web_app to docs, but individually
+        files["data/ai_news.csv"] = main_csv
+
     if os.path.exists(web_app_dir) and os.path.isdir(web_app_dir):
-        for item in os.listdir(web_app_dir):
-            # Skip .git directory and data directory (data is handled separately)
-            # Also skip any README.md files that might conflict with GitHub Pages
-            if item in [".git", "README.md", "README.markdown", "readme.md"]:
-                logger.info(f"Skipping {item} to avoid conflicts with GitHub Pages")
+        for item in sorted(os.listdir(web_app_dir)):
+            # Skip .git and any README.md files that might conflict with GitHub Pages
+            if item in SKIPPED_ITEMS:
+                logger.debug(f"Skipping {item} to avoid conflicts with GitHub Pages")
                 continue
-                
             source = web_app_dir / item
-            destination = docs_dir / item
-            
-            try:
-                if os.path.isdir(source):
-                    # Handle directory copy with special handling for data directory
-                    if item == "data":
-                        # Copy files from web_app/data individually instead of the whole directory
-                        for data_file in os.listdir(source):
-                            data_source = source / data_file
-                            data_dest = data_dir / data_file
-                            if os.path.isfile(data_source):
-                                shutil.copy2(data_source, data_dest)
-                                logger.info(f"Copied data file {data_source} to {data_dest}")
-                    else:
-                        # For other directories, use the safe removal function
-                        if os.path.exists(destination):
-                            safe_remove_dir(destination)
-                        shutil.copytree(source, destination)
-                        logger.info(f"Copied directory {source} to {destination}")
+            if os.path.isdir(source):
+                if item == "data":
+                    # Only the files directly in web_app/data; docs/data also holds the collector's exports
+                    for data_file in sorted(os.listdir(source)):
+                        if os.path.isfile(source / data_file):
+                            files[f"data/{data_file}"] = source / data_file
                 else:
-                    # Direct file copy
-                    shutil.copy2(source, destination)
-                    logger.info(f"Copied file {source} to {destination}")
-            except Exception as e:
-                logger.error(f"Error copying {source} to {destination}: {e}")
+                    mirrored_dirs.append(item)
+                    for path in sorted(source.rglob("*")):
+                        if path.is_file():
+                            files[path.relative_to(web_app_dir).as_posix()] = path
+            else:
+                files[item] = source
     else:
         logger.warning(f"Web app directory {web_app_dir} does not exist or is not a directory")
-    
-    # Create necessary GitHub Pages configuration files
-    create_nojekyll_file(docs_dir)
-    create_config_yml(docs_dir)
-    
-    # Create a minimal README.txt file to avoid conflicts with GitHub Pages
-    with open(docs_dir / "README.txt", "w") as f:
-        f.write("This directory contains files for GitHub Pages deployment. Please see the index.html file for the actual content.")
-    
-    logger.info("Deployment to GitHub Pages completed successfully")
+
+    for name, content in GENERATED_FILES.items():
+        files[name] = content.encode("utf-8")
+    return files, mirrored_dirs
+
+def copy_web_app_to_docs(dry_run=False):
+    """Sync the web_app directory into docs, touching only files whose content changed.
+
+    Returns a summary with the copied, removed and unchanged files and the bytes written.
+    """
+    # Get the base directory of the script
+    base_dir = Path(__file__).resolve().parent
+    docs_dir = base_dir / "docs"
+    manifest_path = base_dir / MANIFEST_NAME
+
+    files, mirrored_dirs = plan_deploy(base_dir)
+    previous = load_manifest(manifest_path)
+    manifest = {}
+    summary = {"copied": [], "removed": [], "unchanged": 0, "bytes": 0}
+
+    for relative_path, source in files.items():
+        destination = docs_dir / relative_path
+        if isinstance(source, bytes):
+            digest = hashlib.sha256(source).hexdigest()
+            size = len(source)
+        else:
+            digest = file_digest(source)
+            size = os.path.getsize(source)
+        manifest[relative_path] = digest
+        if (os.path.isfile(destination) and os.path.getsize(destination) == size
+                and file_digest(destination) == digest):
+            summary["unchanged"] += 1
+            continue
+        summary["copied"].append(relative_path)
+        summary["bytes"] += size
+        if dry_run:
+            continue
+        try:
+            os.makedirs(destination.parent, exist_ok=True)
+            if isinstance(source, bytes):
+                destination.write_bytes(source)
+            else:
+                shutil.copy2(source, destination)
+            logger.debug(f"Copied {relative_path} to {destination}")
+        except Exception as e:
+            logger.error(f"Error copying {source} to {destination}: {e}")
+            manifest.pop(relative_path)
+
+    # Files the last deploy wrote that no longer have a source, plus strays in mirrored directories.
+    # Without a web_app directory nothing has a source, so nothing is removed.
+    stale = set()
+    if os.path.isdir(base_dir / "web_app"):
+        stale.update(path for path in previous if path not in files)
+    for directory in mirrored_dirs:
+        if os.path.isdir(docs_dir / directory):
+            stale.update(path.relative_to(docs_dir).as_posix() for path in (docs_dir / directory).rglob("*")
+                         if path.is_file() and path.relative_to(docs_dir).as_posix() not in files)
+    for relative_path in sorted(stale):
+        destination = docs_dir / relative_path
+        if not os.path.isfile(destination):
+            continue
+        summary["removed"].append(relative_path)
+        if dry_run:
+            continue
+        try:
+            os.remove(destination)
+            logger.debug(f"Removed {destination}, which no longer exists in web_app")
+            # Drop directories the removal left empty, as the old rmtree/copytree did
+            parent = destination.parent
+            while parent != docs_dir and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+        except OSError as e:
+            logger.error(f"Error removing {destination}: {e}")
+
+    action = "would copy" if dry_run else "copied"
+    logger.info(
+        f"Deploy {action} {len(summary['copied'])} files ({summary['bytes']} bytes), "
+        f"{'would remove' if dry_run else 'removed'} {len(summary['removed'])}, "
+        f"left {summary['unchanged']} unchanged"
+    )
+    if dry_run:
+        for relative_path in summary["copied"]:
+            logger.info(f"  would copy {relative_path}")
+        for relative_path in summary["removed"]:
+            logger.info(f"  would remove {relative_path}")
+    else:
+        if manifest != previous:
+            save_manifest(manifest_path, manifest)
+        logger.info("Deployment to GitHub Pages completed successfully")
+    return summary
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy the web app into docs for GitHub Pages")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report the files and bytes that would change"
+    )
+    args = parser.parse_args()
+    setup_logging("deploy_to_github", stream=sys.stdout)
+
     logger.info("Starting deployment to GitHub Pages")
-    copy_web_app_to_docs()
\ No newline at end of file
+    copy_web_app_to_docs(dry_run=args.dry_run)
@@ -1,4 +1,8 @@
 // AI News Daily - Main JavaScript application
+
+// Wait this long after the last keystroke before running a search
+const SEARCH_DEBOUNCE_MS = 200;
+
 document.addEventListener('DOMContentLoaded', function() {
     // Initialize the application
     initApp();
@@ -18,12 +22,15 @@ document.addEventListener('DOMContentLoaded', function() {
     const searchInput = document.getElementById('search-input');
     if (searchInput) {
         searchInput.addEventListener('input', function() {
-            filterNewsBySearch(this.value);
+            const query = this.value;
+            clearTimeout(window.searchDebounceTimer);
+            window.searchDebounceTimer = setTimeout(() => filterNewsBySearch(query), SEARCH_DEBOUNCE_MS);
         });
         
         searchInput.addEventListener('keydown', function(e) {
             if (e.key === 'Enter') {
                 e.preventDefault();
+                clearTimeout(window.searchDebounceTimer);
                 filterNewsBySearch(this.value);
             }
         });
@@ -35,6 +42,7 @@ document.addEventListener('DOMContentLoaded', function() {
         searchButton.addEventListener('click', function() {
             const searchInput = document.getElementById('search-input');
             if (searchInput) {
+                clearTimeout(window.searchDebounceTimer);
                 filterNewsBySearch(searchInput.value);
             }
         });
@@ -89,6 +97,17 @@ function initApp() {
     // Load the last update timestamp
     loadLastUpdateTime();
     
+    // The charts only need the precomputed counts, so render them without waiting for the articles
+    const chartsReady = loadAggregates()
+        .then(aggregates => {
+            initVisualization(aggregates);
+            return true;
+        })
+        .catch(error => {
+            console.warn('Aggregates unavailable, charts will be computed from the articles:', error);
+            return false;
+        });
+    
     // Load the news data
     loadNewsData()
         .then(data => {
@@ -98,11 +117,20 @@ function initApp() {
             window.currentPage = 1;
             window.itemsPerPage = 10;
             
+            // Make sure the first page is full even if the recent file is short
+            return ensureNewsLoaded(window.itemsPerPage);
+        })
+        .then(() => {
             // Display the news
-            displayNews(data);
+            displayNews(window.newsData);
             
-            // Initialize the visualization
-            initVisualization(data);
+            return chartsReady;
+        })
+        .then(chartsRendered => {
+            // Fall back to counting the loaded articles when there is no aggregates file
+            if (!chartsRendered) {
+                initVisualization(computeAggregates(window.newsData));
+            }
         })
         .catch(error => {
             console.error('Error loading news data:', error);
@@ -151,8 +179,144 @@ function getSortDate(item) {
     return parseLocalDateString(item.date);
 }
 
-// Load news data from CSV
+// Load news data: the recent partition from the archive manifest, or the full CSV as a fallback
 function loadNewsData() {
+    return loadArchiveManifest()
+        .then(manifest => {
+            window.archiveManifest = manifest;
+            // Months that also hold articles older than the recent file, newest first
+            window.pendingArchiveMonths = manifest.months.filter(month =>
+                !month.oldest || month.oldest < manifest.recent.since
+            );
+            return loadPartition(manifest.recent);
+        })
+        .catch(error => {
+            console.warn('Archive manifest unavailable, loading the full CSV:', error);
+            window.archiveManifest = null;
+            window.pendingArchiveMonths = [];
+            return loadFullNewsData();
+        });
+}
+
+function loadArchiveManifest() {
+    return fetch(getCacheBustedUrl('data/manifest.json'), { cache: 'no-store' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Could not load archive manifest');
+            }
+            return response.json();
+        });
+}
+
+// Precomputed article counts by category, day, source and source type
+function loadAggregates() {
+    return fetch(getCacheBustedUrl('data/aggregates.json'), { cache: 'no-store' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Could not load aggregates');
+            }
+            return response.json();
+        });
+}
+
+// Build the same counts as aggregates.json from loaded articles
+function computeAggregates(data) {
+    const aggregates = { total: data.length, by_category: {}, by_day: {} };
+    data.forEach(item => {
+        const category = item.category || 'uncategorized';
+        aggregates.by_category[category] = (aggregates.by_category[category] || 0) + 1;
+        aggregates.by_day[item.dateKey] = (aggregates.by_day[item.dateKey] || 0) + 1;
+    });
+    return aggregates;
+}
+
+// Partition files are versioned by content hash, so the browser may cache them
+function getVersionedUrl(file, hash) {
+    return hash ? `data/${file}?v=${hash}` : getCacheBustedUrl(`data/${file}`);
+}
+
+function loadCsvFile(file, hash) {
+    return d3.csv(getVersionedUrl(file, hash));
+}
+
+// Load a manifest partition as processed news items: the columnar JSON when there is one, else the CSV
+function loadPartition(partition) {
+    if (!partition.json) {
+        return loadCsvFile(partition.file, partition.hash).then(processNewsData);
+    }
+    return loadColumnarFile(partition.json, partition.json_hash)
+        .then(decodeColumnarData)
+        .catch(error => {
+            console.warn(`Columnar data unavailable for ${partition.file}, loading the CSV:`, error);
+            return loadCsvFile(partition.file, partition.hash).then(processNewsData);
+        });
+}
+
+function fetchJson(url) {
+    return fetch(url).then(response => {
+        if (!response.ok) {
+            throw new Error(`Could not load ${url}`);
+        }
+        return response.json();
+    });
+}
+
+// Prefer the precompressed .gz and inflate it in the browser; fall back to the plain JSON
+function loadColumnarFile(file, hash) {
+    const url = getVersionedUrl(file, hash);
+    if (typeof DecompressionStream === 'undefined') {
+        return fetchJson(url);
+    }
+    return fetch(getVersionedUrl(`${file}.gz`, hash))
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`Could not load ${file}.gz`);
+            }
+            return new Response(response.body.pipeThrough(new DecompressionStream('gzip'))).json();
+        })
+        .catch(() => fetchJson(url));
+}
+
+// Build news items from a columnar payload (see web_exports.py). Dates are formatted
+// once per distinct day, and publish times are already epoch seconds.
+function decodeColumnarData(payload) {
+    const { tables, columns, count } = payload;
+    const days = tables.date.map(dateKey => ({
+        dateKey,
+        formattedDate: formatDisplayDate(dateKey),
+        time: parseLocalDateString(dateKey).getTime()
+    }));
+    const categories = tables.category.map(category => category ? category.trim() : 'uncategorized');
+    const textFields = Object.keys(columns).filter(name => !(name in tables) && name !== 'published');
+    const internedFields = Object.keys(tables).filter(name => name !== 'date');
+    const published = columns.published;
+
+    const items = new Array(count);
+    for (let i = 0; i < count; i++) {
+        const item = {};
+        for (const name of textFields) {
+            item[name] = columns[name][i];
+        }
+        for (const name of internedFields) {
+            item[name] = tables[name][columns[name][i]];
+        }
+        const day = days[columns.date[i]];
+        // Lowercased once here for the fallback search without an index
+        item.searchText = [item.title, item.description, item.source, item.category]
+            .map(value => (value || '').toLowerCase())
+            .join('\n');
+        item.category = categories[columns.category[i]];
+        item.formattedDate = day.formattedDate;
+        item.dateKey = day.dateKey;
+        item.date = new Date(published[i] !== null ? published[i] * 1000 : day.time);
+        items[i] = item;
+    }
+    // The payload is already newest first, so this sort is a single pass
+    return items.sort((a, b) => b.date - a.date);
+}
+
+// Load the complete news CSV
+function loadFullNewsData() {
     return new Promise((resolve, reject) => {
         d3.csv(getCacheBustedUrl('data/ai_news.csv'))
             .then(data => {
@@ -167,6 +331,63 @@ function loadNewsData() {
     });
 }
 
+function hasPendingArchiveMonths() {
+    return Boolean(window.pendingArchiveMonths && window.pendingArchiveMonths.length);
+}
+
+// Fetch the next older month partition and merge it into window.newsData
+function loadNextArchiveMonth() {
+    if (window.archiveMonthLoading) {
+        return window.archiveMonthLoading;
+    }
+    if (!hasPendingArchiveMonths()) {
+        return Promise.resolve(false);
+    }
+    return loadArchiveMonth(window.pendingArchiveMonths[0]);
+}
+
+// Fetch one pending month partition and merge it into window.newsData
+function loadArchiveMonth(month) {
+    if (window.archiveMonthLoading) {
+        return window.archiveMonthLoading;
+    }
+
+    const since = window.archiveManifest.recent.since;
+    window.archiveMonthLoading = loadPartition(month)
+        .then(items => {
+            window.pendingArchiveMonths = window.pendingArchiveMonths.filter(pending => pending !== month);
+            // Articles inside the recent window are already loaded from the recent file
+            const olderItems = items.filter(item => !(item.dateKey >= since));
+            window.newsData = window.newsData.concat(olderItems).sort((a, b) => b.date - a.date);
+            return true;
+        })
+        .finally(() => {
+            window.archiveMonthLoading = null;
+        });
+    return window.archiveMonthLoading;
+}
+
+// Keep loading older months until at least `count` articles are available
+function ensureNewsLoaded(count) {
+    if (window.newsData.length >= count || !hasPendingArchiveMonths()) {
+        return Promise.resolve();
+    }
+    return loadNextArchiveMonth().then(() => ensureNewsLoaded(count));
+}
+
+function loadAllArchiveMonths() {
+    return ensureNewsLoaded(Infinity);
+}
+
+// Load the pending partitions for the given months (e.g. '2025-06'), one at a time
+function loadArchiveMonths(monthNames) {
+    const next = (window.pendingArchiveMonths || []).find(month => monthNames.has(month.month));
+    if (!next) {
+        return Promise.resolve();
+    }
+    return loadArchiveMonth(next).then(() => loadArchiveMonths(monthNames));
+}
+
 // Process and format the news data
 function processNewsData(data) {
     return data.map(item => {
@@ -177,7 +398,11 @@ function processNewsData(data) {
             formattedDate: formatDisplayDate(item.date),
             date: sortDate,
             dateKey: item.date,
-            category: item.category ? item.category.trim() : 'uncategorized'
+            category: item.category ? item.category.trim() : 'uncategorized',
+            // Lowercased once here for the fallback search without an index
+            searchText: [item.title, item.description, item.source, item.category]
+                .map(value => (value || '').toLowerCase())
+                .join('\n')
         };
     }).sort((a, b) => b.date - a.date); // Sort by date (newest first)
 }
@@ -210,9 +435,10 @@ function displayNews(newsItems, resetPage = true) {
     const endIndex = window.currentPage * window.itemsPerPage;
     const paginatedItems = newsItems.slice(startIndex, endIndex);
     
-    // Show/hide load more button
+    // Show/hide load more button; unfiltered lists can still grow from older archive months
     if (loadMoreBtn) {
-        if (endIndex >= newsItems.length) {
+        const canLoadOlder = newsItems === window.newsData && hasPendingArchiveMonths();
+        if (endIndex >= newsItems.length && !canLoadOlder) {
             loadMoreBtn.style.display = 'none';
         } else {
             loadMoreBtn.style.display = 'block';
@@ -410,30 +636,19 @@ function updateThemeIcon(theme) {
 }
 
 // Initialize data visualization
-function initVisualization(data) {
+function initVisualization(aggregates) {
     // Create category count visualization
-    createCategoryChart(data);
+    createCategoryChart(aggregates.by_category);
     
     // Create timeline visualization
-    createTimelineChart(data);
+    createTimelineChart(aggregates.by_day);
 }
 
 // Create a chart showing news by category
-function createCategoryChart(data) {
+function createCategoryChart(categoryCounts) {
     const categoryChart = document.getElementById('category-chart');
     if (!categoryChart) return;
     
-    // Count items by category
-    const categoryCounts = {};
-    data.forEach(item => {
-        const category = item.category || 'uncategorized';
-        if (categoryCounts[category]) {
-            categoryCounts[category]++;
-        } else {
-            categoryCounts[category] = 1;
-        }
-    });
-    
     // Prepare data for chart
     const categories = Object.keys(categoryCounts);
     const counts = Object.values(categoryCounts);
@@ -468,21 +683,10 @@ function createCategoryChart(data) {
 }
 
 // Create a timeline chart
-function createTimelineChart(data) {
+function createTimelineChart(dateGroups) {
     const timelineChart = document.getElementById('timeline-chart');
     if (!timelineChart) return;
     
-    // Group data by date
-    const dateGroups = {};
-    data.forEach(item => {
-        const dateStr = item.dateKey;
-        if (dateGroups[dateStr]) {
-            dateGroups[dateStr]++;
-        } else {
-            dateGroups[dateStr] = 1;
-        }
-    });
-    
     // Sort dates
     const sortedDates = Object.keys(dateGroups).sort();
     const counts = sortedDates.map(date => dateGroups[date]);
@@ -532,21 +736,110 @@ function createTimelineChart(data) {
 function filterNewsBySearch(query) {
     if (!window.newsData) return;
     
-    query = query.toLowerCase();
+    query = query.trim().toLowerCase();
+    
+    // Results of an older, slower query must not replace newer ones
+    const searchId = (window.searchGeneration || 0) + 1;
+    window.searchGeneration = searchId;
     
     if (!query) {
         displayNews(window.newsData);
         return;
     }
     
-    const filtered = window.newsData.filter(item => 
-        item.title.toLowerCase().includes(query) || 
-        item.description.toLowerCase().includes(query) ||
-        item.source.toLowerCase().includes(query) ||
-        item.category.toLowerCase().includes(query)
-    );
+    loadSearchIndex()
+        .then(index => searchWithIndex(index, query), error => {
+            console.warn('Search index unavailable, scanning articles instead:', error);
+            return searchArticles(query);
+        })
+        .then(filtered => {
+            if (searchId === window.searchGeneration) {
+                displayNews(filtered);
+            }
+        });
+}
+
+// Load the prebuilt inverted index (token -> article ids) once, on the first search
+function loadSearchIndex() {
+    if (!window.searchIndexLoading) {
+        window.searchIndexLoading = fetch(getCacheBustedUrl('data/search_index.json'), { cache: 'no-store' })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Could not load search index');
+                }
+                return response.json();
+            })
+            .then(index => {
+                index.vocabulary = Object.keys(index.tokens);
+                index.termTokens = new Map();
+                return index;
+            });
+    }
+    return window.searchIndexLoading;
+}
+
+// Index tokens containing term, so partial words still match (e.g. 'gpt' finds 'chatgpt')
+function findTokensContaining(index, term) {
+    if (!index.termTokens.has(term)) {
+        // While typing, the tokens for the previous keystroke already contain every candidate
+        const candidates = index.termTokens.get(term.slice(0, -1)) || index.vocabulary;
+        index.termTokens.set(term, candidates.filter(token => token.includes(term)));
+    }
+    return index.termTokens.get(term);
+}
+
+// Ids of articles matching every query term, or null if the query has no terms
+function findIndexedArticleIds(index, query) {
+    const terms = query.match(/[a-z0-9]+/g);
+    if (!terms) {
+        return null;
+    }
     
-    displayNews(filtered);
+    let matches = null;
+    for (const term of terms) {
+        const termMatches = new Set();
+        findTokensContaining(index, term).forEach(token => {
+            index.tokens[token].forEach(id => termMatches.add(id));
+        });
+        matches = matches === null ? termMatches : new Set([...matches].filter(id => termMatches.has(id)));
+        if (!matches.size) {
+            break;
+        }
+    }
+    return matches;
+}
+
+// Answer a query from the index, fetching only the months that hold matching articles
+function searchWithIndex(index, query) {
+    const ids = findIndexedArticleIds(index, query);
+    if (ids === null) {
+        return searchArticles(query);
+    }
+    
+    const loadedUrls = new Set(window.newsData.map(item => item.url));
+    const matchedUrls = new Set();
+    const missingMonths = new Set();
+    ids.forEach(id => {
+        const [url, month] = index.docs[id];
+        matchedUrls.add(url);
+        if (!loadedUrls.has(url)) {
+            missingMonths.add(month);
+        }
+    });
+    
+    return loadArchiveMonths(missingMonths)
+        .then(() => window.newsData.filter(item => matchedUrls.has(item.url)));
+}
+
+// Substring scan over every article, used when the index cannot answer the query
+function searchArticles(query) {
+    const scan = () => window.newsData.filter(item => item.searchText.includes(query));
+    
+    // Searching covers the whole archive, so fetch any months not loaded yet
+    if (hasPendingArchiveMonths()) {
+        return loadAllArchiveMonths().then(scan);
+    }
+    return Promise.resolve(scan());
 }
 
 // Filter news by category
@@ -558,6 +851,11 @@ function filterNewsByCategory(category) {
         return;
     }
     
+    if (hasPendingArchiveMonths()) {
+        loadAllArchiveMonths().then(() => filterNewsByCategory(category));
+        return;
+    }
+    
     const filtered = window.newsData.filter(item => 
         item.category === category
     );
@@ -589,7 +887,13 @@ document.addEventListener('DOMContentLoaded', function() {
         loadMoreBtn.addEventListener('click', function() {
             if (window.currentNewsItems && window.currentPage) {
                 window.currentPage++;
-                displayNews(window.currentNewsItems, false);
+                if (window.currentNewsItems === window.newsData) {
+                    // Scrolling past the loaded articles pulls in older archive months
+                    ensureNewsLoaded(window.currentPage * window.itemsPerPage)
+                        .then(() => displayNews(window.newsData, false));
+                } else {
+                    displayNews(window.currentNewsItems, false);
+                }
             }
         });
     }
@@ -0,0 +1,122 @@
+"""
+Persistent validator cache for RSS/Atom feeds.
+
+Stores the ETag / Last-Modified validators and a hash of the last body seen for
+each feed URL, so the collector can send conditional requests and skip parsing
+feeds that have not changed since the previous run. The validators of a new
+body are held as pending until the collector has parsed it, so a feed that
+fails to parse is downloaded and parsed again on the next run.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger("AI_News_Collector")
+
+
+def hash_body(body):
+    """Return a stable hash for a raw feed body."""
+    return hashlib.sha256(body).hexdigest()
+
+
+class FeedCache:
+    """Thread-safe, size-bounded map of feed URL to its HTTP validators and body hash."""
+
+    def __init__(self, path, max_entries=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = {}
+        self.pending = {}
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the cache from disk, starting empty if it is missing or unreadable."""
+        with self._lock:
+            self.entries = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self.entries = json.load(f).get("feeds", {})
+            except Exception as e:
+                logger.warning(f"Could not read feed cache {self.path}, starting empty: {str(e)}")
+            self.loaded = True
+        return self
+
+    def save(self):
+        """Write the cache to disk atomically."""
+        with self._lock:
+            data = {"feeds": dict(sorted(self.entries.items()))}
+        temp_path = f"{self.path}.temp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving feed cache {self.path}: {str(e)}")
+
+    def conditional_headers(self, url):
+        """Return the If-None-Match / If-Modified-Since headers for a feed, if known."""
+        with self._lock:
+            entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_unchanged(self, url, body_hash):
+        """Check whether a freshly downloaded body matches the last one seen for this feed."""
+        with self._lock:
+            return self.entries.get(url, {}).get("body_hash") == body_hash
+
+    def update(self, url, etag=None, last_modified=None, body_hash=None):
+        """Record the validators and body hash from the latest response for a feed."""
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            if etag:
+                entry["etag"] = etag
+            if last_modified:
+                entry["last_modified"] = last_modified
+            if body_hash:
+                entry["body_hash"] = body_hash
+            entry["checked_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    def hold(self, url, etag=None, last_modified=None, body_hash=None):
+        """Keep the validators of a downloaded body until confirm or discard is called for the feed."""
+        with self._lock:
+            self.pending[url] = {"etag": etag, "last_modified": last_modified, "body_hash": body_hash}
+
+    def confirm(self, url):
+        """Record the held validators of a feed once its body has been processed."""
+        with self._lock:
+            held = self.pending.pop(url, None)
+        if held is not None:
+            self.update(url, **held)
+
+    def discard(self, url):
+        """Forget the held validators of a feed, so the next run downloads and parses it again."""
+        with self._lock:
+            self.pending.pop(url, None)
+
+    def prune(self, active_urls):
+        """Drop feeds no longer in active_urls, then evict the least recently checked beyond max_entries."""
+        active_urls = set(active_urls)
+        with self._lock:
+            stale = [url for url in self.entries if url not in active_urls]
+            for url in stale:
+                del self.entries[url]
+            overflow = len(self.entries) - self.max_entries
+            if overflow > 0:
+                oldest = sorted(self.entries, key=lambda url: self.entries[url].get("checked_at", ""))
+                for url in oldest[:overflow]:
+                    del self.entries[url]
+                stale.extend(oldest[:overflow])
+        if stale:
+            logger.info(f"Evicted {len(stale)} feeds from the feed cache")
+        return stale
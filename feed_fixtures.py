@@ -0,0 +1,128 @@
+"""
+Feed fixture recording and offline replay for the AI News Collector.
+
+FeedRecorder saves the raw body and validator headers of every feed that
+download_feed downloads into a fixtures directory. ReplayAdapter is a requests
+transport adapter that serves those files instead of the network, so
+collect_news and the benchmarks can run offline against a fixed set of feeds.
+
+Fixture layout:
+    <dir>/index.json           feed URL -> {"file", "status", "headers"}
+    <dir>/<host>-<hash>.xml    raw feed body
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger("AI_News_Collector")
+
+INDEX_NAME = "index.json"
+# Response headers worth replaying; the body is stored already decoded
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def fixture_file_name(url):
+    """Stable, filesystem-safe fixture name for a feed URL."""
+    host = re.sub(r"[^a-z0-9.-]", "_", (urlsplit(url).hostname or "feed").lower())
+    return f"{host}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.xml"
+
+
+def load_fixture_index(fixtures_dir):
+    """Load the feed URL -> fixture map, returning an empty map if there is none."""
+    try:
+        with open(Path(fixtures_dir) / INDEX_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_fixture(fixtures_dir, index, url, body, status=200, headers=None):
+    """Store one feed body and add it to index (saved separately with save_fixture_index)."""
+    name = fixture_file_name(url)
+    (Path(fixtures_dir) / name).write_bytes(body)
+    index[url] = {"file": name, "status": status, "headers": dict(headers or {})}
+
+
+def save_fixture_index(fixtures_dir, index):
+    path = Path(fixtures_dir) / INDEX_NAME
+    temp_path = path.with_name(path.name + ".temp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+class FeedRecorder:
+    """Thread-safe recorder of raw feed responses into a fixtures directory."""
+
+    def __init__(self, fixtures_dir):
+        self.fixtures_dir = Path(fixtures_dir)
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        # Recording again into the same directory updates it rather than starting over
+        self.index = load_fixture_index(self.fixtures_dir)
+        self._lock = threading.Lock()
+
+    def record(self, url, response):
+        """Save the body and validator headers of a successful feed response."""
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        with self._lock:
+            write_fixture(self.fixtures_dir, self.index, url, response.content, response.status_code, headers)
+
+    def save(self):
+        with self._lock:
+            save_fixture_index(self.fixtures_dir, self.index)
+        logger.info(f"Recorded {len(self.index)} feed fixtures in {self.fixtures_dir}")
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport adapter that answers from recorded fixtures instead of the network.
+
+    Conditional requests behave as they would against the real server: a matching
+    If-None-Match or If-Modified-Since gets 304 Not Modified. Unknown URLs get 404.
+    """
+
+    def __init__(self, fixtures_dir):
+        super().__init__()
+        self.fixtures_dir = Path(fixtures_dir)
+        self.index = load_fixture_index(self.fixtures_dir)
+        if not self.index:
+            raise FileNotFoundError(f"No feed fixtures found in {self.fixtures_dir}")
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        fixture = self.index.get(request.url)
+        headers = {}
+        body = b""
+        if fixture is None:
+            status = 404
+        else:
+            headers = dict(fixture["headers"])
+            etag = headers.get("ETag")
+            last_modified = headers.get("Last-Modified")
+            if ((etag and request.headers.get("If-None-Match") == etag)
+                    or (last_modified and request.headers.get("If-Modified-Since") == last_modified)):
+                status = 304
+            else:
+                status = fixture["status"]
+                body = (self.fixtures_dir / fixture["file"]).read_bytes()
+
+        response = Response()
+        response.status_code = status
+        response.reason = {200: "OK", 304: "Not Modified", 404: "Not Found"}.get(status, "")
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
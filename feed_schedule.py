@@ -0,0 +1,169 @@
+"""
+Adaptive polling schedule for RSS/Atom feeds.
+
+Keeps a small health and change-rate record per feed URL between runs: when it
+was last polled, when it last produced a new article, how often it typically
+publishes and how many runs in a row it has failed. The collector asks the
+schedule which feeds are due, so feeds that rarely publish are polled less
+often and failing or empty feeds back off exponentially instead of being
+fetched on every run.
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger("AI_News_Collector")
+
+FAILURE_BACKOFF_BASE_HOURS = 6  # Doubled for every further failure in a row
+MAX_POLL_INTERVAL_HOURS = 7 * 24  # Every feed is polled at least this often
+QUIET_POLL_FRACTION = 0.5  # Poll a quiet feed once per this fraction of its expected publishing gap
+CADENCE_SMOOTHING = 0.5  # Weight of the newest publishing gap in the cadence average
+POLL_SLACK_HOURS = 1  # Cron runs drift; treat feeds due within this margin as due now
+
+
+def utc_now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 timestamp into an aware datetime, or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+def hours_between(earlier, later):
+    return (later - earlier).total_seconds() / 3600
+
+
+class FeedSchedule:
+    """Thread-safe, persisted per-feed health record that decides which feeds to poll."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.loaded = False
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the schedule from disk, starting empty if it is missing or unreadable."""
+        with self._lock:
+            self.entries = {}
+            self._failed = set()
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self.entries = json.load(f).get("feeds", {})
+            except Exception as e:
+                logger.warning(f"Could not read feed schedule {self.path}, starting empty: {str(e)}")
+            self.loaded = True
+        return self
+
+    def save(self):
+        """Write the schedule to disk atomically."""
+        with self._lock:
+            data = {"feeds": dict(sorted(self.entries.items()))}
+        temp_path = f"{self.path}.temp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving feed schedule {self.path}: {str(e)}")
+
+    def poll_interval_hours(self, url, now=None):
+        """Hours to wait after the last poll of a feed before polling it again."""
+        now = now or utc_now()
+        with self._lock:
+            entry = dict(self.entries.get(url, {}))
+        failures = entry.get("failure_streak", 0)
+        if failures:
+            return min(FAILURE_BACKOFF_BASE_HOURS * 2 ** (failures - 1), MAX_POLL_INTERVAL_HOURS)
+        # The longer a feed has been quiet, the less often it is worth checking
+        last_article = parse_timestamp(entry.get("last_new_article_at") or entry.get("first_seen_at"))
+        idle_hours = hours_between(last_article, now) if last_article else 0.0
+        expected_gap = max(entry.get("cadence_hours") or 0.0, idle_hours)
+        return min(expected_gap * QUIET_POLL_FRACTION, MAX_POLL_INTERVAL_HOURS)
+
+    def next_poll_at(self, url, now=None):
+        """When a feed is next due, or None if it has never been polled."""
+        with self._lock:
+            last_polled = parse_timestamp(self.entries.get(url, {}).get("last_polled_at"))
+        if last_polled is None:
+            return None
+        return last_polled + datetime.timedelta(hours=self.poll_interval_hours(url, now))
+
+    def due_feeds(self, feed_urls, now=None, full_poll=False):
+        """Split feed_urls into (due, skipped), keeping their order."""
+        now = now or utc_now()
+        if full_poll:
+            return list(feed_urls), []
+        due, skipped = [], []
+        slack = datetime.timedelta(hours=POLL_SLACK_HOURS)
+        for url in feed_urls:
+            next_poll = self.next_poll_at(url, now)
+            if next_poll is None or next_poll <= now + slack:
+                due.append(url)
+            else:
+                skipped.append(url)
+                with self._lock:
+                    failures = self.entries[url].get("failure_streak", 0)
+                reason = f"{failures} failures in a row" if failures else "no new articles recently"
+                logger.info(f"Skipping feed until {next_poll.isoformat(timespec='minutes')} ({reason}): {url}")
+        return due, skipped
+
+    def record_failure(self, url, reason):
+        """Count a failed or empty poll; the streak resets on the next successful one."""
+        with self._lock:
+            if url in self._failed:
+                return
+            self._failed.add(url)
+            entry = self.entries.setdefault(url, {})
+            entry["failure_streak"] = entry.get("failure_streak", 0) + 1
+            entry["last_failure"] = reason
+
+    def record_poll(self, url, new_article_times=(), now=None):
+        """Record that a feed was polled, with the publish times of the new articles it produced."""
+        now = now or utc_now()
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry.setdefault("first_seen_at", now.isoformat(timespec="seconds"))
+            entry["last_polled_at"] = now.isoformat(timespec="seconds")
+            if url in self._failed:
+                self._failed.discard(url)
+            else:
+                entry["failure_streak"] = 0
+                entry.pop("last_failure", None)
+            if not new_article_times:
+                return
+            entry["last_new_article_at"] = now.isoformat(timespec="seconds")
+            # Cadence comes from publish times, not poll times, so polling less often does not inflate it
+            newest = min(max(new_article_times), now)
+            previous = parse_timestamp(entry.get("last_published_at"))
+            if previous and newest > previous:
+                gap = hours_between(previous, newest) / len(new_article_times)
+                cadence = entry.get("cadence_hours")
+                if cadence is not None:
+                    gap = CADENCE_SMOOTHING * gap + (1 - CADENCE_SMOOTHING) * cadence
+                entry["cadence_hours"] = round(gap, 2)
+            if previous is None or newest > previous:
+                entry["last_published_at"] = newest.isoformat(timespec="seconds")
+
+    def prune(self, active_urls):
+        """Drop feeds that are no longer configured."""
+        active_urls = set(active_urls)
+        with self._lock:
+            stale = [url for url in self.entries if url not in active_urls]
+            for url in stale:
+                del self.entries[url]
+        if stale:
+            logger.info(f"Removed {len(stale)} feeds from the feed schedule")
+        return stale
@@ -0,0 +1,142 @@
+"""
+Streaming RSS/Atom entry reader.
+
+iter_feed_entries feeds a raw feed body to an incremental XML parser in chunks
+and yields each <item> or <entry> as soon as it is complete, then drops it from
+the tree. Callers that stop iterating after the first few entries never parse
+the rest of the document, which matters for multi-megabyte full-content feeds.
+
+Entries are feedparser-style dicts with the fields the collector reads (title,
+link, id, summary, content, published_parsed, updated_parsed). Anything the reader
+does not understand raises FeedStreamError so the caller can fall back to
+feedparser.
+"""
+
+import xml.etree.ElementTree as ET
+
+from feedparser import FeedParserDict
+# The same date parsing as feedparser, so both readers agree on every date format
+from feedparser.datetimes import _parse_date as parse_feed_date
+
+CHUNK_SIZE = 64 * 1024
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS1_NS = "http://purl.org/rss/1.0/"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+FEED_ROOTS = {"rss", "RDF", "feed"}
+ENTRY_TAGS = {"item", "entry"}
+# Namespaces whose elements are the entry's own fields (RSS 2.0 has none)
+ENTRY_NAMESPACES = {"", RSS1_NS, ATOM_NS}
+
+
+class FeedStreamError(Exception):
+    """Raised when a body is not an RSS or Atom document the streaming reader can handle."""
+
+
+def split_tag(tag):
+    """Split an ElementTree tag into (namespace, local name)."""
+    if tag.startswith("{"):
+        namespace, _, name = tag[1:].partition("}")
+        return namespace, name
+    return "", tag
+
+
+def element_text(element):
+    return (element.text or "").strip()
+
+
+def xhtml_markup(element):
+    """Serialize the children of an Atom type="xhtml" element without namespaces or the wrapping div."""
+    for child in element.iter():
+        child.tag = split_tag(child.tag)[1]
+    children = list(element)
+    if len(children) == 1 and children[0].tag == "div" and not element_text(element):
+        element = children[0]
+    markup = (element.text or "") + "".join(ET.tostring(child, encoding="unicode") for child in element)
+    return markup.strip()
+
+
+def content_value(element):
+    if element.get("type") == "xhtml":
+        return xhtml_markup(element)
+    return element_text(element)
+
+
+def entry_from_element(element):
+    """Build a feedparser-style entry from an RSS <item> or Atom <entry> element."""
+    entry = FeedParserDict()
+    content = []
+    dates = {}
+    guid = None
+    for child in element:
+        namespace, name = split_tag(child.tag)
+        if namespace == CONTENT_NS and name == "encoded":
+            content.append({"value": element_text(child)})
+        elif namespace == DC_NS and name == "date":
+            dates.setdefault("updated", element_text(child))
+        elif namespace not in ENTRY_NAMESPACES:
+            continue
+        elif name == "title" and "title" not in entry:
+            entry["title"] = content_value(child)
+        elif name == "link":
+            if namespace == ATOM_NS:
+                if child.get("rel", "alternate") == "alternate" and "link" not in entry:
+                    entry["link"] = child.get("href", "").strip()
+            elif "link" not in entry:
+                entry["link"] = element_text(child)
+        elif name in ("description", "summary") and "summary" not in entry:
+            entry["summary"] = content_value(child)
+        elif name == "content":
+            content.append({"value": content_value(child)})
+        elif name == "guid":
+            guid = child
+        elif name == "id" and namespace == ATOM_NS and "id" not in entry:
+            entry["id"] = element_text(child)
+        elif name in ("pubDate", "published"):
+            dates.setdefault("published", element_text(child))
+        elif name == "updated":
+            dates.setdefault("updated", element_text(child))
+
+    if guid is not None and "id" not in entry:
+        entry["id"] = element_text(guid)
+    if "link" not in entry and guid is not None and guid.get("isPermaLink", "true") != "false":
+        # An RSS guid that is a permalink doubles as the link, as in feedparser
+        if element_text(guid).startswith(("http://", "https://")):
+            entry["link"] = element_text(guid)
+    if content:
+        entry["content"] = content
+        if "summary" not in entry:
+            entry["summary"] = content[0]["value"]
+    for field, value in dates.items():
+        parsed = parse_feed_date(value) if value else None
+        if parsed:
+            entry[f"{field}_parsed"] = parsed
+    return entry
+
+
+def iter_feed_entries(body, chunk_size=CHUNK_SIZE):
+    """Yield the entries of an RSS 2.0, RSS 1.0 or Atom body one at a time.
+
+    Raises FeedStreamError for malformed XML or other document types, possibly
+    after some entries have already been yielded.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parents = []
+    try:
+        for offset in range(0, len(body), chunk_size):
+            parser.feed(body[offset:offset + chunk_size])
+            for event, element in parser.read_events():
+                if event == "start":
+                    if not parents and split_tag(element.tag)[1] not in FEED_ROOTS:
+                        raise FeedStreamError(f"Not an RSS or Atom document: <{split_tag(element.tag)[1]}>")
+                    parents.append(element)
+                    continue
+                parents.pop()
+                namespace, name = split_tag(element.tag)
+                if name in ENTRY_TAGS and namespace in ENTRY_NAMESPACES and parents:
+                    yield entry_from_element(element)
+                    # Finished entries are not needed again; keep the tree to the current one
+                    parents[-1].remove(element)
+        parser.close()
+    except ET.ParseError as e:
+        raise FeedStreamError(f"Malformed feed XML: {str(e)}") from e
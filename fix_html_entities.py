@@ -1,111 +1,151 @@
 #!/usr/bin/env python
 """
 Script to fix HTML entities in the AI news CSV file
-This script will read the ai_news.csv file, decode HTML entities in the title and description fields,
-and write the fixed data back to the file.
+This script streams the primary ai_news.csv row by row, decodes HTML entities
+(numeric like &#8217; and named like &amp;) in the title and description fields,
+writes the fixed data back, and copies the result over the secondary CSV copies.
+
+collect_news uses fix_articles on each batch of new articles before they are
+stored, so the files only need this script for data collected before that.
 """
 
 import csv
 import html
 import os
+import re
+import shutil
 import logging
+from collections import Counter
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='fix_html_entities.log'
-)
+logger = logging.getLogger("fix_html_entities")
+
+# Fields that may contain HTML entities
+ENTITY_FIELDS = ("title", "description")
+# Everything html.unescape decodes: numeric references and named entities, with or without ';'
+ENTITY_PATTERN = re.compile(r"&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[A-Za-z][A-Za-z0-9]*;?)")
+TOP_ENTITIES_LOGGED = 5
+
+class EntityFixStats:
+    """Aggregated counters for one run of the fixer, logged once instead of per row."""
+
+    def __init__(self):
+        self.rows = 0
+        self.rows_fixed = 0
+        self.fields_fixed = Counter()
+        self.entities = Counter()
+
+    @property
+    def fixed_count(self):
+        """Number of fields that were changed."""
+        return sum(self.fields_fixed.values())
 
-logger = logging.getLogger()
+    def summary(self):
+        fields = ", ".join(f"{field} {count}" for field, count in sorted(self.fields_fixed.items()))
+        text = f"fixed {self.fixed_count} fields in {self.rows_fixed} of {self.rows} rows"
+        if fields:
+            text += f" ({fields})"
+        if self.entities:
+            common = ", ".join(f"{entity} x{count}" for entity, count in self.entities.most_common(TOP_ENTITIES_LOGGED))
+            text += f"; most common entities: {common}"
+        return text
+
+def unescape_field(value, stats=None):
+    """Decode the HTML entities in one field value, counting the entities that changed it."""
+    if not value or "&" not in value:
+        return value
+    fixed = html.unescape(value)
+    if fixed != value and stats is not None:
+        stats.entities.update(entity for entity in ENTITY_PATTERN.findall(value) if html.unescape(entity) != entity)
+    return fixed
+
+def fix_rows(rows, fields=ENTITY_FIELDS, stats=None):
+    """Yield each row dict with the HTML entities in fields decoded (rows are updated in place)."""
+    for row in rows:
+        row_fixed = False
+        for field in fields:
+            value = row.get(field)
+            fixed = unescape_field(value, stats)
+            if fixed != value:
+                row[field] = fixed
+                row_fixed = True
+                if stats is not None:
+                    stats.fields_fixed[field] += 1
+        if stats is not None:
+            stats.rows += 1
+            stats.rows_fixed += row_fixed
+        yield row
+
+def fix_articles(articles, stats=None):
+    """Decode HTML entities in a list of article dicts in memory and return the list."""
+    for _ in fix_rows(articles, stats=stats):
+        pass
+    return articles
 
 def fix_html_entities(input_csv, output_csv=None):
     """
-    Fix HTML entities in the CSV file
-    
+    Fix HTML entities in the CSV file, streaming it one row at a time
+
     Args:
         input_csv (str or Path): Path to the input CSV file
         output_csv (str or Path, optional): Path to the output CSV file. If not provided, input file will be updated.
+
+    Returns:
+        (output_csv, fixed_count): where the fixed file was written and how many fields changed
     """
     if output_csv is None:
         output_csv = str(input_csv) + '.fixed'
-    
+
+    stats = EntityFixStats()
     try:
-        # Read the CSV file
-        with open(input_csv, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            rows = list(reader)
-        
-        # Fix HTML entities in title and description fields
-        fixed_count = 0
-        for row in rows:
-            # Fix title
-            if '&#' in row['title']:
-                original_title = row['title']
-                row['title'] = html.unescape(row['title'])
-                fixed_count += 1
-                logger.info(f"Fixed title: {original_title[:30]}... -> {row['title'][:30]}...")
-            
-            # Fix description
-            if '&#' in row['description']:
-                original_desc = row['description']
-                row['description'] = html.unescape(row['description'])
-                fixed_count += 1
-                logger.info(f"Fixed description: {original_desc[:30]}... -> {row['description'][:30]}...")
-        
-        # Write the fixed data to the output file
-        with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+        with open(input_csv, 'r', encoding='utf-8', newline='') as source, \
+                open(output_csv, 'w', encoding='utf-8', newline='') as target:
+            reader = csv.DictReader(source)
+            writer = csv.DictWriter(target, fieldnames=reader.fieldnames)
             writer.writeheader()
-            writer.writerows(rows)
-        
-        logger.info(f"Fixed {fixed_count} HTML entities in {input_csv}")
+            writer.writerows(fix_rows(reader, stats=stats))
+
+        logger.info(f"{input_csv}: {stats.summary()}")
         logger.info(f"Wrote fixed data to {output_csv}")
-        
-        return output_csv, fixed_count
-    
+
+        return output_csv, stats.fixed_count
+
     except Exception as e:
         logger.error(f"Error fixing HTML entities: {e}")
         raise
 
 def update_all_csv_files():
     """
-    Update all CSV files (main, web_app/data, and docs/data)
+    Fix the primary CSV file (docs/data) once and copy it over the other copies (main and web_app/data)
     """
     base_dir = Path(__file__).resolve().parent
-    web_app_csv = base_dir / "web_app" / "data" / "ai_news.csv"
-    docs_csv = base_dir / "docs" / "data" / "ai_news.csv"
-    main_csv = base_dir / "ai_news.csv"
-    
-    total_count = 0
-    
-    # Fix main CSV file
-    if os.path.exists(main_csv):
-        main_fixed, main_count = fix_html_entities(main_csv)
-        os.replace(main_fixed, str(main_csv))
-        logger.info(f"Updated main CSV file {main_csv} with fixed HTML entities")
-        total_count += main_count
-    
-    # Fix web_app CSV file
-    if os.path.exists(web_app_csv):
-        web_app_fixed, web_app_count = fix_html_entities(web_app_csv)
-        os.replace(web_app_fixed, str(web_app_csv))
-        logger.info(f"Updated web_app CSV file {web_app_csv} with fixed HTML entities")
-        total_count += web_app_count
-    
-    # Fix docs CSV file
-    if os.path.exists(docs_csv):
-        docs_fixed, docs_count = fix_html_entities(docs_csv)
-        os.replace(docs_fixed, str(docs_csv))
-        logger.info(f"Updated docs CSV file {docs_csv} with fixed HTML entities")
-        total_count += docs_count
-    
-    return total_count
+    primary_csv = base_dir / "docs" / "data" / "ai_news.csv"
+    secondary_csvs = [base_dir / "ai_news.csv", base_dir / "web_app" / "data" / "ai_news.csv"]
+
+    if not os.path.exists(primary_csv):
+        logger.warning(f"Primary CSV file {primary_csv} does not exist, nothing to fix")
+        return 0
+
+    fixed_path, fixed_count = fix_html_entities(primary_csv)
+    os.replace(fixed_path, str(primary_csv))
+    logger.info(f"Updated primary CSV file {primary_csv} with fixed HTML entities")
+
+    # The copies hold the same data, so they get the fixed file instead of being fixed again
+    for secondary_csv in secondary_csvs:
+        if not os.path.exists(secondary_csv):
+            continue
+        temp_path = str(secondary_csv) + '.fixed'
+        shutil.copyfile(primary_csv, temp_path)
+        os.replace(temp_path, str(secondary_csv))
+        logger.info(f"Copied fixed CSV file to {secondary_csv}")
+
+    return fixed_count
 
 if __name__ == "__main__":
+    from logging_setup import setup_logging
+    # The summary goes to the log file; the console only gets the prints below
+    setup_logging("fix_html_entities", console=False)
     print("Fixing HTML entities in AI news CSV files...")
     total_fixed = update_all_csv_files()
     print(f"Fixed {total_fixed} HTML entities across all CSV files.")
-    print("See fix_html_entities.log for details.")
+    print("See logs/fix_html_entities.log for details.")
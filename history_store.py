@@ -0,0 +1,167 @@
+"""
+Article history store for the AI News Collector.
+
+Keeps the URLs of every article that has already been processed in an SQLite
+table, replacing the append-only article_history.txt. Membership checks are
+primary-key lookups, new URLs are written in one batch per run, URLs are
+normalized before they are stored, and entries older than the retention period
+are compacted away.
+"""
+
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger("AI_News_Collector")
+
+# Query parameters that only track the click and never identify the article
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def normalize_url(url):
+    """Normalize an article URL so trivially different links map to the same history entry.
+
+    Lowercases the scheme and host, drops default ports, fragments, tracking
+    parameters (utm_* and friends) and a trailing slash on the path.
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.netloc.lower()
+    if host.rsplit(":", 1)[-1] == DEFAULT_PORTS.get(scheme):
+        host = host.rsplit(":", 1)[0]
+    path = parts.path
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+    query = parts.query
+    if query:
+        params = parse_qsl(query, keep_blank_values=True)
+        kept = [(key, value) for key, value in params
+                if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS]
+        if len(kept) != len(params):
+            query = urlencode(kept)
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _utc_now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0).isoformat()
+
+
+class ArticleHistory:
+    """SQLite-backed set of processed article URLs with batched writes and retention."""
+
+    def __init__(self, path, retention_days=365):
+        self.path = str(path)
+        self.retention_days = retention_days
+        self.pending = set()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS article_history (
+                url TEXT PRIMARY KEY,
+                first_seen TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_article_history_first_seen ON article_history (first_seen);
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+    def __contains__(self, url):
+        """Check whether an article URL has been processed, in this run or an earlier one."""
+        url = normalize_url(url)
+        with self._lock:
+            if url in self.pending:
+                return True
+            row = self.connection.execute("SELECT 1 FROM article_history WHERE url = ?", (url,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            stored = self.connection.execute("SELECT COUNT(*) FROM article_history").fetchone()[0]
+            return stored + len(self.pending)
+
+    def urls(self):
+        """All processed article URLs (normalized), as a set for bulk membership checks."""
+        with self._lock:
+            stored = {row[0] for row in self.connection.execute("SELECT url FROM article_history")}
+            return stored | self.pending
+
+    def add(self, url):
+        """Mark an article URL as processed; it is written to disk on the next flush()."""
+        with self._lock:
+            self.pending.add(normalize_url(url))
+
+    def flush(self):
+        """Write all URLs added since the last flush in a single transaction."""
+        with self._lock:
+            if not self.pending:
+                return 0
+            now = _utc_now()
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO article_history (url, first_seen) VALUES (?, ?)",
+                    [(url, now) for url in sorted(self.pending)]
+                )
+            written = len(self.pending)
+            self.pending.clear()
+        logger.info(f"Saved {written} article IDs to history store {self.path}")
+        return written
+
+    def compact(self, retention_days=None):
+        """Delete entries first seen before the retention period, vacuuming when enough was removed."""
+        retention_days = self.retention_days if retention_days is None else retention_days
+        cutoff = (datetime.datetime.now(datetime.timezone.utc)
+                  - datetime.timedelta(days=retention_days)).replace(microsecond=0).isoformat()
+        with self._lock:
+            with self.connection:
+                removed = self.connection.execute(
+                    "DELETE FROM article_history WHERE first_seen < ?", (cutoff,)
+                ).rowcount
+            if removed >= 1000:
+                self.connection.execute("VACUUM")
+        if removed:
+            logger.info(f"Compacted history store: removed {removed} entries older than {retention_days} days")
+        return removed
+
+    def migrate_from_text(self, text_path):
+        """One-shot import of the legacy article_history.txt; later calls do nothing."""
+        with self._lock:
+            migrated = self.connection.execute(
+                "SELECT value FROM store_meta WHERE key = 'migrated_from_text'"
+            ).fetchone()
+        if migrated or not os.path.exists(text_path):
+            return 0
+
+        now = _utc_now()
+        with open(text_path, "r", encoding="utf-8") as f:
+            urls = {normalize_url(line) for line in f if line.strip()}
+        with self._lock:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO article_history (url, first_seen) VALUES (?, ?)",
+                    [(url, now) for url in sorted(urls)]
+                )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('migrated_from_text', ?)", (now,)
+                )
+        logger.info(f"Migrated {len(urls)} article IDs from {text_path} to history store {self.path}")
+        return len(urls)
+
+    def close(self):
+        """Flush pending URLs and close the database."""
+        self.flush()
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,114 @@
+"""
+Compiled multi-keyword matcher for the AI News Collector.
+
+All AI keywords and category keywords are compiled once into a single trie-shaped
+regular expression. One scan over an article's lowercased text returns every
+keyword occurrence with its offset, and the relevance checks and category
+selection are all answered from that one result.
+"""
+
+import re
+
+
+def _build_trie(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True  # Marks the end of a keyword
+    return trie
+
+
+def _trie_to_pattern(node):
+    """Convert a trie into a regex that greedily matches the longest keyword at a position."""
+    is_end = "" in node
+    branches = [re.escape(char) + _trie_to_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    # Greedy optional group: prefer the longer keyword, fall back to the shorter one
+    return pattern + "?" if is_end else pattern
+
+
+class KeywordMatcher:
+    """Finds all occurrences of a fixed set of keywords, including overlapping ones, in one pass."""
+
+    def __init__(self, ai_keywords, categories):
+        self.ai_keywords = frozenset(keyword.lower() for keyword in ai_keywords)
+        self.categories = [
+            (category, frozenset(keyword.lower() for keyword in keywords))
+            for category, keywords in categories.items()
+        ]
+        keywords = set(self.ai_keywords)
+        for _, category_keywords in self.categories:
+            keywords.update(category_keywords)
+
+        self.keywords = frozenset(keywords)
+        self.pattern = re.compile(_trie_to_pattern(_build_trie(sorted(self.keywords))))
+        # Every keyword matching at a position is a prefix of the longest one found there
+        self._prefixes = {
+            keyword: [other for other in sorted(self.keywords, key=len) if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def find_all(self, text):
+        """Return (offset, keyword) for every keyword occurrence in already-lowercased text."""
+        matches = []
+        search = self.pattern.search
+        match = search(text)
+        while match:
+            start = match.start()
+            for keyword in self._prefixes[match.group()]:
+                matches.append((start, keyword))
+            # Restart one character later so overlapping keywords are found too
+            match = search(text, start + 1)
+        return matches
+
+    def scan(self, title, description):
+        """Scan an article's "title description" text once and return its ArticleKeywords."""
+        title_text = title.lower()
+        text = title_text + " " + description.lower()
+        description_start = len(title_text) + 1
+        return ArticleKeywords(self, self.find_all(text), description_start, description)
+
+    def category_for(self, matched_keywords):
+        """Return the first category with a matched keyword, or the general AI category."""
+        for category, keywords in self.categories:
+            if not keywords.isdisjoint(matched_keywords):
+                return category
+        return "artificial intelligence"
+
+
+class ArticleKeywords:
+    """Keyword occurrences found in one article's lowercased "title description" text."""
+
+    def __init__(self, matcher, matches, description_start, description):
+        self.matcher = matcher
+        self.matches = matches
+        self.description_start = description_start
+        self.description = description
+        self.ai_matches = [(offset, keyword) for offset, keyword in matches if keyword in matcher.ai_keywords]
+
+    def is_ai_related(self):
+        """True if any AI keyword occurs anywhere in the title or description."""
+        return bool(self.ai_matches)
+
+    def has_ai_keyword_in_title(self):
+        """True if an AI keyword occurs entirely within the title."""
+        title_end = self.description_start - 1
+        return any(offset + len(keyword) <= title_end for offset, keyword in self.ai_matches)
+
+    def has_ai_keyword_in_description(self, length):
+        """True if an AI keyword occurs entirely within the first `length` characters of the description."""
+        window_end = self.description_start + len(self.description[:length].lower())
+        return any(
+            offset >= self.description_start and offset + len(keyword) <= window_end
+            for offset, keyword in self.ai_matches
+        )
+
+    def category(self):
+        """Return the most specific AI category for the matched keywords."""
+        return self.matcher.category_for({keyword for _, keyword in self.matches})
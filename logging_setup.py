@@ -0,0 +1,156 @@
+"""
+Shared logging setup for ai_news_collector.py, deploy_to_github.py,
+fix_html_entities.py and sync_csv_files.py.
+
+setup_logging puts a single QueueHandler on the root logger, so a log call only
+queues the record. A QueueListener thread formats the records and writes them to
+the console and to logs/<name>.log. The log file rotates at LOG_MAX_BYTES, and
+each rotated file is gzip-compressed (<name>.log.1.gz is the newest). Older ones
+beyond LOG_BACKUP_COUNT are dropped.
+
+Environment overrides:
+    AI_NEWS_LOG_JSON=1      write the log file as JSON lines (logs/<name>.jsonl)
+    AI_NEWS_LOG_LEVEL=DEBUG include the per-feed and per-file details the scripts
+                            otherwise fold into their summary lines
+
+The logs/ directory is not committed.
+"""
+
+import atexit
+import datetime
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+from pathlib import Path
+
+LOG_DIR = Path(__file__).parent / "logs"
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_JSON_ENV = "AI_NEWS_LOG_JSON"
+LOG_LEVEL_ENV = "AI_NEWS_LOG_LEVEL"
+
+_listener = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: time (UTC), level, logger, message and any exception."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                    .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def gzip_rotator(source, dest):
+    """Compress the file being rotated out instead of renaming it."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def rotating_file_handler(path, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+    """A RotatingFileHandler whose rotated files are gzip-compressed."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                   encoding="utf-8")
+    handler.namer = lambda name: name + ".gz"
+    handler.rotator = gzip_rotator
+    return handler
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _before_fork():
+    # Hold the writer's handlers so the child never inherits one mid-write or mid-rotation
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.acquire()
+
+
+def _after_fork_in_parent():
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.release()
+
+
+def _write_directly_in_child():
+    # A forked process (the parse pool) has a copy of the queue but no listener
+    # thread, so its records would be lost; write them with the handlers instead.
+    # The logging module has already reset the handler locks in the child.
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    for handler in _listener.handlers:
+        if isinstance(handler, logging.FileHandler):
+            # Append through a file of its own; only the main process rotates the log
+            child_handler = logging.FileHandler(handler.baseFilename, encoding="utf-8", delay=True)
+            child_handler.setFormatter(handler.formatter)
+            handler = child_handler
+        root.addHandler(handler)
+
+
+def setup_logging(name, level=None, json_lines=None, console=True, stream=None, log_dir=LOG_DIR):
+    """Send every log record through a background writer to the console and logs/<name>.log.
+
+    level defaults to AI_NEWS_LOG_LEVEL or INFO, and json_lines to AI_NEWS_LOG_JSON.
+    The console always gets plain text. Returns the QueueListener, which is stopped
+    (flushing the queue) at exit. Calling this again returns the running listener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, "INFO").upper()
+    if json_lines is None:
+        json_lines = _env_flag(LOG_JSON_ENV)
+
+    handlers = []
+    suffix = ".jsonl" if json_lines else ".log"
+    file_handler = rotating_file_handler(Path(log_dir) / f"{name}{suffix}")
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(LOG_FORMAT))
+    handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler(stream or sys.stderr)
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                            after_in_child=_write_directly_in_child)
+    return _listener
+
+
+def stop_logging():
+    """Flush the queued records and close the log handlers."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
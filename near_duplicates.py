@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+"""
+Near-duplicate article detection for the AI News Collector.
+
+Exact URL checks miss the same story published at different URLs, for example
+a press release syndicated by several outlets. Each article is reduced to the set
+of words in its title and description, less stop words, and summarized by a
+MinHash signature. LSH banding then finds candidate duplicates by hashing bands
+of the signature into buckets, so a lookup only compares against articles that
+share a bucket instead of scanning the whole archive. Candidates are confirmed
+by the exact Jaccard similarity of their word sets, so the signature only has to
+be long enough to find them.
+
+Retitled copies of a story keep most of their words but few word sequences, so
+single words match them far better than word 3-grams did (recall 0.50 against
+0.25). On the hand-labeled pairs in benchmarks/near_duplicate_labels.csv (run
+benchmarks/eval_near_duplicates.py), a 0.45 threshold finds 8 of the 16
+duplicates with no false positives: the unrelated pairs top out at 0.42 (a
+conference preview and its recap, then newsletter issues and the articles they
+link) and the republished articles it finds start at 0.48. Most of the
+duplicates it misses are rewrites of an announcement by different outlets that
+share under a third of their words, which a lower threshold cannot reach
+without matching newsletters too. 32 bands of 3 rows make pairs at 0.45
+similarity candidates about 95% of the time and pairs at 0.6 almost always.
+
+NearDuplicateIndex keeps the word hashes and band buckets of recent articles in
+SQLite (ai_news.db) so collect_news can check each new article at ingest time;
+republished copies of a story appear within days, so older entries are pruned.
+Run as a script to find duplicate clusters in a whole CSV, and optionally remove
+them:
+
+Usage:
+    python near_duplicates.py [--csv PATH] [--threshold 0.45] [--apply]
+"""
+
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import struct
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger("AI_News_Collector")
+
+SHINGLE_SIZE = 1  # Words per shingle
+NUM_PERMUTATIONS = 96
+LSH_BANDS = 32  # 3 rows per band
+DEFAULT_THRESHOLD = 0.45  # Jaccard similarity at which two articles are the same story
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+PERMUTED_CACHE_SIZE = 2048  # Recently seen words' permuted hashes, about 9 MB
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset("""
+    a about after an and are as at be but by can for from has have how i in into is it its just more my new
+    not now of on or our than that the this to was we were what why will with you your
+""".split())
+
+
+def article_shingles(title, description, size=SHINGLE_SIZE):
+    """Set of overlapping word n-grams from an article's title and description, skipping stop words."""
+    words = [word for word in WORD_PATTERN.findall(f"{title} {description}".lower()) if word not in STOP_WORDS]
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def stable_hash(text):
+    """64-bit hash that, unlike hash(), is the same in every process."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingle_hashes(title, description):
+    """Stable hashes of an article's shingles, the set its similarity is measured on."""
+    return frozenset(stable_hash(shingle) for shingle in article_shingles(title, description))
+
+
+class MinHasher:
+    """MinHash signatures from a fixed family of universal hash permutations."""
+
+    def __init__(self, num_permutations=NUM_PERMUTATIONS, seed=1):
+        self.num_permutations = num_permutations
+        self.permutations = [
+            (stable_hash(f"a{seed}-{i}") % (MERSENNE_PRIME - 1) + 1, stable_hash(f"b{seed}-{i}") % MERSENNE_PRIME)
+            for i in range(num_permutations)
+        ]
+        # News vocabulary repeats heavily between articles, so most words are already permuted
+        self.permuted = lru_cache(maxsize=PERMUTED_CACHE_SIZE)(self._permuted)
+
+    def _permuted(self, value):
+        return tuple([(a * value + b) % MERSENNE_PRIME for a, b in self.permutations])
+
+    def signature(self, hashes):
+        """Signature of a set of shingle hashes: the minimum of each permutation over the set."""
+        if not hashes:
+            return (MAX_HASH,) * self.num_permutations
+        return tuple([minimum & MAX_HASH for minimum in map(min, zip(*map(self.permuted, hashes)))])
+
+
+def jaccard_similarity(hashes_a, hashes_b):
+    """Shared shingles as a fraction of all shingles in either article."""
+    union = len(hashes_a | hashes_b)
+    return len(hashes_a & hashes_b) / union if union else 0.0
+
+
+def band_keys(signature, bands=LSH_BANDS):
+    """One bucket key per band; articles sharing any key are duplicate candidates."""
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        data = struct.pack(f"<I{rows}I", band, *signature[band * rows:(band + 1) * rows])
+        # SQLite integers are signed 64-bit, so keep the key to 63 bits
+        keys.append(int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little") >> 1)
+    return keys
+
+
+def pack_hashes(hashes):
+    return struct.pack(f"<{len(hashes)}Q", *hashes)
+
+
+def unpack_hashes(data):
+    return frozenset(struct.unpack(f"<{len(data) // 8}Q", data))
+
+
+class NearDuplicateIndex:
+    """Shingle hashes with MinHash LSH band buckets, persisted in SQLite.
+
+    An article's fingerprint is its (shingle hashes, band keys) pair; pass the
+    one from fingerprint() to both find_duplicate() and add() to compute it once.
+    """
+
+    def __init__(self, path, threshold=DEFAULT_THRESHOLD, bands=LSH_BANDS, hasher=None):
+        self.path = str(path)
+        self.threshold = threshold
+        self.bands = bands
+        self.hasher = hasher or MinHasher()
+        # Articles added since the last flush, and their band buckets
+        self.pending = []
+        self.pending_buckets = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        # The word 3-gram signature tables are replaced; an empty index is rebuilt from the CSV
+        self.connection.executescript("""
+            DROP TABLE IF EXISTS near_duplicate_signatures;
+            DROP TABLE IF EXISTS near_duplicate_bands;
+            CREATE TABLE IF NOT EXISTS near_duplicate_shingles (
+                url TEXT PRIMARY KEY,
+                date TEXT NOT NULL,
+                hashes BLOB NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_near_duplicate_shingles_date ON near_duplicate_shingles (date);
+            CREATE TABLE IF NOT EXISTS near_duplicate_buckets (
+                band_key INTEGER NOT NULL,
+                url TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_near_duplicate_buckets_key ON near_duplicate_buckets (band_key);
+        """)
+
+    def __len__(self):
+        with self._lock:
+            stored = self.connection.execute("SELECT COUNT(*) FROM near_duplicate_shingles").fetchone()[0]
+            return stored + len(self.pending)
+
+    def fingerprint(self, title, description):
+        hashes = shingle_hashes(title, description)
+        return hashes, band_keys(self.hasher.signature(hashes), self.bands)
+
+    def find_duplicate(self, title, description, fingerprint=None):
+        """Return (url, similarity) of the most similar indexed article at or above the threshold, or None."""
+        hashes, keys = fingerprint or self.fingerprint(title, description)
+        with self._lock:
+            candidates = self.connection.execute(
+                f"SELECT DISTINCT s.url, s.hashes FROM near_duplicate_buckets b "
+                f"JOIN near_duplicate_shingles s ON s.url = b.url "
+                f"WHERE b.band_key IN ({','.join('?' * len(keys))})",
+                keys
+            ).fetchall()
+            pending = {position for key in keys for position in self.pending_buckets.get(key, ())}
+            candidates += [(self.pending[position][0], self.pending[position][2][0]) for position in pending]
+        best = None
+        for url, candidate in candidates:
+            if isinstance(candidate, bytes):
+                candidate = unpack_hashes(candidate)
+            similarity = jaccard_similarity(hashes, candidate)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (url, similarity)
+        return best
+
+    def add(self, url, title, description, date, fingerprint=None):
+        """Index an article so later articles can be matched against it; stored on the next flush()."""
+        fingerprint = fingerprint or self.fingerprint(title, description)
+        with self._lock:
+            self.pending.append((url, date, fingerprint))
+            for key in fingerprint[1]:
+                self.pending_buckets.setdefault(key, []).append(len(self.pending) - 1)
+
+    def flush(self):
+        """Write all articles added since the last flush in a single transaction."""
+        with self._lock:
+            pending = self.pending
+            self.pending = []
+            self.pending_buckets = {}
+        if pending:
+            self.add_many(pending)
+        return len(pending)
+
+    def add_many(self, articles):
+        """Index (url, date, fingerprint) tuples in a single transaction; URLs already indexed are skipped."""
+        with self._lock:
+            with self.connection:
+                for url, date, (hashes, keys) in articles:
+                    inserted = self.connection.execute(
+                        "INSERT OR IGNORE INTO near_duplicate_shingles (url, date, hashes) VALUES (?, ?, ?)",
+                        (url, date or "", pack_hashes(hashes))
+                    ).rowcount
+                    if inserted:
+                        self.connection.executemany(
+                            "INSERT INTO near_duplicate_buckets (band_key, url) VALUES (?, ?)",
+                            [(key, url) for key in keys]
+                        )
+
+    def build_from_csv(self, csv_path, since=""):
+        """Index the articles dated on or after `since` from a newest-first CSV."""
+        articles = []
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row.get("date", "") < since:
+                    # The CSV is sorted newest first, so the rest is older still
+                    break
+                if row.get("url"):
+                    fingerprint = self.fingerprint(row.get("title", ""), row.get("description", ""))
+                    articles.append((row["url"], row.get("date", ""), fingerprint))
+        self.add_many(articles)
+        logger.info(f"Indexed {len(articles)} articles from {csv_path} for near-duplicate detection")
+        return len(articles)
+
+    def prune(self, before):
+        """Drop articles dated before `before` (YYYY-MM-DD) from the index."""
+        with self._lock:
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM near_duplicate_buckets WHERE url IN "
+                    "(SELECT url FROM near_duplicate_shingles WHERE date < ?)", (before,)
+                )
+                removed = self.connection.execute(
+                    "DELETE FROM near_duplicate_shingles WHERE date < ?", (before,)
+                ).rowcount
+        if removed:
+            logger.info(f"Pruned {removed} articles dated before {before} from the near-duplicate index")
+        return removed
+
+    def close(self):
+        """Flush pending articles and close the database."""
+        self.flush()
+        with self._lock:
+            self.connection.close()
+
+
+def find_duplicate_clusters(articles, threshold=DEFAULT_THRESHOLD, bands=LSH_BANDS, hasher=None):
+    """Group articles (dicts with title and description) into clusters of near-duplicates.
+
+    Returns lists of article positions, one per cluster of two or more articles,
+    along with the similarity of every matching pair as {(i, j): similarity}.
+    """
+    hasher = hasher or MinHasher()
+    hashes = [shingle_hashes(article.get("title", ""), article.get("description", "")) for article in articles]
+    buckets = {}
+    for position, article_hashes in enumerate(hashes):
+        for key in band_keys(hasher.signature(article_hashes), bands):
+            buckets.setdefault(key, []).append(position)
+
+    parents = list(range(len(articles)))
+
+    def find(position):
+        while parents[position] != position:
+            parents[position] = parents[parents[position]]
+            position = parents[position]
+        return position
+
+    pairs = {}
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                if (first, second) in pairs:
+                    continue
+                similarity = jaccard_similarity(hashes[first], hashes[second])
+                if similarity >= threshold:
+                    pairs[(first, second)] = similarity
+                    parents[find(second)] = find(first)
+
+    clusters = {}
+    for position in range(len(articles)):
+        clusters.setdefault(find(position), []).append(position)
+    return [members for members in clusters.values() if len(members) > 1], pairs
+
+
+def article_age_key(article):
+    """Sort key that puts the earliest published copy of a story first."""
+    return article.get("published_at") or article.get("date") or "", article.get("date") or ""
+
+
+def remove_duplicates_from_csv(csv_path, threshold=DEFAULT_THRESHOLD, apply=False):
+    """Report near-duplicate clusters in a CSV, keeping the earliest article of each.
+
+    With apply=True the other articles are removed from the file. Returns the
+    number of articles that are (or would be) removed.
+    """
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        articles = list(reader)
+
+    clusters, _ = find_duplicate_clusters(articles, threshold)
+    removed = set()
+    for members in clusters:
+        keep, *duplicates = sorted(members, key=lambda position: article_age_key(articles[position]))
+        print(f"Keeping: [{articles[keep]['source']}] {articles[keep]['title']}")
+        for position in duplicates:
+            print(f"  duplicate: [{articles[position]['source']}] {articles[position]['title']}")
+            removed.add(position)
+
+    print(f"{len(clusters)} clusters, {len(removed)} of {len(articles)} articles are near-duplicates")
+    if apply and removed:
+        temp_path = Path(csv_path).with_suffix(".temp.csv")
+        with open(temp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(article for position, article in enumerate(articles) if position not in removed)
+        os.replace(temp_path, csv_path)
+        print(f"Removed {len(removed)} articles from {csv_path}")
+    return len(removed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find and remove near-duplicate articles in the CSV")
+    parser.add_argument("--csv", default=str(Path(__file__).parent / "docs" / "data" / "ai_news.csv"),
+                        help="Article CSV to deduplicate")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similarity at which articles are duplicates (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--apply", action="store_true", help="Rewrite the CSV without the duplicates")
+    args = parser.parse_args()
+    remove_duplicates_from_csv(args.csv, args.threshold, apply=args.apply)
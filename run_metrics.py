@@ -0,0 +1,160 @@
+"""
+Run metrics for the AI News Collector.
+
+RunMetrics collects per-feed and per-stage timings and counters during one
+collect_news run and writes them as a single JSON record (or a Prometheus
+textfile), so runs can be compared by diffing the file. RunProfiler wraps a run
+in cProfile, including the feed worker threads.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+# Per-feed values summed into the run totals
+FEED_TOTALS = ("bytes", "decoded_bytes", "fetch_seconds", "parse_seconds", "entries", "scanned", "seen",
+               "accepted", "clean_html_seconds", "keyword_seconds")
+
+
+def _round(value):
+    return round(value, 4) if isinstance(value, float) else value
+
+
+class RunMetrics:
+    """Thread-safe timings and counters for one collector run."""
+
+    def __init__(self):
+        self.started_at = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0).isoformat()
+        self.feeds = {}
+        self.stages = {}
+        self.counters = {}
+        self._started = time.perf_counter()
+        self._duration = None
+        self._lock = threading.Lock()
+
+    def record_feed(self, url, **values):
+        """Set measurements for a feed, e.g. record_feed(url, status=200, bytes=1234)."""
+        with self._lock:
+            self.feeds.setdefault(url, {}).update(values)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def counter(self, name):
+        with self._lock:
+            return self.counters.get(name, 0)
+
+    def add_stage_time(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block of the run; repeated stages accumulate."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - started)
+
+    def finish(self):
+        """Stop the run clock, so later reads (e.g. the --daemon metrics endpoint) report the run's own duration."""
+        with self._lock:
+            self._duration = time.perf_counter() - self._started
+
+    def to_dict(self):
+        with self._lock:
+            feeds = {url: {key: _round(value) for key, value in sorted(values.items())}
+                     for url, values in sorted(self.feeds.items())}
+            totals = {"feeds": len(feeds)}
+            for key in FEED_TOTALS:
+                totals[key] = _round(sum(values.get(key, 0) for values in self.feeds.values()))
+            return {
+                "started_at": self.started_at,
+                "duration_seconds": _round(self._duration if self._duration is not None
+                                           else time.perf_counter() - self._started),
+                "stages": {name: _round(seconds) for name, seconds in sorted(self.stages.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "totals": totals,
+                "feeds": feeds,
+            }
+
+    def to_prometheus(self):
+        """Render the run in the Prometheus textfile collector format."""
+        record = self.to_dict()
+        lines = [
+            "# HELP ai_news_run_duration_seconds Wall time of the last collector run.",
+            "# TYPE ai_news_run_duration_seconds gauge",
+            f"ai_news_run_duration_seconds {record['duration_seconds']}",
+            "# HELP ai_news_stage_seconds Time spent in each stage of the last run.",
+            "# TYPE ai_news_stage_seconds gauge",
+        ]
+        lines += [f'ai_news_stage_seconds{{stage="{name}"}} {seconds}' for name, seconds in record["stages"].items()]
+        lines += ["# HELP ai_news_run_count Counters from the last run.", "# TYPE ai_news_run_count gauge"]
+        lines += [f'ai_news_run_count{{name="{name}"}} {value}' for name, value in record["counters"].items()]
+        feed_keys = sorted({key for values in record["feeds"].values() for key, value in values.items()
+                            if isinstance(value, (int, float))})
+        for key in feed_keys:
+            metric = f"ai_news_feed_{re.sub(r'[^a-z0-9_]', '_', key)}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines += [f'{metric}{{feed="{url}"}} {values[key]}'
+                      for url, values in record["feeds"].items() if isinstance(values.get(key), (int, float))]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Atomically write the run record; a .prom path selects the Prometheus textfile format."""
+        path = Path(path)
+        if path.suffix == ".prom":
+            data = self.to_prometheus()
+        else:
+            data = json.dumps(self.to_dict(), indent=2) + "\n"
+        os.makedirs(path.parent, exist_ok=True)
+        temp_path = path.with_name(path.name + ".temp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+
+class RunProfiler:
+    """cProfile across the main thread and every thread that calls profile()."""
+
+    def __init__(self):
+        # Only --profile runs pay for importing the profiler
+        import cProfile
+        self._profile_class = cProfile.Profile
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def profile(self):
+        profiler = self._profile_class()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ profiles every thread from a single active profiler
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with self._lock:
+                self.profiles.append(profiler)
+
+    def print_stats(self, limit=30, stream=None):
+        """Print the top functions by cumulative time over all profiled threads."""
+        with self._lock:
+            profiles = list(self.profiles)
+        if not profiles:
+            return
+        import pstats
+        stats = pstats.Stats(profiles[0], stream=stream)
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        stats.sort_stats("cumulative").print_stats(limit)
@@ -1,15 +1,14 @@
 import os
 import csv
+import heapq
 import logging
 import shutil
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from logging_setup import setup_logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger("CSV_Synchronizer")
 
 # Configuration - must match the paths in ai_news_collector.py
@@ -19,94 +18,165 @@ CSV_PATHS = [
     BASE_DIR / "docs" / "data" / "ai_news.csv",
     BASE_DIR / "web_app" / "data" / "ai_news.csv"
 ]
+# Column order of the collector's CSV; columns found only in older files are kept after these
+CSV_FIELDNAMES = ['date', 'published_at', 'title', 'description', 'source', 'url', 'category', 'source_type', 'insights']
 
+class UnsortedCSVError(Exception):
+    """Raised when a CSV file turns out not to be sorted newest-first."""
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str):
-    """Convert date string to datetime object for sorting."""
-    try:
-        if "/" in date_str:  # MM/DD/YYYY
-            return datetime.strptime(date_str, "%m/%d/%Y")
-        else:  # YYYY-MM-DD
-            return datetime.strptime(date_str, "%Y-%m-%d")
-    except ValueError:
-        logger.warning(f"Could not parse date: {date_str}")
-        return datetime(1900, 1, 1)
-
-def read_all_csv_files():
-    """Read all articles from all CSV files, removing duplicates."""
-    all_articles = []
-    url_set = set()
-    
-    for csv_path in CSV_PATHS:
-        if not os.path.exists(csv_path):
-            logger.info(f"CSV file does not exist: {csv_path}")
+    """Convert date string to datetime object for sorting, like the collector does.
+
+    Cached, since many articles share a date.
+    """
+    for date_format in ("%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(date_str, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
             continue
-            
+    logger.warning(f"Could not parse date: {date_str}")
+    return datetime(1900, 1, 1, tzinfo=timezone.utc)
+
+def sort_key(published_at, date_str):
+    """Newest-first sort key: the publish timestamp when there is one, otherwise the date."""
+    if published_at:
         try:
-            with open(csv_path, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Skip duplicate URLs
-                    if row['url'] in url_set:
-                        continue
-                    url_set.add(row['url'])
-                    all_articles.append(row)
-            
-            logger.info(f"Read {len(all_articles)} articles from {csv_path}")
-        except Exception as e:
-            logger.error(f"Error reading CSV file {csv_path}: {str(e)}")
-    
-    return all_articles
+            parsed = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                return parsed.replace(tzinfo=timezone.utc)
+            return parsed.astimezone(timezone.utc)
+        except ValueError:
+            logger.warning(f"Could not parse published_at timestamp: {published_at}")
+    return parse_date(date_str)
 
-def write_csv_file(csv_path, articles):
-    """Write articles to CSV file."""
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
-        
-        # Write to temp file first
-        temp_path = csv_path.with_suffix('.temp.csv')
-        with open(temp_path, 'w', newline='', encoding='utf-8') as file:
-            if not articles:
-                logger.warning(f"No articles to write to {csv_path}")
-                return False
-                
-            fieldnames = ['date', 'title', 'description', 'source', 'url', 'category', 'source_type', 'insights']
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for article in articles:
-                writer.writerow(article)
-        
-        # Replace original file
-        if os.path.exists(csv_path):
-            os.remove(csv_path)
-        os.rename(temp_path, csv_path)
-        
-        logger.info(f"Successfully wrote {len(articles)} articles to {csv_path}")
-        return True
-    except Exception as e:
-        logger.error(f"Error writing to CSV file {csv_path}: {str(e)}")
-        return False
+def read_header(csv_path):
+    with open(csv_path, 'r', newline='', encoding='utf-8') as file:
+        return next(csv.reader(file), [])
+
+def iter_csv_rows(csv_path, fieldnames, check_order=True):
+    """Stream (sort key, row) pairs from one CSV, with each row as a list in fieldnames order."""
+    with open(csv_path, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = [header.index(field) if field in header else None for field in fieldnames]
+        published_at_position = fieldnames.index('published_at')
+        date_position = fieldnames.index('date')
+        aligned = header == fieldnames
+        previous_key = None
+        count = 0
+        for row in reader:
+            if not row:
+                continue  # csv.DictReader skips blank lines too
+            if len(row) > len(header):
+                raise ValueError(f"Row {reader.line_num} of {csv_path} has more fields than its header")
+            if not aligned or len(row) != len(header):
+                row = [row[i] if i is not None and i < len(row) else '' for i in positions]
+            key = sort_key(row[published_at_position], row[date_position])
+            if check_order and previous_key is not None and key > previous_key:
+                raise UnsortedCSVError(f"{csv_path} row {reader.line_num} is newer than the row before it")
+            previous_key = key
+            count += 1
+            yield key, row
+    logger.debug(f"Read {count} articles from {csv_path}")
+
+def unique_by_url(rows, url_position):
+    """Drop rows whose URL was already seen, keeping the first."""
+    seen_urls = set()
+    for row in rows:
+        if row[url_position] in seen_urls:
+            continue
+        seen_urls.add(row[url_position])
+        yield row
+
+def merged_articles(csv_paths, fieldnames):
+    """K-way merge the newest-first CSV files into one newest-first stream of unique rows.
+
+    Only one row per file is held at a time. A URL found in several files keeps
+    its newest copy; on equal timestamps the file listed first in CSV_PATHS wins.
+    """
+    pairs = heapq.merge(*(iter_csv_rows(path, fieldnames) for path in csv_paths), key=itemgetter(0), reverse=True)
+    return unique_by_url((row for _, row in pairs), fieldnames.index('url'))
+
+def sorted_articles(csv_paths, fieldnames):
+    """Fallback for unsorted files: read everything and sort it (stable, so file order breaks ties)."""
+    pairs = [pair for path in csv_paths for pair in iter_csv_rows(path, fieldnames, check_order=False)]
+    pairs.sort(key=itemgetter(0), reverse=True)
+    return unique_by_url((row for _, row in pairs), fieldnames.index('url'))
+
+def write_csv_file(csv_path, fieldnames, rows):
+    """Write rows to a temporary file next to csv_path and return (temp path, row count)."""
+    # Create directory if it doesn't exist
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    temp_path = csv_path.with_suffix('.temp.csv')
+    count = 0
+    with open(temp_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(fieldnames)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return temp_path, count
+
+def copy_csv_file(source_path, csv_path):
+    """Copy the synchronized file into place atomically."""
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    temp_path = csv_path.with_suffix('.temp.csv')
+    shutil.copyfile(source_path, temp_path)
+    os.replace(temp_path, csv_path)
 
 def synchronize_csv_files():
-    """Main function to synchronize all CSV files."""
+    """Main function to synchronize all CSV files.
+
+    The files are already sorted newest-first, so they are merged in one streaming
+    pass, written once, and the result is copied to the other locations.
+    """
     logger.info("Starting CSV synchronization")
-    
-    # Read all articles from all CSV files
-    all_articles = read_all_csv_files()
-    
-    if not all_articles:
+
+    csv_paths = []
+    for csv_path in CSV_PATHS:
+        if os.path.exists(csv_path):
+            csv_paths.append(csv_path)
+        else:
+            logger.info(f"CSV file does not exist: {csv_path}")
+
+    # Keep every column: the collector's columns first, then any others the files have
+    fieldnames = list(CSV_FIELDNAMES)
+    for csv_path in csv_paths:
+        fieldnames.extend(field for field in read_header(csv_path) if field not in fieldnames)
+
+    output_path = CSV_PATHS[0]
+    try:
+        try:
+            temp_path, count = write_csv_file(output_path, fieldnames, merged_articles(csv_paths, fieldnames))
+        except UnsortedCSVError as e:
+            logger.warning(f"CSV file is not sorted newest-first ({str(e)}), falling back to a full sort")
+            temp_path, count = write_csv_file(output_path, fieldnames, sorted_articles(csv_paths, fieldnames))
+    except Exception as e:
+        logger.error(f"Error merging CSV files: {str(e)}")
+        return
+
+    if not count:
+        os.remove(temp_path)
         logger.warning("No articles found in any CSV file")
         return
-    
-    # Sort articles by date (newest first)
-    all_articles.sort(key=lambda x: parse_date(x['date']), reverse=True)
-    
-    # Write synchronized articles to all CSV files
-    for csv_path in CSV_PATHS:
-        write_csv_file(csv_path, all_articles)
-    
-    logger.info("CSV synchronization completed successfully")
+
+    # Write once, then fan the result out to the other locations
+    os.replace(temp_path, output_path)
+    copied = 0
+    for csv_path in CSV_PATHS[1:]:
+        try:
+            copy_csv_file(output_path, csv_path)
+            copied += 1
+            logger.debug(f"Copied {count} articles to {csv_path}")
+        except Exception as e:
+            logger.error(f"Error writing to CSV file {csv_path}: {str(e)}")
+
+    logger.info(f"CSV synchronization completed: {count} articles from {len(csv_paths)} files "
+                f"written to {output_path} and copied to {copied} other locations")
 
 if __name__ == "__main__":
+    setup_logging("sync_csv_files")
     synchronize_csv_files()
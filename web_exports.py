@@ -0,0 +1,516 @@
+#!/usr/bin/env python
+"""
+Static data exports for the AI News Daily web app.
+
+The canonical CSV holds every article ever collected. To keep the default page
+load constant-size, it is also split into month partitions
+(data/archive/YYYY-MM.csv) plus a bounded "recent" file holding the last
+RECENT_DAYS days. A small manifest (data/manifest.json) describes the partitions,
+and the web app uses it to fetch older months only when they are needed.
+
+Every partition also gets a compact columnar JSON copy (recent.json,
+archive/YYYY-MM.json) and a precompressed .json.gz of it. Each column is one
+array; source, category, source_type and date are interned into string tables
+and stored as indexes, and publish times are epoch seconds, so the web app
+builds its articles without parsing CSV or dates row by row. The CSV files stay
+the canonical export and the fallback.
+
+Article counts by category, day, source and source type are kept in
+data/aggregates.json so the charts can render without the article data. They
+are updated incrementally from each run's new articles. The same goes for the
+search index (data/search_index.json), an inverted index from lowercase
+alphanumeric tokens to article ids that the web app queries instead of scanning
+every article.
+
+Files are only rewritten when their content changes, so unchanged data does not
+churn in git.
+
+Usage:
+    python web_exports.py [--csv PATH] [--today YYYY-MM-DD]
+"""
+
+import argparse
+import csv
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+logger = logging.getLogger("AI_News_Collector")
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = BASE_DIR / "docs" / "data"
+ARCHIVE_DIR_NAME = "archive"
+MANIFEST_NAME = "manifest.json"
+RECENT_NAME = "recent.csv"
+RECENT_DAYS = 30
+AGGREGATES_NAME = "aggregates.json"
+# Aggregate name -> CSV column it counts
+AGGREGATE_FIELDS = {
+    "by_category": "category",
+    "by_day": "date",
+    "by_source": "source",
+    "by_source_type": "source_type",
+}
+SEARCH_INDEX_NAME = "search_index.json"
+# Article fields the web app search box matches against
+SEARCH_FIELDS = ("title", "description", "source", "category")
+UNDATED_MONTH = "undated"
+COLUMNAR_VERSION = 1
+# Columns stored as indexes into a table of their distinct values
+INTERNED_FIELDS = ("source", "category", "source_type", "date")
+# Columns stored as plain strings, in this order; any other CSV column follows them
+TEXT_FIELDS = ("title", "description", "url", "insights")
+# Stored as epoch seconds in the "published" column instead of as text
+TIMESTAMP_FIELD = "published_at"
+
+MONTH_PATTERN = re.compile(r"^(\d{4}-\d{2})-\d{2}$")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def article_month(date_str):
+    """Return the YYYY-MM partition for an article date, or 'undated' if it is not ISO formatted."""
+    match = MONTH_PATTERN.match(date_str or "")
+    return match.group(1) if match else UNDATED_MONTH
+
+
+def content_hash(data):
+    """Short content hash used as a cache-busting version for a data file."""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_if_changed(path, data):
+    """Atomically write bytes to path unless it already holds exactly that content."""
+    path = Path(path)
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(path.parent, exist_ok=True)
+    temp_path = path.with_name(path.name + ".temp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+    return True
+
+
+def epoch_seconds(timestamp):
+    """Convert an ISO 8601 publish time to integer epoch seconds, or None if it is missing or invalid."""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp())
+
+
+def columnar_payload(fieldnames, rows):
+    """Turn CSV rows into the columnar payload the web app decodes.
+
+    Interned columns hold indexes into payload["tables"]; "published" holds epoch
+    seconds or null for articles that only have a date.
+    """
+    positions = {field: index for index, field in enumerate(fieldnames)}
+    text_fields = [field for field in TEXT_FIELDS if field in positions]
+    text_fields += [field for field in fieldnames
+                    if field not in text_fields and field not in INTERNED_FIELDS and field != TIMESTAMP_FIELD]
+    tables = {field: [] for field in INTERNED_FIELDS}
+    table_indexes = {field: {} for field in INTERNED_FIELDS}
+    columns = {field: [] for field in text_fields + list(INTERNED_FIELDS)}
+    columns["published"] = []
+
+    def cell(row, field):
+        position = positions.get(field)
+        return row[position] if position is not None and position < len(row) else ""
+
+    count = 0
+    for row in rows:
+        if not row:
+            continue
+        count += 1
+        for field in text_fields:
+            columns[field].append(cell(row, field))
+        for field in INTERNED_FIELDS:
+            value = cell(row, field)
+            index = table_indexes[field].get(value)
+            if index is None:
+                index = table_indexes[field][value] = len(tables[field])
+                tables[field].append(value)
+            columns[field].append(index)
+        columns["published"].append(epoch_seconds(cell(row, TIMESTAMP_FIELD)))
+
+    return {"version": COLUMNAR_VERSION, "count": count, "tables": tables, "columns": columns}
+
+
+def write_columnar(csv_data, json_path):
+    """Write the columnar JSON and its .gz for one CSV partition. Returns (content hash, files changed)."""
+    reader = csv.reader(io.StringIO(csv_data.decode("utf-8"), newline=""))
+    fieldnames = next(reader, None) or []
+    payload = columnar_payload(fieldnames, reader)
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # mtime=0 keeps the gzip bytes identical when the JSON is, so unchanged files are not rewritten
+    changed = write_if_changed(json_path, data)
+    changed += write_if_changed(gzip_path(json_path), gzip.compress(data, compresslevel=9, mtime=0))
+    return content_hash(data), changed
+
+
+def gzip_path(path):
+    path = Path(path)
+    return path.with_name(path.name + ".gz")
+
+
+class CSVPartition:
+    """CSV partition streamed to a temporary file, tracking its article count and date range."""
+
+    def __init__(self, path, fieldnames):
+        self.path = Path(path)
+        self.temp_path = self.path.with_name(self.path.name + ".temp")
+        os.makedirs(self.path.parent, exist_ok=True)
+        self.file = open(self.temp_path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(fieldnames)
+        self.count = 0
+        self.newest = ""
+        self.oldest = ""
+
+    def add(self, row, date_str):
+        self.writer.writerow(row)
+        self.count += 1
+        if date_str and (not self.newest or date_str > self.newest):
+            self.newest = date_str
+        if date_str and (not self.oldest or date_str < self.oldest):
+            self.oldest = date_str
+
+    def finish(self):
+        """Close the partition and move it and its columnar copy into place if they changed.
+
+        Returns (CSV content hash, columnar content hash, number of files changed).
+        """
+        self.file.close()
+        data = self.temp_path.read_bytes()
+        self.temp_path.unlink()
+        json_hash, json_changed = write_columnar(data, self.path.with_suffix(".json"))
+        return content_hash(data), json_hash, write_if_changed(self.path, data) + json_changed
+
+
+def recent_since(today=None, recent_days=RECENT_DAYS):
+    """First date of the recent window ending on today (YYYY-MM-DD)."""
+    today = today or datetime.date.today().isoformat()
+    return (datetime.date.fromisoformat(today) - datetime.timedelta(days=recent_days)).isoformat()
+
+
+def finish_month(month, partition):
+    """Finish a month partition and return (manifest entry, files changed)."""
+    partition_hash, json_hash, changed = partition.finish()
+    return {
+        "month": month,
+        "file": f"{ARCHIVE_DIR_NAME}/{month}.csv",
+        "count": partition.count,
+        "newest": partition.newest,
+        "oldest": partition.oldest,
+        "hash": partition_hash,
+        "json": f"{ARCHIVE_DIR_NAME}/{month}.json",
+        "json_hash": json_hash,
+    }, changed
+
+
+def finish_manifest(data_dir, recent, since, recent_days, month_entries, changed):
+    """Finish the recent partition, then write and return the manifest."""
+    recent_hash, recent_json_hash, recent_changed = recent.finish()
+    changed += recent_changed
+    # Newest month first, undated articles last
+    month_entries = sorted(month_entries, key=lambda entry: (entry["month"] != UNDATED_MONTH, entry["month"]),
+                           reverse=True)
+    manifest = {
+        "version": 1,
+        "total": sum(entry["count"] for entry in month_entries),
+        "recent": {
+            "file": RECENT_NAME,
+            "since": since,
+            "days": recent_days,
+            "count": recent.count,
+            "hash": recent_hash,
+            "json": recent.path.with_suffix(".json").name,
+            "json_hash": recent_json_hash,
+        },
+        "months": month_entries,
+    }
+    write_if_changed(Path(data_dir) / MANIFEST_NAME, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+    logger.info(
+        f"Archive: {manifest['total']} articles in {len(month_entries)} month partitions, "
+        f"{recent.count} in the last {recent_days} days, {changed} files changed"
+    )
+    return manifest
+
+
+def write_archive(csv_path, data_dir=DATA_DIR, today=None, recent_days=RECENT_DAYS):
+    """Split the canonical CSV into month partitions and a recent file, then write the manifest.
+
+    Rows are streamed from csv_path in file order (newest first) straight into the
+    partition files. Each partition only replaces the existing file if its bytes
+    changed, and partitions for months that no longer exist are removed. Returns
+    the manifest dict.
+    """
+    data_dir = Path(data_dir)
+    archive_dir = data_dir / ARCHIVE_DIR_NAME
+    since = recent_since(today, recent_days)
+
+    months = {}
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        fieldnames = next(reader, None) or []
+        date_position = fieldnames.index("date") if "date" in fieldnames else None
+        recent = CSVPartition(data_dir / RECENT_NAME, fieldnames)
+        for row in reader:
+            if not row:
+                continue
+            date_str = row[date_position] if date_position is not None and date_position < len(row) else ""
+            month = article_month(date_str)
+            if month not in months:
+                months[month] = CSVPartition(archive_dir / f"{month}.csv", fieldnames)
+            months[month].add(row, date_str)
+            if date_str >= since:
+                recent.add(row, date_str)
+
+    changed = 0
+    month_entries = []
+    for month, partition in months.items():
+        entry, partition_changed = finish_month(month, partition)
+        month_entries.append(entry)
+        changed += partition_changed
+
+    # Remove partitions (CSV, JSON and .json.gz) for months that have disappeared from the CSV
+    for stale in archive_dir.glob("*"):
+        if stale.is_file() and stale.name.split(".")[0] not in months:
+            stale.unlink()
+            changed += 1
+
+    return finish_manifest(data_dir, recent, since, recent_days, month_entries, changed)
+
+
+def load_manifest(path):
+    """Load manifest.json, returning None if it is missing, unreadable or from another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != 1 or "months" not in manifest:
+        return None
+    return manifest
+
+
+def update_archive(store, csv_path, data_dir=DATA_DIR, today=None, changed_dates=(), recent_days=RECENT_DAYS):
+    """Rewrite only the month partitions touched by changed_dates, plus the recent file, from the article store.
+
+    Each month and the recent window is a date range query on the store, so the rest
+    of the archive is not read. Falls back to write_archive over the exported CSV when
+    there is no usable manifest, an undated article changed, or the partition counts
+    disagree with the store. Returns the manifest dict.
+    """
+    data_dir = Path(data_dir)
+    manifest = load_manifest(data_dir / MANIFEST_NAME)
+    changed_months = {article_month(date_str) for date_str in changed_dates}
+    if manifest is None or UNDATED_MONTH in changed_months:
+        return write_archive(csv_path, data_dir, today=today, recent_days=recent_days)
+
+    fieldnames = list(store.fields)
+    date_position = fieldnames.index("date")
+    archive_dir = data_dir / ARCHIVE_DIR_NAME
+    since = recent_since(today, recent_days)
+    entries = {entry["month"]: entry for entry in manifest["months"]}
+    changed = 0
+    for month in changed_months:
+        partition = CSVPartition(archive_dir / f"{month}.csv", fieldnames)
+        # "YYYY-MM-" up to "YYYY-MM." covers every date in the month
+        for row in store.iter_rows(date_from=f"{month}-", date_to=f"{month}."):
+            if article_month(row[date_position]) == month:
+                partition.add(row, row[date_position])
+        if partition.count:
+            entries[month], partition_changed = finish_month(month, partition)
+            changed += partition_changed
+            continue
+        # Every article of the month moved to another date
+        partition.finish()
+        entries.pop(month, None)
+        for stale in archive_dir.glob(f"{month}.*"):
+            stale.unlink()
+            changed += 1
+
+    if sum(entry["count"] for entry in entries.values()) != len(store):
+        logger.info(f"{MANIFEST_NAME} does not match the article store, rebuilding the archive")
+        return write_archive(csv_path, data_dir, today=today, recent_days=recent_days)
+
+    recent = CSVPartition(data_dir / RECENT_NAME, fieldnames)
+    for row in store.iter_rows(date_from=since):
+        recent.add(row, row[date_position])
+    return finish_manifest(data_dir, recent, since, recent_days, list(entries.values()), changed)
+
+
+def aggregate_key(field, value):
+    """Normalize a counted value the same way the web app groups it."""
+    value = (value or "").strip()
+    if field == "category":
+        return value or "uncategorized"
+    return value or "unknown"
+
+
+def add_to_aggregates(aggregates, articles):
+    """Add each article's category, day, source and source type to the running counts."""
+    for article in articles:
+        aggregates["total"] += 1
+        for name, field in AGGREGATE_FIELDS.items():
+            key = aggregate_key(field, article.get(field))
+            aggregates[name][key] = aggregates[name].get(key, 0) + 1
+    return aggregates
+
+
+def empty_aggregates():
+    aggregates = {"version": 1, "total": 0}
+    aggregates.update({name: {} for name in AGGREGATE_FIELDS})
+    return aggregates
+
+
+def rebuild_aggregates(csv_path):
+    """Count every article in the CSV from scratch."""
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        return add_to_aggregates(empty_aggregates(), csv.DictReader(f))
+
+
+def load_aggregates(path):
+    """Load aggregates.json, returning None if it is missing, unreadable or from another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            aggregates = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if aggregates.get("version") != 1 or any(name not in aggregates for name in AGGREGATE_FIELDS):
+        return None
+    return aggregates
+
+
+def write_aggregates(path, aggregates):
+    """Write aggregates with days in date order and everything else by descending count."""
+    ordered = {"version": aggregates["version"], "total": aggregates["total"]}
+    for name in AGGREGATE_FIELDS:
+        counts = aggregates[name]
+        if name == "by_day":
+            ordered[name] = dict(sorted(counts.items()))
+        else:
+            ordered[name] = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+    return write_if_changed(path, (json.dumps(ordered, indent=2) + "\n").encode("utf-8"))
+
+
+def update_aggregates(new_articles, csv_path, data_dir=DATA_DIR, expected_total=None):
+    """Add a run's new articles to aggregates.json without recounting the whole archive.
+
+    The counts are rebuilt from the CSV only when the sidecar is missing or its
+    total no longer matches expected_total (for example after a manual CSV edit).
+    """
+    path = Path(data_dir) / AGGREGATES_NAME
+    aggregates = load_aggregates(path)
+    if aggregates is not None:
+        add_to_aggregates(aggregates, new_articles)
+    if aggregates is None or (expected_total is not None and aggregates["total"] != expected_total):
+        logger.info(f"Rebuilding {AGGREGATES_NAME} from {csv_path}")
+        aggregates = rebuild_aggregates(csv_path)
+    write_aggregates(path, aggregates)
+    return aggregates
+
+
+def search_tokens(article):
+    """Distinct lowercase alphanumeric tokens in an article's searchable fields."""
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        value = article.get(field) or ""
+        if field == "category":
+            value = aggregate_key(field, value)
+        tokens.update(TOKEN_PATTERN.findall(value.lower()))
+    return tokens
+
+
+def add_to_search_index(index, articles):
+    """Append articles as new documents and add their ids to each token's posting list."""
+    docs = index["docs"]
+    postings = index["tokens"]
+    for article in articles:
+        doc_id = len(docs)
+        docs.append([article.get("url", ""), article_month(article.get("date"))])
+        for token in search_tokens(article):
+            postings.setdefault(token, []).append(doc_id)
+    return index
+
+
+def rebuild_search_index(csv_path):
+    """Index every article in the CSV from scratch."""
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        return add_to_search_index({"version": 1, "docs": [], "tokens": {}}, csv.DictReader(f))
+
+
+def load_search_index(path):
+    """Load search_index.json, returning None if it is missing, unreadable or from another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != 1 or "docs" not in index or "tokens" not in index:
+        return None
+    return index
+
+
+def write_search_index(path, index):
+    """Write the index compactly with tokens sorted, so the web app can binary search them for prefixes."""
+    ordered = {
+        "version": index["version"],
+        "docs": index["docs"],
+        "tokens": dict(sorted(index["tokens"].items())),
+    }
+    return write_if_changed(path, (json.dumps(ordered, separators=(",", ":")) + "\n").encode("utf-8"))
+
+
+def update_search_index(new_articles, csv_path, data_dir=DATA_DIR, expected_total=None):
+    """Add a run's new articles to search_index.json without re-indexing the whole archive.
+
+    The index is rebuilt from the CSV only when it is missing or its document
+    count no longer matches expected_total.
+    """
+    path = Path(data_dir) / SEARCH_INDEX_NAME
+    index = load_search_index(path)
+    if index is not None:
+        add_to_search_index(index, new_articles)
+    if index is None or (expected_total is not None and len(index["docs"]) != expected_total):
+        logger.info(f"Rebuilding {SEARCH_INDEX_NAME} from {csv_path}")
+        index = rebuild_search_index(csv_path)
+    write_search_index(path, index)
+    return index
+
+
+def rebuild_web_exports(csv_path, data_dir=DATA_DIR, today=None):
+    """Rewrite every partition, the recent file, the aggregates and the search index from the CSV.
+
+    For when the CSV may have changed anywhere, e.g. after it was edited outside the
+    collector. Returns the manifest dict.
+    """
+    data_dir = Path(data_dir)
+    manifest = write_archive(csv_path, data_dir, today=today)
+    write_aggregates(data_dir / AGGREGATES_NAME, rebuild_aggregates(csv_path))
+    write_search_index(data_dir / SEARCH_INDEX_NAME, rebuild_search_index(csv_path))
+    return manifest
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Regenerate the web app's data exports from the CSV")
+    parser.add_argument("--csv", default=str(DATA_DIR / "ai_news.csv"), help="Canonical article CSV")
+    parser.add_argument("--today", help="Date the recent window ends on (default: today)")
+    args = parser.parse_args()
+    rebuild_web_exports(args.csv, Path(args.csv).parent, today=args.today)